@@ -0,0 +1,183 @@
+from board import Board
+from board_evaluator import BoardEvaluator
+from board_tree import BoardTree
+from piece import Piece
+from pruning import Pruning
+from transposition_table import TranspositionTable
+
+from dataclasses import dataclass, field
+from math import inf, nextafter
+from typing import Callable, Optional
+
+
+@dataclass(repr=False)
+class AlphaBetaBoardTree(BoardTree):
+    '''Minimax tree that skips children which can't change the result.
+
+    result prunes over the children that are already expanded, so it agrees
+    with MinMaxBoardTree on the same tree. search expands as it goes and never
+    creates the children of pruned nodes, and with pruning set it also uses
+    null moves and late-move reductions, which can change the result.
+    '''
+
+    pruning: Optional[Pruning] = field(
+        default=None, repr=False, compare=False)
+
+    class Aborted(Exception):
+        '''Raised out of search when should_stop says so.'''
+
+    @property
+    def result(self) -> BoardTree.Result:
+        return self._search(None, -inf, inf, None)
+
+    def search(self, depth: int, alpha: float = -inf, beta: float = inf,
+               should_stop: Optional[Callable[[BoardTree], bool]] = None) -> BoardTree.Result:
+        '''Searches depth plies ahead, expanding nodes on the way down.
+
+        should_stop is called with every node and aborts the whole search with
+        Aborted, leaving the nodes expanded so far in the tree.
+        '''
+        return self._search(depth, alpha, beta, should_stop)
+
+    def order_principal_variation(self, result: BoardTree.Result) -> None:
+        '''Moves the children along result's boards to the front so they're searched first.'''
+        node: Optional[BoardTree] = self
+        for board in result.boards[1:]:
+            if node is None:
+                return
+            node = node.move_child_to_front(board)
+
+    def _search(self, depth: Optional[int], alpha: float, beta: float,
+                should_stop: Optional[Callable[[BoardTree], bool]],
+                allow_null_move: bool = True) -> BoardTree.Result:
+        if should_stop is not None and should_stop(self):
+            raise AlphaBetaBoardTree.Aborted()
+        table = self.transposition_table if depth is not None and depth > 0 else None
+        entry: Optional[TranspositionTable.Entry] = None
+        if table is not None:
+            assert depth is not None
+            entry = table.get(self.board, self.color)
+            if entry is not None and entry.depth >= depth and (
+                    entry.bound == TranspositionTable.Bound.EXACT
+                    or entry.bound == TranspositionTable.Bound.LOWER and entry.value >= beta
+                    or entry.bound == TranspositionTable.Bound.UPPER and entry.value <= alpha):
+                boards = [self.board]
+                # only the root has to name a move, so other nodes don't generate moves just to find it
+                if entry.best_key is not None and (self.children or self.parent is None):
+                    table_best = self.child_board(entry.best_key)
+                    if table_best is not None:
+                        boards.append(table_best)
+                return BoardTree.Result(boards, entry.value)
+        maximizing = self.color == self.board_evaluator.eval_color
+        if depth is not None and allow_null_move and self._can_null_move(depth):
+            null_move_value = self._null_move_search(depth, alpha, beta, should_stop)
+            if null_move_value is not None:
+                if table is not None:
+                    bound = TranspositionTable.Bound.LOWER if maximizing else TranspositionTable.Bound.UPPER
+                    table.put(self.board, self.color, depth, null_move_value, bound, None)
+                return BoardTree.Result([self.board], null_move_value)
+        if depth is not None and depth > 0:
+            self.expand()
+        if depth == 0 and self.quiescence is not None:
+            value = self.quiescence.search(self.board, self.color, self.board_evaluator, alpha, beta)
+            return BoardTree.Result([self.board], value)
+        if depth == 0 or not self.children:
+            return BoardTree.Result([self.board], self.leaf_value)
+        if entry is not None and entry.best_key is not None:
+            # try the best move from an earlier search of this position first
+            table_best = self.child_board(entry.best_key)
+            if table_best is not None:
+                self.move_child_to_front(table_best)
+        original_alpha, original_beta = alpha, beta
+        child_depth = None if depth is None else depth - 1
+        best: Optional[BoardTree.Result] = None
+        for i, child in enumerate(self.children):
+            assert isinstance(child, AlphaBetaBoardTree)
+            if child_depth is not None and self._can_reduce(i, child, child_depth + 1):
+                child_result = self._reduced_search(child, child_depth, alpha, beta, should_stop)
+            else:
+                child_result = child._search(child_depth, alpha, beta, should_stop)
+            if maximizing:
+                if best is None or child_result.value > best.value:
+                    best = child_result
+                alpha = max(alpha, child_result.value)
+            else:
+                if best is None or child_result.value < best.value:
+                    best = child_result
+                beta = min(beta, child_result.value)
+            if alpha >= beta:
+                if self.move_ordering is not None and depth is not None:
+                    self.move_ordering.cutoff(child.move, i, self.depth, depth)
+                break
+        assert best is not None
+        if table is not None:
+            assert depth is not None
+            best_board: Optional[Board] = best.boards[0]
+            if best.value <= original_alpha:
+                # every child failed low, so none of them is known to be best
+                bound = TranspositionTable.Bound.UPPER
+                best_board = None
+            elif best.value >= original_beta:
+                bound = TranspositionTable.Bound.LOWER
+            else:
+                bound = TranspositionTable.Bound.EXACT
+            table.put(self.board, self.color, depth, best.value, bound, best_board)
+        return best.with_parent_board(self.board)
+
+    def _can_null_move(self, depth: int) -> bool:
+        # never at the root, which has to return a move
+        return (self.pruning is not None and self.pruning.null_move
+                and depth >= self.pruning.min_depth
+                and self.parent is not None
+                and Pruning.has_non_pawn_material(self.board, self.color)
+                and not self.board.is_color_in_check(self.color))
+
+    def _null_move_search(self, depth: int, alpha: float, beta: float,
+                          should_stop: Optional[Callable[[BoardTree], bool]]) -> Optional[float]:
+        '''Passes the move and returns the bound to cut off at if the shallower search still fails high.'''
+        assert self.pruning is not None
+        maximizing = self.color == self.board_evaluator.eval_color
+        if maximizing and beta == inf or not maximizing and alpha == -inf:
+            return None
+        self.pruning.num_null_move_searches += 1
+        node = self.new_child(self.board, None)
+        assert isinstance(node, AlphaBetaBoardTree)
+        null_depth = depth - 1 - self.pruning.null_move_reduction
+        if maximizing:
+            if node._search(null_depth, nextafter(beta, -inf), beta, should_stop, False).value >= beta:
+                self.pruning.num_null_move_cutoffs += 1
+                return beta
+        elif node._search(null_depth, alpha, nextafter(alpha, inf), should_stop, False).value <= alpha:
+            self.pruning.num_null_move_cutoffs += 1
+            return alpha
+        return None
+
+    def _can_reduce(self, i: int, child: 'AlphaBetaBoardTree', depth: int) -> bool:
+        return (self.pruning is not None and self.pruning.late_move_reductions
+                and depth >= self.pruning.min_depth
+                and i >= self.pruning.num_full_depth_moves
+                and child.move is not None and not child.move.is_capture
+                and not self.board.is_color_in_check(self.color)
+                and not child.board.is_color_in_check(child.color))
+
+    def _reduced_search(self, child: 'AlphaBetaBoardTree', child_depth: int, alpha: float, beta: float,
+                        should_stop: Optional[Callable[[BoardTree], bool]]) -> BoardTree.Result:
+        '''Searches child a ply shallower with a null window, and again at full depth if it beats the window.'''
+        assert self.pruning is not None
+        self.pruning.num_reductions += 1
+        if self.color == self.board_evaluator.eval_color:
+            result = child._search(child_depth - 1, alpha, nextafter(alpha, inf), should_stop)
+            better = result.value > alpha
+        else:
+            result = child._search(child_depth - 1, nextafter(beta, -inf), beta, should_stop)
+            better = result.value < beta
+        if not better:
+            return result
+        self.pruning.num_re_searches += 1
+        return child._search(child_depth, alpha, beta, should_stop)
+
+    def create_child(self, board: Board,
+                     board_evaluator: BoardEvaluator,
+                     color: Piece.Color,
+                     depth: int) -> 'BoardTree':
+        return AlphaBetaBoardTree(board, board_evaluator, color, depth, pruning=self.pruning)
@@ -0,0 +1,112 @@
+from alpha_beta_board_tree import AlphaBetaBoardTree
+from board import Board
+from board_tree import BoardTree
+from min_max_board_tree import MinMaxBoardTree
+from move_ordering import MoveOrdering
+from piece import Piece
+from piece_value_board_evaluator import PieceValueBoardEvalutor
+from transposition_table import TranspositionTable
+
+from unittest import TestCase
+
+
+def _num_evaluated(board_tree: BoardTree) -> int:
+    return int('board_value' in vars(board_tree)) + sum(_num_evaluated(child) for child in board_tree.children)
+
+
+class AlphaBetaBoardTreeTest(TestCase):
+    _BOARDS = [
+        'wpe4,wpg2,bra4',
+        'wke1,wqd1,wpe2,wpf2,bke8,brh8,bpe7,bnc6',
+        'bke8,bra8,brh8,wke1',
+    ]
+
+    @staticmethod
+    def _board_tree(board: str) -> AlphaBetaBoardTree:
+        return AlphaBetaBoardTree(
+            Board.parse(board, False),
+            PieceValueBoardEvalutor(Piece.Color.WHITE),
+            Piece.Color.WHITE,
+        )
+
+    def test_boards(self):
+        def case(start_board: str, result_boards: list[str], depth: int) -> None:
+            with self.subTest((start_board, result_boards, depth)):
+                bt = AlphaBetaBoardTree(
+                    Board.parse(start_board),
+                    PieceValueBoardEvalutor(Piece.Color.WHITE),
+                    Piece.Color.WHITE,
+                )
+                self.assertListEqual(
+                    [Board.parse(board) for board in result_boards],
+                    bt.search(depth).boards[1:][:len(result_boards)],
+                )
+        # capture a piece instead of moving
+        case('wpe4,bpd5', ['wpd5'], 1)
+        # capture the more valuable piece
+        case('wpe4,bpd5,bnf5', ['bpd5,wpf5'], 1)
+        # avoid attack
+        case('wpe4,wpg2,bra4', ['wpe5,wpg2,bra4'], 2)
+
+    def test_matches_min_max(self):
+        for board in self._BOARDS:
+            for depth in range(1, 4):
+                with self.subTest((board, depth)):
+                    min_max = MinMaxBoardTree(
+                        Board.parse(board, False),
+                        PieceValueBoardEvalutor(Piece.Color.WHITE),
+                        Piece.Color.WHITE,
+                    )
+                    min_max.expand_to_depth(depth)
+                    expanded = self._board_tree(board)
+                    expanded.expand_to_depth(depth)
+                    self.assertEqual(self._board_tree(board).search(depth), min_max.result)
+                    self.assertEqual(expanded.result, min_max.result)
+
+    def test_searches_fewer_nodes(self):
+        board = 'wke1,wqd1,wpe2,wpf2,bke8,brh8,bpe7,bnc6'
+        min_max = MinMaxBoardTree(
+            Board.parse(board, False),
+            PieceValueBoardEvalutor(Piece.Color.WHITE),
+            Piece.Color.WHITE,
+        )
+        min_max.expand_to_depth(3)
+        min_max.result
+        alpha_beta = self._board_tree(board)
+        alpha_beta.search(3)
+        self.assertLess(_num_evaluated(alpha_beta) * 4, _num_evaluated(min_max))
+
+    def test_order_principal_variation(self):
+        bt = self._board_tree('wpe4,wpg2,bra4')
+        result = bt.search(2)
+        bt.order_principal_variation(result)
+        self.assertEqual(bt.children[0].board, result.boards[1])
+        self.assertEqual(bt.children[0].children[0].board, result.boards[2])
+        self.assertEqual(bt.search(2), result)
+
+    def test_aborted(self):
+        bt = self._board_tree('wpe4,wpg2,bra4')
+        with self.assertRaises(AlphaBetaBoardTree.Aborted):
+            bt.search(2, should_stop=lambda node: True)
+
+    def test_transposition_table(self):
+        table = TranspositionTable()
+        for board in self._BOARDS:
+            for depth in range(1, 4):
+                with self.subTest((board, depth)):
+                    bt = self._board_tree(board)
+                    bt.transposition_table = table
+                    self.assertEqual(bt.search(depth).value, self._board_tree(board).search(depth).value)
+        self.assertGreater(table.stats.hits, 0)
+
+    def test_move_ordering(self):
+        board = 'wke1,wqd1,wpe2,wpf2,bke8,brh8,bpe7,bnc6'
+        move_ordering = MoveOrdering()
+        bt = self._board_tree(board)
+        bt.move_ordering = move_ordering
+        for depth in range(1, 4):
+            with self.subTest(depth):
+                self.assertEqual(bt.search(depth).value, self._board_tree(board).search(depth).value)
+        self.assertGreater(move_ordering.stats.num_cutoffs, 0)
+        self.assertGreater(move_ordering.stats.first_move_cutoff_rate, 0.5)
+        self.assertTrue(move_ordering.history)
@@ -0,0 +1,51 @@
+from alpha_beta_board_tree import AlphaBetaBoardTree
+from board import Board
+from board_evaluator import BoardEvaluator
+from move_ordering import MoveOrdering
+from player import Player
+from pruning import Pruning
+from quiescence import Quiescence
+from transposition_table import TranspositionTable
+
+from dataclasses import dataclass, field
+from time import time
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class AlphaBetaPlayer(Player):
+    '''Plays the best move found by a fixed-depth alpha-beta search.'''
+
+    board_evaluator: BoardEvaluator
+    depth: int
+    transposition_table: TranspositionTable = field(
+        default_factory=TranspositionTable, repr=False, compare=False)
+    # searches captures at the leaves if set
+    quiescence: Optional[Quiescence] = None
+    # sorts children before they're searched if set
+    move_ordering: Optional[MoveOrdering] = None
+    # null moves and late-move reductions if set
+    pruning: Optional[Pruning] = None
+
+    def __post_init__(self):
+        if not self.color == self.board_evaluator.eval_color:
+            raise ValueError((self.color, self.board_evaluator.eval_color))
+        if self.depth < 1:
+            raise ValueError(self.depth)
+
+    def move(self, board: Board) -> Board:
+        print(f'{self} player considering board {board}')
+        start_time = time()
+        self.transposition_table.new_search()
+        if self.move_ordering is not None:
+            self.move_ordering.new_search()
+        result = AlphaBetaBoardTree(board, self.board_evaluator, self.color,
+                                    transposition_table=self.transposition_table,
+                                    quiescence=self.quiescence,
+                                    move_ordering=self.move_ordering,
+                                    pruning=self.pruning).search(self.depth)
+        print(
+            f'result boards {"".join([str(board) for board in result.boards[1:]])} at depth {len(result.boards) - 1} transposition table {self.transposition_table.stats} move ordering {self.move_ordering.stats if self.move_ordering is not None else None} pruning {self.pruning.stats if self.pruning is not None else None} with value {result.value} in {time() - start_time}')
+        if len(result.boards) < 2:
+            raise ValueError(f'no moves for {self.color} on {board}')
+        return result.boards[1]
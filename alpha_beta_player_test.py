@@ -0,0 +1,28 @@
+from alpha_beta_player import AlphaBetaPlayer
+from board import Board
+from piece import Piece
+from piece_value_board_evaluator import PieceValueBoardEvalutor
+
+from unittest import TestCase
+
+
+class AlphaBetaPlayerTest(TestCase):
+    def test_evaluator_color_mismatch(self):
+        with self.assertRaises(ValueError):
+            AlphaBetaPlayer(Piece.Color.WHITE,
+                            PieceValueBoardEvalutor(Piece.Color.BLACK),
+                            2)
+
+    def test_invalid_depth(self):
+        with self.assertRaises(ValueError):
+            AlphaBetaPlayer(Piece.Color.WHITE,
+                            PieceValueBoardEvalutor(Piece.Color.WHITE),
+                            0)
+
+    def test_move(self):
+        self.assertEqual(
+            AlphaBetaPlayer(Piece.Color.WHITE,
+                            PieceValueBoardEvalutor(Piece.Color.WHITE),
+                            2).move(Board.parse('wpe4,wpg2,bra4')),
+            Board.parse('wpe5,wpg2,bra4')
+        )
@@ -0,0 +1,186 @@
+from piece import Piece
+from position import Position
+
+from collections.abc import Mapping
+from typing import Callable, Iterator, Optional
+
+# Squares are indexed 0-63 with a1 = 0, h1 = 7 and h8 = 63.
+
+SQUARES: tuple[Position, ...] = tuple(Position(i & 7, i >> 3)
+                                      for i in range(64))
+
+
+def mask(positions: tuple[Position, ...]) -> int:
+    m = 0
+    for position in positions:
+        m |= 1 << position.index
+    return m
+
+
+def squares_of(m: int) -> Iterator[int]:
+    while m:
+        lsb = m & -m
+        yield lsb.bit_length() - 1
+        m ^= lsb
+
+
+BISHOP_DIRECTIONS: tuple[Position.Delta, ...] = (
+    Position.Delta(1, 1),
+    Position.Delta(1, -1),
+    Position.Delta(-1, 1),
+    Position.Delta(-1, -1),
+)
+
+ROOK_DIRECTIONS: tuple[Position.Delta, ...] = (
+    Position.Delta(1, 0),
+    Position.Delta(-1, 0),
+    Position.Delta(0, 1),
+    Position.Delta(0, -1),
+)
+
+QUEEN_DIRECTIONS: tuple[Position.Delta, ...] = BISHOP_DIRECTIONS + \
+    ROOK_DIRECTIONS
+
+KING_DELTAS: tuple[Position.Delta, ...] = QUEEN_DIRECTIONS
+
+KNIGHT_DELTAS: tuple[Position.Delta, ...] = (
+    Position.Delta(2, -1),
+    Position.Delta(2, 1),
+    Position.Delta(-2, -1),
+    Position.Delta(-2, 1),
+    Position.Delta(1, 2),
+    Position.Delta(-1, 2),
+    Position.Delta(1, -2),
+    Position.Delta(-1, -2),
+)
+
+
+def _targets(position: Position, deltas: tuple[Position.Delta, ...]) -> tuple[Position, ...]:
+    return tuple(position + delta for delta in deltas if position.can_add(delta))
+
+
+def _ray(position: Position, delta: Position.Delta) -> tuple[Position, ...]:
+    ray: list[Position] = []
+    while position.can_add(delta):
+        position = position + delta
+        ray.append(position)
+    return tuple(ray)
+
+
+def _pawn_dy(color: Piece.Color) -> int:
+    return 1 if color == Piece.Color.WHITE else -1
+
+
+def _pawn_pushes(position: Position, color: Piece.Color) -> tuple[Position, ...]:
+    dy = _pawn_dy(color)
+    return _targets(position, (Position.Delta(0, dy), Position.Delta(0, dy*2)))
+
+
+def _pawn_captures(position: Position, color: Piece.Color) -> tuple[Position, ...]:
+    dy = _pawn_dy(color)
+    return _targets(position, (Position.Delta(-1, dy), Position.Delta(1, dy)))
+
+
+# Target squares per square for pieces that move by fixed deltas.
+KNIGHT_TARGETS: tuple[tuple[Position, ...], ...] = tuple(
+    _targets(position, KNIGHT_DELTAS) for position in SQUARES)
+KING_TARGETS: tuple[tuple[Position, ...], ...] = tuple(
+    _targets(position, KING_DELTAS) for position in SQUARES)
+
+# Pawn pushes per color and square, ordered single step then double step.
+PAWN_PUSHES: Mapping[Piece.Color, tuple[tuple[Position, ...], ...]] = {
+    color: tuple(_pawn_pushes(position, color) for position in SQUARES)
+    for color in Piece.Color
+}
+PAWN_CAPTURES: Mapping[Piece.Color, tuple[tuple[Position, ...], ...]] = {
+    color: tuple(_pawn_captures(position, color) for position in SQUARES)
+    for color in Piece.Color
+}
+
+# Rays per direction and square, ordered outwards from the square.
+RAYS: Mapping[Position.Delta, tuple[tuple[Position, ...], ...]] = {
+    delta: tuple(_ray(position, delta) for position in SQUARES)
+    for delta in QUEEN_DIRECTIONS
+}
+
+
+def _slider_rays(directions: tuple[Position.Delta, ...]) -> tuple[tuple[tuple[Position, ...], ...], ...]:
+    return tuple(
+        tuple(RAYS[delta][i] for delta in directions if RAYS[delta][i])
+        for i in range(64)
+    )
+
+
+# Non-empty rays per square for each slider.
+SLIDER_RAYS: Mapping[Piece.Type, tuple[tuple[tuple[Position, ...], ...], ...]] = {
+    Piece.Type.BISHOP: _slider_rays(BISHOP_DIRECTIONS),
+    Piece.Type.ROOK: _slider_rays(ROOK_DIRECTIONS),
+    Piece.Type.QUEEN: _slider_rays(QUEEN_DIRECTIONS),
+}
+
+# The same tables as 64 bit masks.
+KNIGHT_MASKS: tuple[int, ...] = tuple(mask(targets)
+                                      for targets in KNIGHT_TARGETS)
+KING_MASKS: tuple[int, ...] = tuple(mask(targets) for targets in KING_TARGETS)
+PAWN_CAPTURE_MASKS: Mapping[Piece.Color, tuple[int, ...]] = {
+    color: tuple(mask(targets) for targets in PAWN_CAPTURES[color])
+    for color in Piece.Color
+}
+RAY_MASKS: Mapping[Position.Delta, tuple[int, ...]] = {
+    delta: tuple(mask(ray) for ray in RAYS[delta])
+    for delta in QUEEN_DIRECTIONS
+}
+
+
+def _is_positive(delta: Position.Delta) -> bool:
+    # squares along the ray grow in index, so the nearest blocker is the lowest set bit
+    return delta.dy > 0 or (delta.dy == 0 and delta.dx > 0)
+
+
+_SLIDER_RAY_MASKS: Mapping[Piece.Type, tuple[tuple[tuple[int, ...], bool], ...]] = {
+    type: tuple((RAY_MASKS[delta], _is_positive(delta))
+                for delta in directions)
+    for type, directions in (
+        (Piece.Type.BISHOP, BISHOP_DIRECTIONS),
+        (Piece.Type.ROOK, ROOK_DIRECTIONS),
+        (Piece.Type.QUEEN, QUEEN_DIRECTIONS),
+    )
+}
+
+
+def slider_attacks(i: int, occupied: int, type: Piece.Type) -> int:
+    attacks = 0
+    for ray_masks, positive in _SLIDER_RAY_MASKS[type]:
+        ray = ray_masks[i]
+        blockers = ray & occupied
+        if blockers:
+            if positive:
+                blocker = (blockers & -blockers).bit_length() - 1
+            else:
+                blocker = blockers.bit_length() - 1
+            ray ^= ray_masks[blocker]
+        attacks |= ray
+    return attacks
+
+
+def is_square_attacked(i: int, color: Piece.Color, piece_at: Callable[[Position], Optional[Piece]]) -> bool:
+    '''Whether a piece of color attacks square i, scanning outwards from i and stopping at the first attacker.'''
+    for targets, type in ((KNIGHT_TARGETS, Piece.Type.KNIGHT), (KING_TARGETS, Piece.Type.KING)):
+        for position in targets[i]:
+            piece = piece_at(position)
+            if piece is not None and piece.color == color and piece.type == type:
+                return True
+    # a pawn of color attacks i from the squares an opposing pawn on i would capture
+    for position in PAWN_CAPTURES[color.opponent][i]:
+        piece = piece_at(position)
+        if piece is not None and piece.color == color and piece.type == Piece.Type.PAWN:
+            return True
+    for slider in (Piece.Type.ROOK, Piece.Type.BISHOP):
+        for ray in SLIDER_RAYS[slider][i]:
+            for position in ray:
+                piece = piece_at(position)
+                if piece is not None:
+                    if piece.color == color and (piece.type == slider or piece.type == Piece.Type.QUEEN):
+                        return True
+                    break
+    return False
@@ -0,0 +1,73 @@
+from attack_tables import KING_TARGETS, KNIGHT_MASKS, KNIGHT_TARGETS, PAWN_CAPTURES, PAWN_PUSHES, RAYS, SLIDER_RAYS, SQUARES, mask, slider_attacks, squares_of
+from piece import Piece
+from position import Position
+
+from unittest import TestCase
+
+
+class AttackTablesTest(TestCase):
+    @staticmethod
+    def _positions(*poss: str) -> set[Position]:
+        return {Position.parse(pos) for pos in poss}
+
+    def test_squares(self):
+        for i, position in enumerate(SQUARES):
+            self.assertEqual(position.index, i)
+        self.assertEqual(SQUARES[0], Position.parse('a1'))
+        self.assertEqual(SQUARES[63], Position.parse('h8'))
+
+    def test_squares_of(self):
+        self.assertListEqual(list(squares_of(mask((Position.parse('h8'), Position.parse('a1'))))),
+                             [0, 63])
+
+    def test_knight_targets(self):
+        self.assertSetEqual(
+            set(KNIGHT_TARGETS[Position.parse('a1').index]),
+            self._positions('b3', 'c2'),
+        )
+        self.assertEqual(len(KNIGHT_TARGETS[Position.parse('d4').index]), 8)
+        self.assertEqual(
+            KNIGHT_MASKS[Position.parse('a1').index], mask(tuple(self._positions('b3', 'c2'))))
+
+    def test_king_targets(self):
+        self.assertSetEqual(
+            set(KING_TARGETS[Position.parse('h8').index]),
+            self._positions('g8', 'g7', 'h7'),
+        )
+
+    def test_pawn_pushes(self):
+        self.assertTupleEqual(
+            PAWN_PUSHES[Piece.Color.WHITE][Position.parse('c2').index],
+            (Position.parse('c3'), Position.parse('c4')),
+        )
+        self.assertTupleEqual(
+            PAWN_PUSHES[Piece.Color.BLACK][Position.parse('c2').index],
+            (Position.parse('c1'),),
+        )
+
+    def test_pawn_captures(self):
+        self.assertSetEqual(
+            set(PAWN_CAPTURES[Piece.Color.WHITE][Position.parse('a2').index]),
+            self._positions('b3'),
+        )
+        self.assertSetEqual(
+            set(PAWN_CAPTURES[Piece.Color.BLACK][Position.parse('d5').index]),
+            self._positions('c4', 'e4'),
+        )
+
+    def test_rays(self):
+        self.assertTupleEqual(
+            RAYS[Position.Delta(1, 1)][Position.parse('e5').index],
+            (Position.parse('f6'), Position.parse('g7'), Position.parse('h8')),
+        )
+        self.assertEqual(
+            len(SLIDER_RAYS[Piece.Type.ROOK][Position.parse('a1').index]), 2)
+
+    def test_slider_attacks(self):
+        occupied = mask(tuple(self._positions('d6', 'b4')))
+        self.assertEqual(
+            slider_attacks(Position.parse('d4').index,
+                           occupied, Piece.Type.ROOK),
+            mask(tuple(self._positions('d5', 'd6', 'd3', 'd2',
+                 'd1', 'c4', 'b4', 'e4', 'f4', 'g4', 'h4'))),
+        )
@@ -1,25 +1,69 @@
+from attack_tables import KING_MASKS, KING_TARGETS, KNIGHT_MASKS, KNIGHT_TARGETS, PAWN_CAPTURE_MASKS, PAWN_CAPTURES, PAWN_PUSHES, SLIDER_RAYS, SQUARES, is_square_attacked, slider_attacks, squares_of
+from legal_moves import legal_moves
+from lru_cache import LRUCache
+from move import Move
 from piece import Piece
 from position import Position
+from zobrist import PIECE_KEYS, MOVED_KEYS, piece_key, pieces_key
 
 from abc import ABC, abstractmethod
 from collections.abc import Mapping
-from dataclasses import dataclass
-from functools import cache, cached_property
-from typing import Callable, FrozenSet
+from dataclasses import dataclass, field
+from enum import Enum
+from functools import cached_property
+from typing import FrozenSet, Optional, Sequence
 
 
 @dataclass(frozen=True)
 class Board(ABC):
+    class Impl(Enum):
+        PIECE_SET = 'set'
+        BIT_BOARD = 'bitboard'
+
     pieces: FrozenSet[Piece]
 
     @staticmethod
-    @cache
-    def new(pieces: FrozenSet[Piece]):
-        return _Board(pieces)
+    def new(pieces: FrozenSet[Piece], impl: 'Board.Impl' = Impl.PIECE_SET) -> 'Board':
+        if impl == Board.Impl.BIT_BOARD:
+            return _intern(_BitBoard.from_pieces(pieces))
+        return _intern(_Board(pieces))
+
+    @staticmethod
+    def cache() -> LRUCache['Board', 'Board']:
+        '''The interning cache behind Board.new, with its capacity, clear and stats.'''
+        return _boards
 
     @staticmethod
-    def parse(s: str, has_moved: bool = True) -> 'Board':
-        return Board.new(frozenset({Piece.parse(i, has_moved) for i in s.split(',')}))
+    def parse(s: str, has_moved: bool = True, impl: 'Board.Impl' = Impl.PIECE_SET) -> 'Board':
+        return Board.new(frozenset({Piece.parse(i, has_moved) for i in s.split(',')}), impl)
+
+    def __repr__(self) -> str:
+        return f'{",".join([repr(piece) for piece in self.pieces])}'
+
+    def __str__(self) -> str:
+        s = '\n'
+        for y in range(7, -1, -1):
+            s += f' {y+1} |'
+            for x in range(8):
+                position = Position(x, y)
+                piece = self.pieces_by_position.get(position, None)
+                if piece is None:
+                    s += '    |'
+                else:
+                    s += f' {piece.color.value}{piece.type.value} |'
+            s += '\n'
+        s += '   |' + \
+            ''.join([f' {chr(ord("a")+x)}  |' for x in range(8)]) + '\n'
+        return s
+
+    @property
+    @abstractmethod
+    def impl(self) -> 'Board.Impl': ...
+
+    @property
+    @abstractmethod
+    def zobrist_key(self) -> int:
+        '''64 bit key of the pieces on the board, updated incrementally as pieces change.'''
 
     @abstractmethod
     def with_piece(self, piece: Piece) -> 'Board': ...
@@ -32,11 +76,25 @@ class Board(ABC):
         ...
 
     @abstractmethod
-    def moves_for_piece(self, piece: Piece) -> FrozenSet['Board']: ...
+    def with_move(self, move: Move) -> 'Board': ...
+
+    @abstractmethod
+    def piece_moves(self, piece: Piece) -> Sequence[Move]:
+        '''Moves for piece, including those that leave its king in check.'''
 
     @abstractmethod
+    def color_moves(self, color: Piece.Color) -> Sequence[Move]:
+        '''Moves for color that don't leave its king in check.'''
+
+    def moves_for_piece(self, piece: Piece) -> FrozenSet['Board']:
+        return frozenset({self.with_move(move) for move in self.piece_moves(piece)})
+
     def moves_for_color(self, color: Piece.Color) -> FrozenSet['Board']:
-        ...
+        return frozenset({self.with_move(move) for move in self.color_moves(color)})
+
+    @abstractmethod
+    def is_square_attacked(self, position: Position, color: Piece.Color) -> bool:
+        '''Whether any piece of color could capture on position.'''
 
     @abstractmethod
     def is_piece_threatened(self, piece: Piece) -> bool:
@@ -57,246 +115,453 @@ class Board(ABC):
     @abstractmethod
     def pieces_by_color(self) -> Mapping['Piece.Color', FrozenSet[Piece]]: ...
 
+    @staticmethod
+    def default_board(impl: 'Board.Impl' = Impl.PIECE_SET) -> 'Board':
+        return Board.new(frozenset({
+            Piece(Piece.Color.WHITE, Piece.Type.ROOK, Position.parse('a1')),
+            Piece(Piece.Color.WHITE, Piece.Type.KNIGHT, Position.parse('b1')),
+            Piece(Piece.Color.WHITE, Piece.Type.BISHOP, Position.parse('c1')),
+            Piece(Piece.Color.WHITE, Piece.Type.QUEEN, Position.parse('d1')),
+            Piece(Piece.Color.WHITE, Piece.Type.KING, Position.parse('e1')),
+            Piece(Piece.Color.WHITE, Piece.Type.BISHOP, Position.parse('f1')),
+            Piece(Piece.Color.WHITE, Piece.Type.KNIGHT, Position.parse('g1')),
+            Piece(Piece.Color.WHITE, Piece.Type.ROOK, Position.parse('h1')),
+            Piece(Piece.Color.WHITE, Piece.Type.PAWN, Position.parse('a2')),
+            Piece(Piece.Color.WHITE, Piece.Type.PAWN, Position.parse('b2')),
+            Piece(Piece.Color.WHITE, Piece.Type.PAWN, Position.parse('c2')),
+            Piece(Piece.Color.WHITE, Piece.Type.PAWN, Position.parse('d2')),
+            Piece(Piece.Color.WHITE, Piece.Type.PAWN, Position.parse('e2')),
+            Piece(Piece.Color.WHITE, Piece.Type.PAWN, Position.parse('f2')),
+            Piece(Piece.Color.WHITE, Piece.Type.PAWN, Position.parse('g2')),
+            Piece(Piece.Color.WHITE, Piece.Type.PAWN, Position.parse('h2')),
+            Piece(Piece.Color.BLACK, Piece.Type.ROOK, Position.parse('a8')),
+            Piece(Piece.Color.BLACK, Piece.Type.KNIGHT, Position.parse('b8')),
+            Piece(Piece.Color.BLACK, Piece.Type.BISHOP, Position.parse('c8')),
+            Piece(Piece.Color.BLACK, Piece.Type.QUEEN, Position.parse('d8')),
+            Piece(Piece.Color.BLACK, Piece.Type.KING, Position.parse('e8')),
+            Piece(Piece.Color.BLACK, Piece.Type.BISHOP, Position.parse('f8')),
+            Piece(Piece.Color.BLACK, Piece.Type.KNIGHT, Position.parse('g8')),
+            Piece(Piece.Color.BLACK, Piece.Type.ROOK, Position.parse('h8')),
+            Piece(Piece.Color.BLACK, Piece.Type.PAWN, Position.parse('a7')),
+            Piece(Piece.Color.BLACK, Piece.Type.PAWN, Position.parse('b7')),
+            Piece(Piece.Color.BLACK, Piece.Type.PAWN, Position.parse('c7')),
+            Piece(Piece.Color.BLACK, Piece.Type.PAWN, Position.parse('d7')),
+            Piece(Piece.Color.BLACK, Piece.Type.PAWN, Position.parse('e7')),
+            Piece(Piece.Color.BLACK, Piece.Type.PAWN, Position.parse('f7')),
+            Piece(Piece.Color.BLACK, Piece.Type.PAWN, Position.parse('g7')),
+            Piece(Piece.Color.BLACK, Piece.Type.PAWN, Position.parse('h7')),
+        }), impl)
+
 
-@dataclass(frozen=True)
+DEFAULT_CACHE_CAPACITY = 50000
+
+_boards: LRUCache[Board, Board] = LRUCache(DEFAULT_CACHE_CAPACITY)
+
+
+def _intern(board: Board) -> Board:
+    return _boards.intern(board)
+
+
+@dataclass(frozen=True, repr=False)
 class _Board(Board):
     pieces: FrozenSet[Piece]
+    zobrist_key: int = field(default=None, compare=False)  # type: ignore
 
     def __post_init__(self):
+        if self.zobrist_key is None:
+            object.__setattr__(self, 'zobrist_key', pieces_key(self.pieces))
+        object.__setattr__(self, '_piece_moves_cache', {})
+        object.__setattr__(self, '_color_moves_cache', {})
         if len(self.pieces) != len(self.pieces_by_position):
             raise ValueError(f'duplicate piece positions {repr(self)}')
 
-    def __repr__(self) -> str:
-        return f'{",".join([repr(piece) for piece in self.pieces])}'
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, _Board):
+            return NotImplemented
+        return self.zobrist_key == other.zobrist_key and self.pieces == other.pieces
 
-    def __str__(self) -> str:
-        s = '\n'
-        for y in range(7, -1, -1):
-            s += f' {y+1} |'
-            for x in range(8):
-                position = Position(x, y)
-                piece = self.pieces_by_position.get(position, None)
-                if piece is None:
-                    s += '    |'
-                else:
-                    s += f' {piece.color.value}{piece.type.value} |'
-            s += '\n'
-        s += '   |' + \
-            ''.join([f' {chr(ord("a")+x)}  |' for x in range(8)]) + '\n'
-        return s
+    def __hash__(self) -> int:
+        return self.zobrist_key
+
+    @property
+    def impl(self) -> Board.Impl:
+        return Board.Impl.PIECE_SET
 
     def with_piece(self, piece: Piece) -> 'Board':
-        return Board.new(frozenset({piece}.union(self.pieces)))
+        if piece in self.pieces:
+            return self
+        return _intern(_Board(self.pieces.union({piece}), self.zobrist_key ^ piece_key(piece)))
 
     def without_piece(self, piece: Piece) -> 'Board':
-        return Board.new(self.pieces - {piece})
+        if piece not in self.pieces:
+            return self
+        return _intern(_Board(self.pieces - {piece}, self.zobrist_key ^ piece_key(piece)))
 
     def with_piece_moved(self, piece: Piece, to_position: Position) -> 'Board':
-        board = self
-        to_piece = board.pieces_by_position.get(to_position, None)
+        removed: set[Piece] = set()
+        key = self.zobrist_key
+        to_piece = self.pieces_by_position.get(to_position, None)
         if to_piece is not None:
-            board = board.without_piece(to_piece)
-        return board.without_piece(piece).with_piece(piece.with_position(to_position))
+            removed.add(to_piece)
+            key ^= piece_key(to_piece)
+        if piece in self.pieces and piece != to_piece:
+            removed.add(piece)
+            key ^= piece_key(piece)
+        moved_piece = piece.with_position(to_position)
+        return _intern(_Board((self.pieces - removed).union({moved_piece}), key ^ piece_key(moved_piece)))
+
+    def with_move(self, move: Move) -> 'Board':
+        moved_piece = move.moved_piece
+        key = self.zobrist_key ^ piece_key(move.piece) ^ piece_key(moved_piece)
+        removed = {move.piece}
+        if move.captured is not None:
+            removed.add(move.captured)
+            key ^= piece_key(move.captured)
+        return _intern(_Board((self.pieces - removed).union({moved_piece}), key))
 
-    @property
-    @cache
+    @cached_property
     def pieces_by_position(self) -> Mapping['Position', Piece]:
         return {piece.position: piece for piece in self.pieces}
 
-    @property
-    @cache
+    @cached_property
     def pieces_by_color(self) -> Mapping['Piece.Color', FrozenSet[Piece]]:
         return {color: frozenset({piece for piece in self.pieces if piece.color == color}) for color in Piece.Color}
 
-    def _moves_for_linear_piece(self, deltas: FrozenSet[Position.Delta]) -> Callable[[Piece], FrozenSet['Board']]:
-        def closure(piece: Piece) -> FrozenSet[Board]:
-            boards: set[Board] = set()
-            for delta in deltas:
-                to_position = piece.position
-                while to_position.can_add(delta):
-                    to_position = to_position + delta
-                    to_piece = self.pieces_by_position.get(to_position, None)
-                    if to_piece is None:
-                        boards.add(
-                            self.with_piece_moved(piece, to_position))
-                    elif to_piece.color != piece.color:
-                        boards.add(
-                            self.with_piece_moved(piece, to_position))
-                        break
-                    else:
-                        break
-            return frozenset(boards)
-        return closure
-
-    def _moves_for_deltas(self, deltas: FrozenSet[Position.Delta]) -> Callable[[Piece], FrozenSet['Board']]:
-        def closure(piece: Piece) -> FrozenSet[Board]:
-            boards: set[Board] = set()
-            for delta in deltas:
-                if piece.position.can_add(delta):
-                    to_position = piece.position + delta
-                    to_piece = self.pieces_by_position.get(to_position, None)
-                    if to_piece is None or to_piece.color != piece.color:
-                        boards.add(
-                            self.with_piece_moved(piece, to_position))
-            return frozenset(boards)
-        return closure
-
-    def _moves_for_pawn(self, piece: Piece) -> FrozenSet['Board']:
-        boards: set[Board] = set()
-        dy = 1 if piece.color == piece.Color.WHITE else -1
-
-        def _move_if_empty(boards: set[Board], board: Board, delta: Position.Delta) -> None:
-            if piece.position.can_add(delta):
-                to_position = piece.position + delta
-                if to_position not in self.pieces_by_position:
-                    boards.add(self.with_piece_moved(piece, to_position))
-
-        _move_if_empty(boards, self, Position.Delta(0, dy))
-        if not piece.has_moved:
-            _move_if_empty(boards, self, Position.Delta(0, dy*2))
-
-        def _capture(dx: int) -> None:
-            capture_delta = Position.Delta(dx, dy)
-            if piece.position.can_add(capture_delta):
-                to_position = piece.position + capture_delta
+    def _moves_for_linear_piece(self, piece: Piece, rays: tuple[tuple[tuple[Position, ...], ...], ...]) -> list[Move]:
+        moves: list[Move] = []
+        for ray in rays[piece.position.index]:
+            for to_position in ray:
                 to_piece = self.pieces_by_position.get(to_position, None)
-                if to_piece is not None and to_piece.color != piece.color:
-                    boards.add(self.with_piece_moved(piece, to_position))
-        _capture(-1)
-        _capture(1)
+                if to_piece is None:
+                    moves.append(Move(piece, to_position))
+                elif to_piece.color != piece.color:
+                    moves.append(Move(piece, to_position, to_piece))
+                    break
+                else:
+                    break
+        return moves
+
+    def _moves_for_targets(self, piece: Piece, targets: tuple[tuple[Position, ...], ...]) -> list[Move]:
+        moves: list[Move] = []
+        for to_position in targets[piece.position.index]:
+            to_piece = self.pieces_by_position.get(to_position, None)
+            if to_piece is None or to_piece.color != piece.color:
+                moves.append(Move(piece, to_position, to_piece))
+        return moves
+
+    def _moves_for_pawn(self, piece: Piece) -> list[Move]:
+        moves: list[Move] = []
+        i = piece.position.index
+
+        pushes = PAWN_PUSHES[piece.color][i]
+        for to_position in pushes if not piece.has_moved else pushes[:1]:
+            if to_position in self.pieces_by_position:
+                break
+            moves.append(Move(piece, to_position))
+
+        for to_position in PAWN_CAPTURES[piece.color][i]:
+            to_piece = self.pieces_by_position.get(to_position, None)
+            if to_piece is not None and to_piece.color != piece.color:
+                moves.append(Move(piece, to_position, to_piece))
 
         # TODO pawn exchange, passing
 
-        return frozenset(boards)
+        return moves
+
+    def _moves_for_type(self, piece: Piece) -> list[Move]:
+        if piece.type == Piece.Type.PAWN:
+            return self._moves_for_pawn(piece)
+        if piece.type == Piece.Type.KNIGHT:
+            return self._moves_for_targets(piece, KNIGHT_TARGETS)
+        if piece.type == Piece.Type.KING:
+            # TODO castling
+            return self._moves_for_targets(piece, KING_TARGETS)
+        return self._moves_for_linear_piece(piece, SLIDER_RAYS[piece.type])
+
+    def piece_moves(self, piece: Piece) -> Sequence[Move]:
+        moves = self._piece_moves_cache.get(piece, None)
+        if moves is None:
+            moves = tuple(self._moves_for_type(piece))
+            self._piece_moves_cache[piece] = moves
+        return moves
+
+    def _color_moves_ignoring_check(self, color: Piece.Color) -> Sequence[Move]:
+        return [move for piece in self.pieces_by_color[color] for move in self.piece_moves(piece)]
+
+    def color_moves(self, color: Piece.Color) -> Sequence[Move]:
+        legal = self._color_moves_cache.get(color, None)
+        if legal is None:
+            moves = self._color_moves_ignoring_check(color)
+            kings = [king.position for king in self._pieces_of_type_and_color(
+                Piece.Type.KING, color)]
+            legal = legal_moves(
+                color, moves, self.pieces_by_position.get, kings)
+            if legal is None:
+                legal = [move for move in moves if not self.with_move(
+                    move).is_color_in_check(color)]
+            legal = tuple(legal)
+            self._color_moves_cache[color] = legal
+        return legal
+
+    def is_square_attacked(self, position: Position, color: Piece.Color) -> bool:
+        return is_square_attacked(position.index, color, self.pieces_by_position.get)
+
+    def is_piece_threatened(self, piece: Piece) -> bool:
+        return self.is_square_attacked(piece.position, piece.color.opponent)
+
+    def _pieces_of_type_and_color(self, type: Piece.Type, color: Piece.Color) -> FrozenSet[Piece]:
+        return frozenset({piece for piece in self.pieces if piece.type == type and piece.color == color})
+
+    def is_color_in_check(self, color: Piece.Color) -> bool:
+        return any([self.is_piece_threatened(king) for king in self._pieces_of_type_and_color(Piece.Type.KING, color)])
+
+    def is_color_in_checkmate(self, color: Piece.Color) -> bool:
+        return self.is_color_in_check(color) and not self.color_moves(color)
+
+
+_FULL = (1 << 64) - 1
+_FILE_A = 0x0101010101010101
+_NOT_A = _FULL ^ _FILE_A
+_NOT_H = _FULL ^ (_FILE_A << 7)
+
+_COLOR_INDEX: Mapping[Piece.Color, int] = {
+    color: i for i, color in enumerate(Piece.Color)}
+_TYPE_INDEX: Mapping[Piece.Type, int] = {
+    type: i for i, type in enumerate(Piece.Type)}
+_KINDS: list[tuple[Piece.Color, Piece.Type]] = [
+    (color, type) for color in Piece.Color for type in Piece.Type]
+_KIND_KEYS: list[tuple[int, ...]] = [
+    PIECE_KEYS[color][type] for color, type in _KINDS]
+
+
+def _north(bb: int) -> int:
+    return (bb << 8) & _FULL
+
+
+def _south(bb: int) -> int:
+    return bb >> 8
+
+
+def _east(bb: int) -> int:
+    return (bb << 1) & _NOT_A
+
+
+def _west(bb: int) -> int:
+    return (bb >> 1) & _NOT_H
+
+
+class _BitBoard(Board):
+    '''Board stored as one 64 bit mask per (color, type) plus a mask of squares holding moved pieces.
+
+    Square a1 is bit 0, h1 bit 7 and h8 bit 63.
+    '''
+
+    bitboards: tuple[int, ...]
+    moved: int
+
+    def __init__(self, bitboards: tuple[int, ...], moved: int, zobrist_key: int):
+        object.__setattr__(self, 'bitboards', bitboards)
+        object.__setattr__(self, 'moved', moved)
+        object.__setattr__(self, '_zobrist_key', zobrist_key)
+        white = bitboards[0] | bitboards[1] | bitboards[2] | \
+            bitboards[3] | bitboards[4] | bitboards[5]
+        black = bitboards[6] | bitboards[7] | bitboards[8] | \
+            bitboards[9] | bitboards[10] | bitboards[11]
+        object.__setattr__(self, '_occupied_by_color', (white, black))
+        object.__setattr__(self, '_occupied', white | black)
+        object.__setattr__(self, '_color_moves_cache', {})
+
+    @staticmethod
+    def from_pieces(pieces: FrozenSet[Piece]) -> '_BitBoard':
+        bitboards = [0] * len(_KINDS)
+        occupied = 0
+        moved = 0
+        for piece in pieces:
+            bit = 1 << piece.position.index
+            if occupied & bit:
+                raise ValueError(f'duplicate piece positions {pieces}')
+            occupied |= bit
+            bitboards[_COLOR_INDEX[piece.color] * 6 +
+                      _TYPE_INDEX[piece.type]] |= bit
+            if piece.has_moved:
+                moved |= bit
+        return _BitBoard(tuple(bitboards), moved, pieces_key(pieces))
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, _BitBoard):
+            return NotImplemented
+        return self._zobrist_key == other._zobrist_key and self.bitboards == other.bitboards and self.moved == other.moved
+
+    def __hash__(self) -> int:
+        return self._zobrist_key
+
+    @property
+    def impl(self) -> Board.Impl:
+        return Board.Impl.BIT_BOARD
+
+    @property
+    def zobrist_key(self) -> int:
+        return self._zobrist_key
+
+    def _kind(self, i: int) -> int:
+        bit = 1 << i
+        for kind, bb in enumerate(self.bitboards):
+            if bb & bit:
+                return kind
+        return -1
+
+    def _piece_at(self, i: int) -> Optional[Piece]:
+        kind = self._kind(i)
+        if kind < 0:
+            return None
+        color, type = _KINDS[kind]
+        return Piece(color, type, SQUARES[i], bool(self.moved >> i & 1))
 
     @cached_property
-    def _move_funcs(self) -> Mapping[Piece.Type, Callable[[Piece], FrozenSet['Board']]]:
-        return {
-            Piece.Type.PAWN: self._moves_for_pawn,
-            Piece.Type.BISHOP:
-                self._moves_for_linear_piece(
-                    frozenset({
-                        Position.Delta(1, 1),
-                        Position.Delta(1, -1),
-                        Position.Delta(-1, 1),
-                        Position.Delta(-1, -1),
-                    })
-                ),
-            Piece.Type.ROOK:
-                self._moves_for_linear_piece(
-                    frozenset({
-                        Position.Delta(1, 0),
-                        Position.Delta(-1, 0),
-                        Position.Delta(0, 1),
-                        Position.Delta(0, -1),
-                    })
-                ),
-            Piece.Type.QUEEN:
-                self._moves_for_linear_piece(
-                    frozenset({
-                        Position.Delta(1, 1),
-                        Position.Delta(1, -1),
-                        Position.Delta(-1, 1),
-                        Position.Delta(-1, -1),
-                        Position.Delta(1, 0),
-                        Position.Delta(-1, 0),
-                        Position.Delta(0, 1),
-                        Position.Delta(0, -1),
-                    })
-                ),
-            Piece.Type.KING:
-                self._moves_for_deltas(
-                    frozenset({
-                        Position.Delta(1, 1),
-                        Position.Delta(1, -1),
-                        Position.Delta(-1, 1),
-                        Position.Delta(-1, -1),
-                        Position.Delta(1, 0),
-                        Position.Delta(-1, 0),
-                        Position.Delta(0, 1),
-                        Position.Delta(0, -1),
-                    })
-                ),
-                # TODO castling
-            Piece.Type.KNIGHT:
-                self._moves_for_deltas(
-                    frozenset({
-                        Position.Delta(2, -1),
-                        Position.Delta(2, 1),
-                        Position.Delta(-2, -1),
-                        Position.Delta(-2, 1),
-                        Position.Delta(1, 2),
-                        Position.Delta(-1, 2),
-                        Position.Delta(1, -2),
-                        Position.Delta(-1, -2),
-                    })
-                ),
-        }
+    def pieces(self) -> FrozenSet[Piece]:
+        return frozenset({
+            Piece(color, type, SQUARES[i], bool(self.moved >> i & 1))
+            for (color, type), bb in zip(_KINDS, self.bitboards)
+            for i in squares_of(bb)
+        })
 
-    def moves_for_piece(self, piece: Piece) -> FrozenSet['Board']:
-        return self._moves_for_piece(piece)
+    @cached_property
+    def pieces_by_position(self) -> Mapping['Position', Piece]:
+        return {piece.position: piece for piece in self.pieces}
 
-    @cache
-    def _moves_for_piece(self, piece: Piece) -> FrozenSet['Board']:
-        return self._move_funcs[piece.type](piece)
+    @cached_property
+    def pieces_by_color(self) -> Mapping['Piece.Color', FrozenSet[Piece]]:
+        return {color: frozenset({piece for piece in self.pieces if piece.color == color}) for color in Piece.Color}
 
-    def _moves_for_color_ignoring_check(self, color: Piece.Color) -> FrozenSet['Board']:
-        boards: set[Board] = set()
-        return frozenset(boards.union(*[self.moves_for_piece(piece)
-                                        for piece in self.pieces if piece.color == color]))
+    def with_piece(self, piece: Piece) -> 'Board':
+        i = piece.position.index
+        bit = 1 << i
+        if self._occupied & bit:
+            if self._piece_at(i) == piece:
+                return self
+            raise ValueError(f'duplicate piece positions {repr(self)},{repr(piece)}')
+        bitboards = list(self.bitboards)
+        bitboards[_COLOR_INDEX[piece.color] * 6 +
+                  _TYPE_INDEX[piece.type]] |= bit
+        return _intern(_BitBoard(tuple(bitboards), self.moved | bit if piece.has_moved else self.moved,
+                                 self._zobrist_key ^ piece_key(piece)))
 
-    def moves_for_color(self, color: Piece.Color) -> FrozenSet['Board']:
-        return self._moves_for_color(color)
+    def without_piece(self, piece: Piece) -> 'Board':
+        i = piece.position.index
+        if self._piece_at(i) != piece:
+            return self
+        bit = 1 << i
+        return _intern(_BitBoard(
+            tuple(bb & ~bit for bb in self.bitboards),
+            self.moved & ~bit,
+            self._zobrist_key ^ piece_key(piece),
+        ))
+
+    def _square_key(self, kind: int, i: int) -> int:
+        key = _KIND_KEYS[kind][i]
+        if self.moved >> i & 1:
+            key ^= MOVED_KEYS[i]
+        return key
+
+    def _with_move(self, kind: int, from_i: int, to_i: int) -> 'Board':
+        to_bit = 1 << to_i
+        bitboards = self.bitboards
+        key = self._zobrist_key ^ self._square_key(kind, from_i) ^ \
+            _KIND_KEYS[kind][to_i] ^ MOVED_KEYS[to_i]
+        if self._occupied & to_bit:
+            key ^= self._square_key(self._kind(to_i), to_i)
+            bitboards = tuple(bb & ~to_bit for bb in bitboards)
+        bitboards = bitboards[:kind] + \
+            (bitboards[kind] ^ (1 << from_i) ^ to_bit,) + bitboards[kind+1:]
+        return _intern(_BitBoard(bitboards, (self.moved & ~(1 << from_i)) | to_bit, key))
 
-    @cache
-    def _moves_for_color(self, color: Piece.Color) -> FrozenSet['Board']:
-        return frozenset({board for board in self._moves_for_color_ignoring_check(color) if not board.is_color_in_check(color)})
+    def with_piece_moved(self, piece: Piece, to_position: Position) -> 'Board':
+        from_i = piece.position.index
+        to_i = to_position.index
+        if from_i == to_i or self._piece_at(from_i) != piece:
+            board = self
+            to_piece = board._piece_at(to_i)
+            if to_piece is not None:
+                board = board.without_piece(to_piece)
+            return board.without_piece(piece).with_piece(piece.with_position(to_position))
+        return self._with_move(_COLOR_INDEX[piece.color] * 6 + _TYPE_INDEX[piece.type], from_i, to_i)
+
+    def _targets(self, piece: Piece) -> int:
+        i = piece.position.index
+        color_index = _COLOR_INDEX[piece.color]
+        own = self._occupied_by_color[color_index]
+        if piece.type == Piece.Type.PAWN:
+            bb = 1 << i
+            push = _north(bb) if piece.color == Piece.Color.WHITE else _south(bb)
+            targets = push & ~self._occupied
+            if not self.moved & bb:
+                double_push = _north(
+                    targets) if piece.color == Piece.Color.WHITE else _south(targets)
+                targets |= double_push & ~self._occupied
+            enemy = self._occupied_by_color[1 - color_index]
+            return targets | (PAWN_CAPTURE_MASKS[piece.color][i] & enemy)
+        if piece.type == Piece.Type.KNIGHT:
+            return KNIGHT_MASKS[i] & ~own
+        if piece.type == Piece.Type.KING:
+            return KING_MASKS[i] & ~own
+        return slider_attacks(i, self._occupied, piece.type) & ~own
+
+    def with_move(self, move: Move) -> 'Board':
+        piece = move.piece
+        return self._with_move(_COLOR_INDEX[piece.color] * 6 + _TYPE_INDEX[piece.type], piece.position.index, move.to_position.index)
+
+    def piece_moves(self, piece: Piece) -> Sequence[Move]:
+        enemy = self._occupied_by_color[1 - _COLOR_INDEX[piece.color]]
+        return [Move(piece, SQUARES[to_i], self._piece_at(to_i) if enemy >> to_i & 1 else None)
+                for to_i in squares_of(self._targets(piece))]
+
+    def _color_moves_ignoring_check(self, color: Piece.Color) -> Sequence[Move]:
+        return [move for piece in self.pieces_by_color[color] for move in self.piece_moves(piece)]
+
+    def color_moves(self, color: Piece.Color) -> Sequence[Move]:
+        legal = self._color_moves_cache.get(color, None)
+        if legal is None:
+            moves = self._color_moves_ignoring_check(color)
+            kings = [SQUARES[i] for i in squares_of(
+                self.bitboards[_COLOR_INDEX[color] * 6 + _TYPE_INDEX[Piece.Type.KING]])]
+            legal = legal_moves(
+                color, moves, self.pieces_by_position.get, kings)
+            if legal is None:
+                legal = [move for move in moves if not self.with_move(
+                    move).is_color_in_check(color)]
+            legal = tuple(legal)
+            self._color_moves_cache[color] = legal
+        return legal
+
+    def _is_square_attacked(self, i: int, color: Piece.Color) -> bool:
+        base = _COLOR_INDEX[color] * 6
+        bitboards = self.bitboards
+        if KNIGHT_MASKS[i] & bitboards[base + _TYPE_INDEX[Piece.Type.KNIGHT]]:
+            return True
+        if KING_MASKS[i] & bitboards[base + _TYPE_INDEX[Piece.Type.KING]]:
+            return True
+        # a pawn of color attacks i from the squares an opposing pawn on i would capture
+        if PAWN_CAPTURE_MASKS[color.opponent][i] & bitboards[base + _TYPE_INDEX[Piece.Type.PAWN]]:
+            return True
+        queens = bitboards[base + _TYPE_INDEX[Piece.Type.QUEEN]]
+        if slider_attacks(i, self._occupied, Piece.Type.ROOK) & (bitboards[base + _TYPE_INDEX[Piece.Type.ROOK]] | queens):
+            return True
+        return bool(slider_attacks(i, self._occupied, Piece.Type.BISHOP) & (bitboards[base + _TYPE_INDEX[Piece.Type.BISHOP]] | queens))
+
+    def is_square_attacked(self, position: Position, color: Piece.Color) -> bool:
+        return self._is_square_attacked(position.index, color)
 
     def is_piece_threatened(self, piece: Piece) -> bool:
-        return any([piece not in board.pieces for board in self._moves_for_color_ignoring_check(piece.color.opponent)])
-
-    def _pieces_of_type_and_color(self, type: Piece.Type, color: Piece.Color) -> FrozenSet[Piece]:
-        return frozenset({piece for piece in self.pieces if piece.type == type and piece.color == color})
+        return self._is_square_attacked(piece.position.index, piece.color.opponent)
 
     def is_color_in_check(self, color: Piece.Color) -> bool:
-        return any([self.is_piece_threatened(king) for king in self._pieces_of_type_and_color(Piece.Type.KING, color)])
+        kings = self.bitboards[_COLOR_INDEX[color] * 6 +
+                               _TYPE_INDEX[Piece.Type.KING]]
+        return any([self._is_square_attacked(i, color.opponent) for i in squares_of(kings)])
 
     def is_color_in_checkmate(self, color: Piece.Color) -> bool:
-        return self.is_color_in_check(color) and all([board.is_color_in_check(color) for board in self._moves_for_color_ignoring_check(color)])
-
-    @staticmethod
-    def default_board():
-        return Board.new(frozenset({
-            Piece(Piece.Color.WHITE, Piece.Type.ROOK, Position.parse('a1')),
-            Piece(Piece.Color.WHITE, Piece.Type.KNIGHT, Position.parse('b1')),
-            Piece(Piece.Color.WHITE, Piece.Type.BISHOP, Position.parse('c1')),
-            Piece(Piece.Color.WHITE, Piece.Type.QUEEN, Position.parse('d1')),
-            Piece(Piece.Color.WHITE, Piece.Type.KING, Position.parse('e1')),
-            Piece(Piece.Color.WHITE, Piece.Type.BISHOP, Position.parse('f1')),
-            Piece(Piece.Color.WHITE, Piece.Type.KNIGHT, Position.parse('g1')),
-            Piece(Piece.Color.WHITE, Piece.Type.ROOK, Position.parse('h1')),
-            Piece(Piece.Color.WHITE, Piece.Type.PAWN, Position.parse('a2')),
-            Piece(Piece.Color.WHITE, Piece.Type.PAWN, Position.parse('b2')),
-            Piece(Piece.Color.WHITE, Piece.Type.PAWN, Position.parse('c2')),
-            Piece(Piece.Color.WHITE, Piece.Type.PAWN, Position.parse('d2')),
-            Piece(Piece.Color.WHITE, Piece.Type.PAWN, Position.parse('e2')),
-            Piece(Piece.Color.WHITE, Piece.Type.PAWN, Position.parse('f2')),
-            Piece(Piece.Color.WHITE, Piece.Type.PAWN, Position.parse('g2')),
-            Piece(Piece.Color.WHITE, Piece.Type.PAWN, Position.parse('h2')),
-            Piece(Piece.Color.BLACK, Piece.Type.ROOK, Position.parse('a8')),
-            Piece(Piece.Color.BLACK, Piece.Type.KNIGHT, Position.parse('b8')),
-            Piece(Piece.Color.BLACK, Piece.Type.BISHOP, Position.parse('c8')),
-            Piece(Piece.Color.BLACK, Piece.Type.QUEEN, Position.parse('d8')),
-            Piece(Piece.Color.BLACK, Piece.Type.KING, Position.parse('e8')),
-            Piece(Piece.Color.BLACK, Piece.Type.BISHOP, Position.parse('f8')),
-            Piece(Piece.Color.BLACK, Piece.Type.KNIGHT, Position.parse('g8')),
-            Piece(Piece.Color.BLACK, Piece.Type.ROOK, Position.parse('h8')),
-            Piece(Piece.Color.BLACK, Piece.Type.PAWN, Position.parse('a7')),
-            Piece(Piece.Color.BLACK, Piece.Type.PAWN, Position.parse('b7')),
-            Piece(Piece.Color.BLACK, Piece.Type.PAWN, Position.parse('c7')),
-            Piece(Piece.Color.BLACK, Piece.Type.PAWN, Position.parse('d7')),
-            Piece(Piece.Color.BLACK, Piece.Type.PAWN, Position.parse('e7')),
-            Piece(Piece.Color.BLACK, Piece.Type.PAWN, Position.parse('f7')),
-            Piece(Piece.Color.BLACK, Piece.Type.PAWN, Position.parse('g7')),
-            Piece(Piece.Color.BLACK, Piece.Type.PAWN, Position.parse('h7')),
-        }))
+        return self.is_color_in_check(color) and not self.color_moves(color)
@@ -1,8 +1,10 @@
 from board import Board
 from piece import Piece
+from search_board import SearchBoard
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from typing import Union
 
 
 @dataclass(frozen=True)
@@ -10,4 +12,4 @@ class BoardEvaluator(ABC):
     eval_color: Piece.Color
 
     @abstractmethod
-    def evaluate(self, board: Board) -> float: ...
+    def evaluate(self, board: Union[Board, SearchBoard]) -> float: ...
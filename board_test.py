@@ -1,26 +1,30 @@
 from board import Board
+from move import Move
 from piece import Piece
 from position import Position
+from zobrist import pieces_key
 
 from unittest import TestCase
 
 
 class BoardTest(TestCase):
+    impl: Board.Impl = Board.Impl.PIECE_SET
+
     @staticmethod
     def _piece(pos: str, type: Piece.Type = Piece.Type.PAWN, color: Piece.Color = Piece.Color.WHITE, has_moved: bool = False) -> Piece:
         return Piece(color, type, Position.parse(pos), has_moved)
 
-    @staticmethod
-    def _pos_board(*poss: str) -> Board:
-        return BoardTest._board(*[BoardTest._piece(pos) for pos in poss])
+    @classmethod
+    def _pos_board(cls, *poss: str) -> Board:
+        return cls._board(*[cls._piece(pos) for pos in poss])
 
-    @staticmethod
-    def _board(*pieces: Piece) -> Board:
-        return Board.new(frozenset(pieces))
+    @classmethod
+    def _board(cls, *pieces: Piece) -> Board:
+        return Board.new(frozenset(pieces), cls.impl)
 
     def test_parse(self):
         self.assertEqual(
-            Board.parse('wpd2,bbf8'),
+            Board.parse('wpd2,bbf8', impl=self.impl),
             self._board(
                 self._piece('d2', Piece.Type.PAWN, Piece.Color.WHITE, True),
                 self._piece('f8', Piece.Type.BISHOP, Piece.Color.BLACK, True),
@@ -51,6 +55,53 @@ class BoardTest(TestCase):
             self._board(self._piece('c3', has_moved=True))
         )
 
+    def test_zobrist_key(self):
+        board = Board.parse('wpc2,wnb1,bpd3,bke8', False, self.impl)
+        derived_boards = [
+            board.with_piece(self._piece('e4')),
+            board.without_piece(self._piece('c2')),
+            board.with_piece_moved(self._piece('c2'), Position.parse('d3')),
+            *board.moves_for_color(Piece.Color.WHITE),
+            *board.moves_for_color(Piece.Color.BLACK),
+        ]
+        for derived_board in derived_boards:
+            with self.subTest(derived_board):
+                self.assertEqual(derived_board.zobrist_key,
+                                 pieces_key(derived_board.pieces))
+                self.assertEqual(derived_board, Board.new(
+                    derived_board.pieces, self.impl))
+                self.assertEqual(hash(derived_board), hash(
+                    Board.new(derived_board.pieces, self.impl)))
+
+    def test_zobrist_key_has_moved(self):
+        self.assertNotEqual(
+            self._board(self._piece('c2', has_moved=False)).zobrist_key,
+            self._board(self._piece('c2', has_moved=True)).zobrist_key,
+        )
+
+    def test_cache(self):
+        cache = Board.cache()
+        capacity = cache.capacity
+        try:
+            cache.clear()
+            cache.capacity = 2
+            board = Board.parse('wpc2', impl=self.impl)
+            self.assertIs(Board.parse('wpc2', impl=self.impl), board)
+            Board.parse('wpc3', impl=self.impl)
+            Board.parse('wpc4', impl=self.impl)
+            self.assertEqual(cache.stats, type(cache.stats)(2, 2, 1, 3, 1))
+            self.assertEqual(Board.parse('wpc2', impl=self.impl), board)
+        finally:
+            cache.capacity = capacity
+            cache.clear()
+
+    def test_derived_boards_interned(self):
+        board = Board.parse('wpc2', impl=self.impl)
+        move = next(iter(board.color_moves(Piece.Color.WHITE)))
+        self.assertIs(board.with_move(move), board.with_move(move))
+        self.assertIs(board.with_piece(Piece.parse('bpc7')), Board.parse('wpc2,bpc7', impl=self.impl))
+        self.assertIs(Board.parse('wpc2,bpc7', impl=self.impl).without_piece(Piece.parse('bpc7')), board)
+
     def test_pieces_by_position(self):
         self.assertDictEqual(
             self._pos_board('c2', 'c3').pieces_by_position,
@@ -81,6 +132,14 @@ class BoardTest(TestCase):
             }
         )
 
+    def test_pawn_initial_move_blocked(self):
+        pawn = self._piece('c2', type=Piece.Type.PAWN, has_moved=False)
+        blocker = self._piece('c3', type=Piece.Type.KNIGHT, color=Piece.Color.BLACK)
+        self.assertSetEqual(
+            self._board(pawn, blocker).moves_for_piece(pawn),
+            set()
+        )
+
     def test_pawn_subsequent_move(self):
         pawn = self._piece('c4', type=Piece.Type.PAWN, has_moved=True)
         self.assertSetEqual(
@@ -302,6 +361,32 @@ class BoardTest(TestCase):
                            for piece in white_pieces])
         )
 
+    def test_piece_moves(self):
+        rook = self._piece('d4', type=Piece.Type.ROOK, color=Piece.Color.WHITE)
+        enemy = self._piece('d2', type=Piece.Type.PAWN,
+                            color=Piece.Color.BLACK)
+        board = self._board(enemy, rook)
+        moves = board.piece_moves(rook)
+        self.assertIn(Move(rook, enemy.position, enemy), moves)
+        self.assertIn(Move(rook, Position.parse('d5')), moves)
+        self.assertSetEqual({board.with_move(move) for move in moves},
+                            set(board.moves_for_piece(rook)))
+
+    def test_color_moves(self):
+        white_king = self._piece(
+            'e1', type=Piece.Type.KING, color=Piece.Color.WHITE)
+        white_pawn = self._piece(
+            'a2', type=Piece.Type.PAWN, color=Piece.Color.WHITE)
+        black_rook = self._piece(
+            'e4', type=Piece.Type.ROOK, color=Piece.Color.BLACK)
+        board = self._board(white_king, white_pawn, black_rook)
+        # in check, so only king moves off the e file are legal
+        self.assertSetEqual(
+            set(board.color_moves(Piece.Color.WHITE)),
+            {Move(white_king, Position.parse(pos))
+             for pos in ['d1', 'd2', 'f1', 'f2']},
+        )
+
     def test_threatened(self):
         white_king = self._piece(
             'e1', type=Piece.Type.KING, color=Piece.Color.WHITE)
@@ -312,6 +397,28 @@ class BoardTest(TestCase):
         self.assertFalse(self._board(
             white_king, black_rook.with_position(Position.parse('h4'))).is_piece_threatened(white_king))
 
+    def test_is_square_attacked(self):
+        def case(attacker: str, attacked: list[str], not_attacked: list[str]) -> None:
+            board = Board.parse(attacker, impl=self.impl)
+            for pos in attacked:
+                with self.subTest((attacker, pos)):
+                    self.assertTrue(board.is_square_attacked(
+                        Position.parse(pos), Piece.Color.BLACK))
+            for pos in not_attacked:
+                with self.subTest((attacker, pos)):
+                    self.assertFalse(board.is_square_attacked(
+                        Position.parse(pos), Piece.Color.BLACK))
+        case('bpd5', ['c4', 'e4'], ['d4', 'c6', 'e6'])
+        case('bpd5,wpc4', ['c4', 'e4'], ['b5', 'd5'])
+        case('bnd5', ['c3', 'e7', 'f4'], ['d4', 'd6'])
+        case('bkd5', ['c4', 'd6', 'e5'], ['d3', 'f5'])
+        case('bbd5', ['a8', 'g2', 'h1'], ['d4', 'c5'])
+        case('brd5', ['d1', 'a5', 'h5'], ['c4', 'e6'])
+        case('bqd5', ['d1', 'a8', 'h1'], ['c3', 'f4'])
+        # sliders are blocked by the first piece on the ray
+        case('brd5,wpd3', ['d4', 'd3'], ['d2', 'd1'])
+        case('bbd5,wpf3', ['e4', 'f3'], ['g2', 'h1'])
+
     def test_is_color_in_check(self):
         white_king = self._piece(
             'e1', type=Piece.Type.KING, color=Piece.Color.WHITE)
@@ -335,6 +442,37 @@ class BoardTest(TestCase):
                                      black_rook_2.with_position(Position.parse('b3'))).is_color_in_checkmate(Piece.Color.WHITE))
 
 
+class BitBoardTest(BoardTest):
+    impl = Board.Impl.BIT_BOARD
+
+    def test_matches_piece_set_board(self):
+        for s in ['bke8,bra8,brh8,wke1', 'wpe4,wpg2,bra4', 'wke1,bra1,brb3']:
+            with self.subTest(s):
+                piece_set_board = Board.parse(s, False)
+                bit_board = Board.parse(s, False, Board.Impl.BIT_BOARD)
+                self.assertEqual(piece_set_board.pieces, bit_board.pieces)
+                for color in Piece.Color:
+                    self.assertSetEqual(
+                        {board.pieces for board in piece_set_board.moves_for_color(
+                            color)},
+                        {board.pieces for board in bit_board.moves_for_color(
+                            color)},
+                    )
+                    self.assertEqual(piece_set_board.is_color_in_check(color),
+                                     bit_board.is_color_in_check(color))
+
+    def test_default_board_moves(self):
+        piece_set_board = Board.default_board()
+        bit_board = Board.default_board(Board.Impl.BIT_BOARD)
+        for color in Piece.Color:
+            with self.subTest(color):
+                self.assertSetEqual(
+                    {board.pieces for board in piece_set_board.moves_for_color(
+                        color)},
+                    {board.pieces for board in bit_board.moves_for_color(color)},
+                )
+
+
 if 'unittest.util' in __import__('sys').modules:
     # Show full diff in self.assertEqual.
     __import__('sys').modules['unittest.util']._MAX_LENGTH = 999999999
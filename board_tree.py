@@ -1,10 +1,16 @@
 from board import Board
 from board_evaluator import BoardEvaluator
+from move import Move
+from move_ordering import MoveOrdering
 from piece import Piece
+from quiescence import Quiescence
+from transposition_table import TranspositionTable, best_board
 
 from abc import ABC, abstractmethod
+from collections import deque
 from dataclasses import dataclass, field
 from functools import cached_property
+from typing import Optional
 
 
 @dataclass
@@ -14,6 +20,17 @@ class BoardTree(ABC):
     color: Piece.Color
     depth: int = 0
     children: list['BoardTree'] = field(default_factory=list)
+    transposition_table: Optional[TranspositionTable] = field(
+        default=None, repr=False, compare=False)
+    parent: Optional['BoardTree'] = field(
+        default=None, repr=False, compare=False)
+    quiescence: Optional[Quiescence] = field(
+        default=None, repr=False, compare=False)
+    move_ordering: Optional[MoveOrdering] = field(
+        default=None, repr=False, compare=False)
+    # the move from parent's board to this one
+    move: Optional[Move] = field(
+        default=None, repr=False, compare=False)
 
     def __repr__(self) -> str:
         return self._repr(0)
@@ -26,19 +43,68 @@ class BoardTree(ABC):
             return
         if self.children:
             return
-        self.children = [
-            self.create_child(
-                board,
-                self.board_evaluator,
-                self.color.opponent,
-                self.depth + 1,
-            )
-            for board in self.board.moves_for_color(self.color)
-        ]
+        moves = self.board.color_moves(self.color)
+        if self.move_ordering is not None:
+            moves = self.move_ordering.order(self.board, moves, self.depth, self._best_key())
+        self.children = [self.new_child(self.board.with_move(move), move) for move in moves]
+
+    def new_child(self, board: Board, move: Optional[Move]) -> 'BoardTree':
+        '''Creates a node for board one ply down that shares this node's search state, without adding it to children.'''
+        child = self.create_child(board, self.board_evaluator, self.color.opponent, self.depth + 1)
+        child.transposition_table = self.transposition_table
+        child.parent = self
+        child.quiescence = self.quiescence
+        child.move_ordering = self.move_ordering
+        child.move = move
+        return child
+
+    def _best_key(self) -> Optional[int]:
+        '''The key of the best board from an earlier search of this position, if the transposition table has one.'''
+        if self.transposition_table is None:
+            return None
+        return self.transposition_table.best_key(self.board, self.color)
+
+    def child_board(self, key: int) -> Optional[Board]:
+        '''The board with key among the children, or among the moves if this node hasn't been expanded.'''
+        if not self.children:
+            return best_board(self.board, self.color, key)
+        for child in self.children:
+            if child.board.zobrist_key == key:
+                return child.board
+        return None
+
+    def leaves(self) -> list['BoardTree']:
+        '''Returns the nodes under this one, including itself, that have no children, shallowest first.'''
+        leaves: list[BoardTree] = []
+        queue: deque[BoardTree] = deque([self])
+        while queue:
+            node = queue.popleft()
+            if node.children:
+                queue.extend(node.children)
+            else:
+                leaves.append(node)
+        return leaves
+
+    def shift_depth(self, delta: int) -> None:
+        '''Adds delta to the depth of this node and every node under it.'''
+        stack: list[BoardTree] = [self]
+        while stack:
+            node = stack.pop()
+            node.depth += delta
+            stack.extend(node.children)
+
+    def move_child_to_front(self, board: Board) -> Optional['BoardTree']:
+        '''Moves the child with board to the front of children and returns it, if there is one.'''
+        for i, child in enumerate(self.children):
+            if child.board == board:
+                self.children.insert(0, self.children.pop(i))
+                return child
+        return None
 
     def can_expand(self) -> bool:
         # no checkmates and everybody has to have a piece to move
-        return not any([self.board.is_color_in_checkmate(color) for color in Piece.Color]) and all(self.board.pieces_by_color.values())
+        board = self.board
+        return not any([board.is_color_in_checkmate(color) for color in Piece.Color]) and all(board.pieces_by_color.values())
 
     def expand_to_depth(self, depth: int) -> None:
         if depth > 0 and self.can_expand():
@@ -50,6 +116,13 @@ class BoardTree(ABC):
     def board_value(self) -> float:
         return self.board_evaluator.evaluate(self.board)
 
+    @cached_property
+    def leaf_value(self) -> float:
+        '''The value of this node as a leaf of the search, after a quiescence search if there is one.'''
+        if self.quiescence is None:
+            return self.board_value
+        return self.quiescence.search(self.board, self.color, self.board_evaluator)
+
     @abstractmethod
     def create_child(self, board: Board,
                      board_evaluator: BoardEvaluator,
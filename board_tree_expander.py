@@ -1,44 +1,191 @@
 from board_tree import BoardTree
-from weighted_random_choice import weighted_random_choice
+from frontier import Frontier, HeapFrontier, QueueFrontier, WeightedRandomFrontier
+from transposition_table import TranspositionTable
 
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+import os
+import sys
 from time import time
+import tracemalloc
+from typing import Optional
+
+# UntilTime and UntilMemory aim to look at the clock about this often, in seconds.
+CHECK_INTERVAL = 0.001
 
 
 class StopCondition(ABC):
+    '''Decides when a search should stop.
+
+    Searches call start once and then should_stop before each step, with the
+    number of steps so far and the nodes the search added or reached since
+    the last call, so conditions can keep their own running totals.
+    '''
+
     def start(self) -> None: ...
 
     @abstractmethod
     def should_stop(self, num_samples: int,
-                    candidates: list['BoardTree']) -> bool: ...
+                    candidates: Sequence['BoardTree']) -> bool: ...
 
 
 @dataclass(frozen=True)
 class UntilNumSamples(StopCondition):
     max_num_samples: int
 
-    def should_stop(self, num_samples: int, candidates: list['BoardTree']) -> bool:
+    def should_stop(self, num_samples: int, candidates: Sequence['BoardTree']) -> bool:
         return num_samples >= self.max_num_samples
 
 
 @dataclass
-class UntilTime(StopCondition):
+class _Throttled(StopCondition, ABC):
+    '''Only runs its check every so many calls, spacing the checks about CHECK_INTERVAL apart.'''
+
+    _calls_until_check: int = field(default=1, init=False, repr=False, compare=False)
+    _calls_per_check: int = field(default=1, init=False, repr=False, compare=False)
+    _last_check_time: float = field(default=0, init=False, repr=False, compare=False)
+    _stopped: bool = field(default=False, init=False, repr=False, compare=False)
+
+    def start(self) -> None:
+        self._calls_until_check = 1
+        self._calls_per_check = 1
+        self._last_check_time = time()
+        self._stopped = False
+
+    def should_stop(self, num_samples: int, candidates: Sequence['BoardTree']) -> bool:
+        if self._stopped:
+            return True
+        self._calls_until_check -= 1
+        if self._calls_until_check > 0:
+            return False
+        now = time()
+        if self._check(now):
+            self._stopped = True
+            return True
+        elapsed = now - self._last_check_time
+        calls_per_check = int(self._calls_per_check * CHECK_INTERVAL / elapsed) if elapsed else 2 * self._calls_per_check
+        # grows slowly, so a run of fast calls can't push the next check far past the limit
+        self._calls_per_check = max(1, min(calls_per_check, 2 * self._calls_per_check))
+        self._calls_until_check = self._calls_per_check
+        self._last_check_time = now
+        return False
+
+    @abstractmethod
+    def _check(self, now: float) -> bool: ...
+
+
+@dataclass
+class UntilTime(_Throttled):
     max_time: float
+    start_time: float = field(default=0, init=False, repr=False, compare=False)
 
     def start(self) -> None:
-        self.start_time = time()
+        super().start()
+        self.start_time = self._last_check_time
 
-    def should_stop(self, num_samples: int, candidates: list['BoardTree']) -> bool:
-        return time() - self.start_time >= self.max_time
+    def _check(self, now: float) -> bool:
+        return now - self.start_time >= self.max_time
 
 
-@dataclass(frozen=True)
+@dataclass
+class UntilMemory(_Throttled):
+    '''Stops when memory use has grown by max_mb since start.
+
+    Memory is what tracemalloc has traced if it's running, which only counts
+    Python allocations, and otherwise the resident set size of the process.
+    Only growth counts, since what earlier searches left behind, like a kept
+    tree or a transposition table, rarely gives memory back.
+    '''
+
+    max_mb: float
+    start_usage: int = field(default=0, init=False, repr=False, compare=False)
+
+    def start(self) -> None:
+        super().start()
+        self.start_usage = memory_usage()
+
+    def _check(self, now: float) -> bool:
+        return memory_usage() - self.start_usage >= self.max_mb * 2**20
+
+
+def memory_usage() -> int:
+    '''Bytes traced by tracemalloc if it's running, otherwise the resident set size of the process.'''
+    if tracemalloc.is_tracing():
+        return tracemalloc.get_traced_memory()[0]
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        # no procfs, so fall back to the peak resident set size
+        import resource
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+
+@dataclass
 class UntilDepth(StopCondition):
+    '''Stops once the search has added or reached a node deeper than max_depth.'''
+
     max_depth: int
+    deepest: int = field(default=0, init=False, repr=False, compare=False)
 
-    def should_stop(self, num_samples: int, candidates: list['BoardTree']) -> bool:
-        return any([candidate.depth > self.max_depth for candidate in candidates])
+    def start(self) -> None:
+        self.deepest = 0
+
+    def should_stop(self, num_samples: int, candidates: Sequence['BoardTree']) -> bool:
+        for candidate in candidates:
+            if candidate.depth > self.deepest:
+                self.deepest = candidate.depth
+        return self.deepest > self.max_depth
+
+
+@dataclass
+class UntilNodes(StopCondition):
+    '''Stops once the search has added or reached max_nodes nodes.'''
+
+    max_nodes: int
+    num_nodes: int = field(default=0, init=False, repr=False, compare=False)
+
+    def start(self) -> None:
+        self.num_nodes = 0
+
+    def should_stop(self, num_samples: int, candidates: Sequence['BoardTree']) -> bool:
+        self.num_nodes += len(candidates)
+        return self.num_nodes >= self.max_nodes
+
+
+@dataclass(frozen=True)
+class AnyOf(StopCondition):
+    '''Stops when any of conditions does. Every condition sees every call, so running totals stay right.'''
+
+    conditions: tuple[StopCondition, ...]
+
+    def start(self) -> None:
+        for condition in self.conditions:
+            condition.start()
+
+    def should_stop(self, num_samples: int, candidates: Sequence['BoardTree']) -> bool:
+        return any([condition.should_stop(num_samples, candidates) for condition in self.conditions])
+
+
+@dataclass
+class AllOf(StopCondition):
+    '''Stops once every one of conditions has said to stop, not necessarily at the same time.'''
+
+    conditions: tuple[StopCondition, ...]
+    _stopped: set[int] = field(default_factory=set, init=False, repr=False, compare=False)
+
+    def start(self) -> None:
+        self._stopped.clear()
+        for condition in self.conditions:
+            condition.start()
+
+    def should_stop(self, num_samples: int, candidates: Sequence['BoardTree']) -> bool:
+        for i, condition in enumerate(self.conditions):
+            if condition.should_stop(num_samples, candidates):
+                self._stopped.add(i)
+        return len(self._stopped) == len(self.conditions)
 
 
 @dataclass(frozen=True)
@@ -50,41 +197,55 @@ class BoardTreeExpander(ABC):
         num_samples: int
         num_expansions: int
         total_time: float
+        transposition_table: Optional[TranspositionTable.Stats] = None
+        num_quiescence_nodes: int = 0
 
     def expand(self, board_tree: 'BoardTree') -> 'BoardTreeExpander.Stats':
         self.stop_condition.start()
         start_time: float = time()
         num_samples: int = 0
         num_expansions: int = 0
-        candidates: list[BoardTree] = [board_tree]
-        while candidates and not self.stop_condition.should_stop(num_samples, candidates):
+        quiescence_nodes_before = board_tree.quiescence.num_nodes if board_tree.quiescence is not None else 0
+        candidates = self.frontier()
+        # the root is expanded before the stop condition is asked, so there's always a move to play
+        expanded_root = not board_tree.children and board_tree.can_expand()
+        if expanded_root:
+            board_tree.expand()
+            num_samples += 1
+            num_expansions += len(board_tree.children)
+        # a tree kept from an earlier move carries on from its leaves
+        added: Sequence[BoardTree] = board_tree.leaves()
+        candidates.extend(added)
+        if expanded_root and board_tree.children:
+            added = [board_tree, *added]
+        while candidates and not self.stop_condition.should_stop(num_samples, added):
             num_samples += 1
-            candidate = self.select_candidate(candidates)
-            candidates.remove(candidate)
+            candidate = candidates.pop()
+            added = ()
             if candidate.can_expand():
                 candidate.expand()
-                num_expansions += len(candidate.children)
-                self.add_candidates(candidate.children, candidates)
-        return BoardTreeExpander.Stats(num_samples, num_expansions, time()-start_time)
+                added = candidate.children
+                num_expansions += len(added)
+                candidates.extend(added)
+        return BoardTreeExpander.Stats(num_samples, num_expansions, time()-start_time,
+                                       board_tree.transposition_table.stats if board_tree.transposition_table is not None else None,
+                                       board_tree.quiescence.num_nodes - quiescence_nodes_before if board_tree.quiescence is not None else 0)
 
     @abstractmethod
-    def select_candidate(self, candidates: list['BoardTree']) -> 'BoardTree':
-        ...
-
-    def add_candidates(self, candidates_to_add: list['BoardTree'], candidates: list['BoardTree']) -> None:
-        candidates.extend(candidates_to_add)
+    def frontier(self) -> Frontier:
+        '''Returns an empty frontier that pops candidates in this expander's order.'''
 
 
 class BFSExpander(BoardTreeExpander):
-    def select_candidate(self, candidates: list['BoardTree']) -> 'BoardTree':
-        return candidates[0]
+    def frontier(self) -> Frontier:
+        return QueueFrontier()
 
 
 class GreedyExpander(BoardTreeExpander):
-    def select_candidate(self, candidates: list['BoardTree']) -> 'BoardTree':
-        return max(candidates, key=lambda candidate: candidate.board_value)
+    def frontier(self) -> Frontier:
+        return HeapFrontier(lambda candidate: candidate.board_value)
 
 
 class WeightedRandomExpander(BoardTreeExpander):
-    def select_candidate(self, candidates: list['BoardTree']) -> 'BoardTree':
-        return weighted_random_choice([(candidate, candidate.board_value) for candidate in candidates])
+    def frontier(self) -> Frontier:
+        return WeightedRandomFrontier(lambda candidate: candidate.board_value)
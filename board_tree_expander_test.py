@@ -0,0 +1,135 @@
+from board import Board
+from board_tree_expander import (AllOf, AnyOf, BFSExpander, UntilDepth, UntilMemory, UntilNodes,
+                                 UntilNumSamples, UntilTime, memory_usage)
+from iterative_deepening_player import IterativeDeepeningPlayer
+from min_max_board_tree import MinMaxBoardTree
+from piece import Piece
+from piece_value_board_evaluator import PieceValueBoardEvalutor
+
+from time import sleep, time
+import tracemalloc
+from unittest import TestCase
+
+
+class StopConditionTest(TestCase):
+    _BOARD = 'wke1,wqd1,wpe2,wpf2,bke8,brh8,bpe7,bnc6'
+
+    @classmethod
+    def _board_tree(cls) -> MinMaxBoardTree:
+        return MinMaxBoardTree(Board.parse(cls._BOARD, False),
+                               PieceValueBoardEvalutor(Piece.Color.WHITE),
+                               Piece.Color.WHITE)
+
+    def test_until_depth(self):
+        board_tree = self._board_tree()
+        BFSExpander(UntilDepth(2)).expand(board_tree)
+        self.assertEqual(max(leaf.depth for leaf in board_tree.leaves()), 3)
+        self.assertTrue(all(child.children for child in board_tree.children))
+
+    def test_until_depth_iterative_deepening(self):
+        _, stats = IterativeDeepeningPlayer(Piece.Color.WHITE,
+                                            PieceValueBoardEvalutor(Piece.Color.WHITE),
+                                            UntilDepth(3)).search(Board.parse(self._BOARD, False))
+        self.assertEqual(stats.depth, 3)
+
+    def test_until_nodes(self):
+        board_tree = self._board_tree()
+        stats = BFSExpander(UntilNodes(100)).expand(board_tree)
+        # the root counts as a node, and the expansion that reaches the budget finishes
+        self.assertGreaterEqual(stats.num_expansions + 1, 100)
+        self.assertLess(stats.num_expansions + 1 - max(len(child.children) for child in board_tree.children), 100)
+
+    def test_until_time(self):
+        condition = UntilTime(0.05)
+        condition.start()
+        start_time = time()
+        num_calls = 0
+        while not condition.should_stop(num_calls, ()):
+            num_calls += 1
+        self.assertGreaterEqual(time() - start_time, 0.05)
+        self.assertLess(time() - start_time, 0.5)
+        # stays stopped
+        self.assertTrue(condition.should_stop(num_calls, ()))
+        condition.start()
+        self.assertFalse(condition.should_stop(0, ()))
+
+    def test_until_time_slow_calls(self):
+        condition = UntilTime(0.05)
+        condition.start()
+        num_calls = 0
+        while not condition.should_stop(num_calls, ()):
+            sleep(0.01)
+            num_calls += 1
+        self.assertLessEqual(num_calls, 6)
+
+    def test_until_memory(self):
+        tracemalloc.start()
+        try:
+            condition = UntilMemory(1)
+            condition.start()
+            self.assertFalse(condition.should_stop(0, ()))
+            data = bytearray(2 * 2**20)
+            sleep(0.01)
+            num_calls = 0
+            while not condition.should_stop(num_calls, ()):
+                num_calls += 1
+            self.assertLess(num_calls, 10)
+            del data
+        finally:
+            tracemalloc.stop()
+        self.assertGreater(memory_usage(), 0)
+
+    def test_until_memory_counts_growth(self):
+        tracemalloc.start()
+        try:
+            ballast = bytearray(2 * 2**20)
+            # memory already in use when the search starts doesn't count against it
+            condition = UntilMemory(1)
+            condition.start()
+            self.assertFalse(condition.should_stop(0, ()))
+            del ballast
+        finally:
+            tracemalloc.stop()
+
+    def test_stopped_search_expands_root(self):
+        board_tree = self._board_tree()
+        stats = BFSExpander(UntilNumSamples(0)).expand(board_tree)
+        self.assertEqual(stats.num_samples, 1)
+        self.assertEqual(len(board_tree.children), stats.num_expansions)
+        self.assertGreater(len(board_tree.result.boards), 1)
+
+    def test_any_of(self):
+        condition = AnyOf((UntilNumSamples(10), UntilNodes(3)))
+        condition.start()
+        self.assertFalse(condition.should_stop(0, ()))
+        self.assertTrue(condition.should_stop(10, ()))
+        condition.start()
+        board_tree = self._board_tree()
+        board_tree.expand()
+        self.assertTrue(condition.should_stop(0, board_tree.children))
+
+    def test_any_of_updates_every_condition(self):
+        nodes = UntilNodes(3)
+        condition = AnyOf((UntilNumSamples(0), nodes))
+        condition.start()
+        board_tree = self._board_tree()
+        board_tree.expand()
+        condition.should_stop(0, board_tree.children[:2])
+        self.assertEqual(nodes.num_nodes, 2)
+
+    def test_all_of(self):
+        condition = AllOf((UntilNumSamples(10), UntilDepth(1)))
+        condition.start()
+        board_tree = self._board_tree()
+        board_tree.expand_to_depth(2)
+        self.assertFalse(condition.should_stop(0, board_tree.children[0].children))
+        # the depth condition said to stop earlier
+        self.assertTrue(condition.should_stop(10, ()))
+        condition.start()
+        self.assertFalse(condition.should_stop(10, ()))
+
+    def test_hard_cap(self):
+        board_tree = self._board_tree()
+        start_time = time()
+        BFSExpander(AnyOf((UntilTime(0.2), UntilMemory(2**20)))).expand(board_tree)
+        self.assertLess(time() - start_time, 1)
@@ -2,17 +2,37 @@ from board import Board
 from board_evaluator import BoardEvaluator
 from board_tree import BoardTree
 from board_tree_expander import BoardTreeExpander
+from move_ordering import MoveOrdering
 from player import Player
+from quiescence import Quiescence
+from transposition_table import TranspositionTable
 
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from time import time
+from typing import Optional
+
+
+@dataclass
+class _LastSearch:
+    '''The mutable part of a BoardTreePlayer: the tree searched for the last move, kept so the next move can carry on from it.'''
+
+    board_tree: Optional[BoardTree] = None
 
 
 @dataclass(frozen=True)
 class BoardTreePlayer(Player, ABC):
     board_evaluator: BoardEvaluator
     board_tree_expander: BoardTreeExpander
+    # kept for the whole game, so later moves can use what earlier ones searched
+    transposition_table: TranspositionTable = field(
+        default_factory=TranspositionTable, repr=False, compare=False)
+    # searches captures at the leaves if set
+    quiescence: Optional[Quiescence] = None
+    # sorts children before they're searched if set
+    move_ordering: Optional[MoveOrdering] = None
+    _last_search: _LastSearch = field(
+        default_factory=_LastSearch, init=False, repr=False, compare=False)
 
     def __post_init__(self):
         if not self.color == self.board_evaluator.eval_color:
@@ -21,14 +41,38 @@ class BoardTreePlayer(Player, ABC):
     @abstractmethod
     def board_tree(self, board: Board) -> BoardTree: ...
 
+    @property
+    def _board_tree(self) -> Optional[BoardTree]:
+        return self._last_search.board_tree
+
+    def _reused_board_tree(self, board: Board) -> Optional[BoardTree]:
+        '''Returns the node of the last move's tree for board, two plies down, as a new root.'''
+        if self._board_tree is None:
+            return None
+        for child in self._board_tree.children:
+            for grandchild in child.children:
+                if grandchild.board == board and grandchild.color == self.color:
+                    grandchild.shift_depth(-grandchild.depth)
+                    grandchild.parent = None
+                    return grandchild
+        return None
+
     def move(self, board: Board) -> Board:
         print(f'{self} player considering board {board}')
-        board_tree = self.board_tree(board)
+        self.transposition_table.new_search()
+        if self.move_ordering is not None:
+            self.move_ordering.new_search()
+        board_tree = self._reused_board_tree(board)
+        if board_tree is None:
+            board_tree = self.board_tree(board)
+        # drops the rest of the old tree
+        self._last_search.board_tree = board_tree
         expansion_stats: BoardTreeExpander.Stats = self.board_tree_expander.expand(
             board_tree)
         start_time = time()
-        child_results = [child.result for child in board_tree.children]
-        max_child_result = max(child_results, key=lambda result: result.value)
+        result = board_tree.result
         print(
-            f'result boards {"".join([str(board) for board in max_child_result.boards])} stats {expansion_stats} at depth {len(max_child_result.boards)} with value {max_child_result.value} in {time() - start_time}')
-        return max_child_result.boards[0]
+            f'result boards {"".join([str(board) for board in result.boards[1:]])} stats {expansion_stats} at depth {len(result.boards) - 1} with value {result.value} in {time() - start_time}')
+        if len(result.boards) < 2:
+            raise ValueError(f'no moves for {self.color} on {board}')
+        return result.boards[1]
@@ -0,0 +1,373 @@
+from board import Board
+from board_evaluator import BoardEvaluator
+from board_tree import BoardTree
+from move import Move
+from move_ordering import MoveOrdering
+from piece import Piece
+from position import Position
+from quiescence import Quiescence
+from transposition_table import TranspositionTable, best_board
+
+from array import array
+from typing import Optional
+
+# move column value for the root, which no move leads to
+_NO_MOVE = 0xFFFF
+
+
+def _encode_move(move: Move) -> int:
+    return move.from_position.index << 6 | move.to_position.index
+
+
+class TreeStore:
+    '''A minimax search tree held as parallel columns, one row per node.
+
+    Rows only hold numbers, so a tree of millions of nodes is a few dozen
+    arrays instead of millions of objects for the garbage collector to walk.
+    Only the root's board is kept, and other boards are rebuilt by playing
+    the moves column down from it. The evaluator, color and search state
+    that every BoardTree node carries are kept once for the whole tree. The
+    children of a node are added as consecutive rows when it's expanded.
+    '''
+
+    def __init__(self, board: Board, board_evaluator: BoardEvaluator, color: Piece.Color,
+                 transposition_table: Optional[TranspositionTable] = None,
+                 quiescence: Optional[Quiescence] = None,
+                 move_ordering: Optional[MoveOrdering] = None):
+        self.board_evaluator = board_evaluator
+        self.color = color
+        self.transposition_table = transposition_table
+        self.quiescence = quiescence
+        self.move_ordering = move_ordering
+        self.root_board = board
+        self.parents = array('l')
+        # from square index << 6 | to square index
+        self.moves = array('H')
+        self.depths = array('l')
+        self.board_values = array('d')
+        # minimax value, or the leaf value until the node is expanded
+        self.values = array('d')
+        self.searched_depths = array('l')
+        self.best_children = array('l')
+        self.first_children = array('l')
+        self.num_children = array('H')
+        # times the node was expanded
+        self.visits = array('L')
+        # keys of the best boards the transposition table gave unexpanded nodes, by row
+        self.leaf_best: dict[int, int] = {}
+        self._add(board, -1, _NO_MOVE, 0)
+
+    def __len__(self) -> int:
+        return len(self.parents)
+
+    @property
+    def num_bytes(self) -> int:
+        '''Bytes held by the columns.'''
+        columns = [self.parents, self.moves, self.depths, self.board_values, self.values, self.searched_depths,
+                   self.best_children, self.first_children, self.num_children, self.visits]
+        return sum(column.buffer_info()[1] * column.itemsize for column in columns)
+
+    def color_at(self, i: int) -> Piece.Color:
+        return self.color if self.depths[i] % 2 == self.depths[0] % 2 else self.color.opponent
+
+    def move(self, board: Board, i: int) -> Move:
+        '''Returns the move that leads to row i from board, its parent's board.'''
+        move = self.moves[i]
+        pieces = board.pieces_by_position
+        to_position = Position.at(move & 63)
+        return Move(pieces[Position.at(move >> 6)], to_position, pieces.get(to_position))
+
+    def board(self, i: int) -> Board:
+        '''Returns the board of row i, rebuilt by playing the moves down from the root's board.'''
+        if i == 0:
+            return self.root_board
+        rows = []
+        while i > 0:
+            rows.append(i)
+            i = self.parents[i]
+        # moves the pieces directly rather than building a board for every ply on the way
+        pieces = dict(self.root_board.pieces_by_position)
+        for row in reversed(rows):
+            move = self.moves[row]
+            to_position = Position.at(move & 63)
+            pieces[to_position] = pieces.pop(Position.at(move >> 6)).with_position(to_position)
+        return Board.new(frozenset(pieces.values()), self.root_board.impl)
+
+    def _add(self, board: Board, parent: int, move: int, depth: int) -> int:
+        i = len(self.parents)
+        self.parents.append(parent)
+        self.moves.append(move)
+        self.depths.append(depth)
+        self.visits.append(0)
+        self.best_children.append(-1)
+        self.first_children.append(-1)
+        self.num_children.append(0)
+        board_value = self.board_evaluator.evaluate(board)
+        self.board_values.append(board_value)
+        value, searched_depth = board_value, 0
+        color = self.color_at(i)
+        entry = self.transposition_table.get(board, color) if self.transposition_table is not None else None
+        if entry is not None and entry.depth > 0 and entry.bound == TranspositionTable.Bound.EXACT:
+            # an unexpanded node may have been searched deeper elsewhere in the tree or in an earlier move
+            value, searched_depth = entry.value, entry.depth
+            if entry.best_key is not None:
+                self.leaf_best[i] = entry.best_key
+        elif self.quiescence is not None:
+            value = self.quiescence.search(board, color, self.board_evaluator)
+        self.values.append(value)
+        self.searched_depths.append(searched_depth)
+        return i
+
+    def children(self, i: int) -> range:
+        return range(self.first_children[i], self.first_children[i] + self.num_children[i])
+
+    def expand(self, i: int) -> None:
+        self.visits[i] += 1
+        if self.num_children[i]:
+            return
+        board = self.board(i)
+        boards = {i: board}
+        color = self.color_at(i)
+        moves = board.color_moves(color)
+        if self.move_ordering is not None:
+            best_key = self.transposition_table.best_key(board, color) if self.transposition_table is not None else None
+            moves = self.move_ordering.order(board, moves, self.depths[i], best_key)
+        if not moves:
+            return
+        self.first_children[i] = len(self.parents)
+        self.num_children[i] = len(moves)
+        for move in moves:
+            child_board = board.with_move(move)
+            boards[self._add(child_board, i, _encode_move(move), self.depths[i] + 1)] = child_board
+        while i >= 0 and self._update(i, boards):
+            i = self.parents[i]
+
+    def _update(self, i: int, boards: dict[int, Board]) -> bool:
+        '''Recomputes row i from its children and returns whether it changed.
+
+        boards holds the boards already at hand, by row.
+        '''
+        children = self.children(i)
+        if not children:
+            return False
+        values = self.values
+        maximizing = self.color_at(i) == self.board_evaluator.eval_color
+        best_child = (max if maximizing else min)(children, key=values.__getitem__)
+        searched_depth = 1 + min(self.searched_depths[child] for child in children)
+        if best_child == self.best_children[i] and values[best_child] == values[i] and searched_depth == self.searched_depths[i]:
+            return False
+        self.best_children[i] = best_child
+        values[i] = values[best_child]
+        self.searched_depths[i] = searched_depth
+        if self.transposition_table is not None:
+            board = boards[i] if i in boards else self.board(i)
+            best = boards[best_child] if best_child in boards else board.with_move(self.move(board, best_child))
+            self.transposition_table.put(board, self.color_at(i), searched_depth, values[i],
+                                         TranspositionTable.Bound.EXACT, best)
+        return True
+
+    def move_to_front(self, i: int) -> None:
+        '''Moves row i ahead of its siblings, keeping each row's subtree attached to it.'''
+        parent = self.parents[i]
+        first = self.first_children[parent]
+        if i == first:
+            return
+        rows = range(first, i + 1)
+
+        def rotate(column):
+            column[first:i + 1] = column[i:i + 1] + column[first:i]
+        for column in [self.parents, self.moves, self.depths, self.board_values, self.values,
+                       self.searched_depths, self.best_children, self.first_children, self.num_children,
+                       self.visits]:
+            rotate(column)
+        self.leaf_best = {(first if row == i else row + 1 if row in rows else row): best
+                          for row, best in self.leaf_best.items()}
+        best_child = self.best_children[parent]
+        if best_child in rows:
+            self.best_children[parent] = first if best_child == i else best_child + 1
+        for row in rows:
+            for child in self.children(row):
+                self.parents[child] = row
+
+    def subtree(self, i: int) -> 'TreeStore':
+        '''Returns a copy of the subtree under row i, with row i as its root at depth 0.'''
+        store = TreeStore.__new__(TreeStore)
+        store.board_evaluator = self.board_evaluator
+        store.color = self.color_at(i)
+        store.transposition_table = self.transposition_table
+        store.quiescence = self.quiescence
+        store.move_ordering = self.move_ordering
+        store.root_board = self.board(i)
+        for name in ['parents', 'moves', 'depths', 'board_values', 'values', 'searched_depths',
+                     'best_children', 'first_children', 'num_children', 'visits']:
+            setattr(store, name, array(getattr(self, name).typecode))
+        store.leaf_best = {}
+        # copies level by level, so every node's children stay consecutive
+        rows = {i: 0}
+        order = [i]
+        for row in order:
+            order.extend(self.children(row))
+        for new_row, row in enumerate(order):
+            rows[row] = new_row
+        for row in order:
+            store.parents.append(rows[self.parents[row]] if row != i else -1)
+            store.moves.append(self.moves[row] if row != i else _NO_MOVE)
+            store.depths.append(self.depths[row] - self.depths[i])
+            store.board_values.append(self.board_values[row])
+            store.values.append(self.values[row])
+            store.searched_depths.append(self.searched_depths[row])
+            store.best_children.append(rows[self.best_children[row]] if self.best_children[row] >= 0 else -1)
+            store.first_children.append(rows[self.first_children[row]] if self.num_children[row] else -1)
+            store.num_children.append(self.num_children[row])
+            store.visits.append(self.visits[row])
+            if row in self.leaf_best:
+                store.leaf_best[rows[row]] = self.leaf_best[row]
+        return store
+
+
+class CompactBoardTree(BoardTree):
+    '''A view of one row of a TreeStore with the BoardTree API.
+
+    Views hold only the store and the row, and children creates new views
+    each time, so a search holds views only for the nodes it's working on.
+    Results match MinMaxBoardTree's over the same expansions. Moving a child
+    to the front moves rows, so views taken before then may point at other
+    nodes.
+    '''
+
+    def __init__(self, store: TreeStore, index: int = 0):
+        self._store = store
+        self._index = index
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, CompactBoardTree) and other._store is self._store and other._index == self._index
+
+    def __hash__(self) -> int:
+        return hash((id(self._store), self._index))
+
+    @staticmethod
+    def new(board: Board, board_evaluator: BoardEvaluator, color: Piece.Color,
+            transposition_table: Optional[TranspositionTable] = None,
+            quiescence: Optional[Quiescence] = None,
+            move_ordering: Optional[MoveOrdering] = None) -> 'CompactBoardTree':
+        return CompactBoardTree(TreeStore(board, board_evaluator, color, transposition_table, quiescence, move_ordering))
+
+    @property
+    def store(self) -> TreeStore:
+        return self._store
+
+    @property
+    def index(self) -> int:
+        return self._index
+
+    @property  # type: ignore[override]
+    def board(self) -> Board:
+        return self._store.board(self._index)
+
+    @property  # type: ignore[override]
+    def board_evaluator(self) -> BoardEvaluator:
+        return self._store.board_evaluator
+
+    @property  # type: ignore[override]
+    def color(self) -> Piece.Color:
+        return self._store.color_at(self._index)
+
+    @property  # type: ignore[override]
+    def depth(self) -> int:
+        return self._store.depths[self._index]
+
+    @depth.setter
+    def depth(self, depth: int) -> None:
+        self._store.depths[self._index] = depth
+
+    @property  # type: ignore[override]
+    def children(self) -> list[BoardTree]:
+        return [CompactBoardTree(self._store, child) for child in self._store.children(self._index)]
+
+    @property  # type: ignore[override]
+    def parent(self) -> Optional[BoardTree]:
+        parent = self._store.parents[self._index]
+        return CompactBoardTree(self._store, parent) if parent >= 0 else None
+
+    @property  # type: ignore[override]
+    def transposition_table(self) -> Optional[TranspositionTable]:
+        return self._store.transposition_table
+
+    @property  # type: ignore[override]
+    def quiescence(self) -> Optional[Quiescence]:
+        return self._store.quiescence
+
+    @property  # type: ignore[override]
+    def move_ordering(self) -> Optional[MoveOrdering]:
+        return self._store.move_ordering
+
+    @property  # type: ignore[override]
+    def move(self) -> Optional[Move]:
+        if self._store.moves[self._index] == _NO_MOVE:
+            return None
+        return self._store.move(self._store.board(self._store.parents[self._index]), self._index)
+
+    @property  # type: ignore[override]
+    def board_value(self) -> float:
+        return self._store.board_values[self._index]
+
+    @property
+    def value(self) -> float:
+        return self._store.values[self._index]
+
+    @property
+    def searched_depth(self) -> int:
+        '''The depth to which every line under this node was searched.'''
+        return self._store.searched_depths[self._index]
+
+    @property
+    def visits(self) -> int:
+        return self._store.visits[self._index]
+
+    def expand(self) -> None:
+        if self.can_expand():
+            self._store.expand(self._index)
+
+    def move_child_to_front(self, board: Board) -> Optional[BoardTree]:
+        parent_board = self.board
+        for child in self._store.children(self._index):
+            if parent_board.with_move(self._store.move(parent_board, child)) == board:
+                self._store.move_to_front(child)
+                return CompactBoardTree(self._store, self._store.first_children[self._index])
+        return None
+
+    def detached(self) -> 'CompactBoardTree':
+        '''Returns this node as the root of a new store, leaving the rest of the tree behind.'''
+        return CompactBoardTree(self._store.subtree(self._index))
+
+    @property
+    def result(self) -> BoardTree.Result:
+        store = self._store
+        boards = [self.board]
+        i = self._index
+        while store.best_children[i] >= 0:
+            i = store.best_children[i]
+            boards.append(boards[-1].with_move(store.move(boards[-1], i)))
+        best_key = store.leaf_best.get(i)
+        if best_key is not None:
+            best = best_board(boards[-1], store.color_at(i), best_key)
+            if best is not None:
+                boards.append(best)
+        return BoardTree.Result(boards, store.values[self._index])
+
+    def create_child(self, board: Board,
+                     board_evaluator: BoardEvaluator,
+                     color: Piece.Color,
+                     depth: int) -> 'BoardTree':
+        '''Returns board as the root of a new store that shares this tree's search state.
+
+        Rows are only added to a store by expand, so the new tree isn't
+        attached to this one.
+        '''
+        child = CompactBoardTree.new(board, board_evaluator, color, self.transposition_table, self.quiescence,
+                                     self.move_ordering)
+        child.depth = depth
+        return child
+
+    def new_child(self, board: Board, move: Optional[Move]) -> BoardTree:
+        return self.create_child(board, self.board_evaluator, self.color.opponent, self.depth + 1)
@@ -0,0 +1,155 @@
+from board import Board
+from board_tree import BoardTree
+from board_tree_expander import BFSExpander, GreedyExpander, UntilNumSamples
+from compact_board_tree import CompactBoardTree
+from min_max_board_tree import MinMaxBoardTree
+from move import Move
+from piece import Piece
+from piece_value_board_evaluator import PieceValueBoardEvalutor
+from position import Position
+from transposition_table import TranspositionTable
+
+import gc
+import tracemalloc
+from unittest import TestCase
+
+
+def _boards(board_tree: BoardTree) -> list[Board]:
+    return [board_tree.board] + [board for child in board_tree.children for board in _boards(child)]
+
+
+class CompactBoardTreeTest(TestCase):
+    _BOARDS = [
+        'wpe4,wpg2,bra4',
+        'wke1,wqd1,wpe2,wpf2,bke8,brh8,bpe7,bnc6',
+        'bke8,bra8,brh8,wke1',
+    ]
+
+    @staticmethod
+    def _compact(board: str) -> CompactBoardTree:
+        return CompactBoardTree.new(Board.parse(board, False),
+                                    PieceValueBoardEvalutor(Piece.Color.WHITE),
+                                    Piece.Color.WHITE)
+
+    @staticmethod
+    def _min_max(board: str) -> MinMaxBoardTree:
+        return MinMaxBoardTree(Board.parse(board, False),
+                               PieceValueBoardEvalutor(Piece.Color.WHITE),
+                               Piece.Color.WHITE)
+
+    def test_matches_min_max(self):
+        for board in self._BOARDS:
+            for expander in [BFSExpander(UntilNumSamples(200)), GreedyExpander(UntilNumSamples(200))]:
+                with self.subTest((board, expander)):
+                    compact = self._compact(board)
+                    min_max = self._min_max(board)
+                    expander.expand(compact)
+                    expander.expand(min_max)
+                    self.assertEqual(compact.result, min_max.result)
+                    self.assertEqual(compact.searched_depth, min_max.searched_depth)
+                    self.assertEqual(_boards(compact), _boards(min_max))
+
+    def test_transposition_table(self):
+        table = TranspositionTable()
+        compact = self._compact('wpe4,wpg2,bra4')
+        compact.store.transposition_table = table
+        compact.expand_to_depth(2)
+        entry = table.get(compact.board, compact.color)
+        assert entry is not None
+        self.assertEqual((entry.depth, entry.value, entry.best_key), (2, compact.value, compact.result.boards[1].zobrist_key))
+        # a new tree over the same position reads the deeper value from the table
+        shallow = CompactBoardTree.new(compact.board, compact.board_evaluator, compact.color,
+                                       transposition_table=table)
+        self.assertEqual(shallow.result.value, compact.value)
+        self.assertEqual(shallow.result.boards, compact.result.boards[:2])
+        self.assertEqual(shallow.searched_depth, 2)
+
+    def test_view(self):
+        compact = self._compact('wpe4,wpg2,bra4')
+        self.assertEqual(compact.children, [])
+        compact.expand()
+        children = compact.children
+        self.assertEqual({child.board for child in children},
+                         compact.board.moves_for_color(Piece.Color.WHITE))
+        for child in children:
+            self.assertEqual(child.color, Piece.Color.BLACK)
+            self.assertEqual(child.depth, 1)
+            self.assertEqual(child.parent, compact)
+            assert child.move is not None
+            self.assertEqual(compact.board.with_move(child.move), child.board)
+        self.assertIsNone(compact.parent)
+        self.assertIsNone(compact.move)
+        self.assertEqual(compact.visits, 1)
+
+    def test_capture_moves(self):
+        compact = self._compact('wrd1,bnd5,bke8,wke1')
+        compact.expand()
+        captures = [child for child in compact.children if child.move is not None and child.move.is_capture]
+        self.assertEqual([child.move for child in captures], [Move(Piece.parse('wrd1', False), Position.parse('d5'), Piece.parse('bnd5', False))])
+        self.assertEqual(captures[0].board, compact.board.with_move(captures[0].move))
+
+    def test_move_child_to_front(self):
+        compact = self._compact('wke1,wqd1,wpe2,wpf2,bke8,brh8,bpe7,bnc6')
+        BFSExpander(UntilNumSamples(100)).expand(compact)
+        result = compact.result
+        subtrees = {child.board: _boards(child) for child in compact.children}
+        last = compact.children[-1].board
+        moved = compact.move_child_to_front(last)
+        assert moved is not None
+        self.assertEqual(moved.board, last)
+        self.assertEqual(compact.children[0].board, last)
+        self.assertEqual({child.board: _boards(child) for child in compact.children}, subtrees)
+        self.assertTrue(all(grandchild.parent == child
+                            for child in compact.children for grandchild in child.children))
+        self.assertEqual(compact.result, result)
+        self.assertIsNone(compact.move_child_to_front(compact.board))
+
+    def test_detached(self):
+        compact = self._compact('wke1,wqd1,wpe2,wpf2,bke8,brh8,bpe7,bnc6')
+        BFSExpander(UntilNumSamples(100)).expand(compact)
+        grandchild = compact.children[1].children[2]
+        detached = grandchild.detached()
+        self.assertEqual(detached.depth, 0)
+        self.assertIsNone(detached.parent)
+        self.assertEqual(detached.color, grandchild.color)
+        self.assertEqual(_boards(detached), _boards(grandchild))
+        self.assertEqual(detached.result, grandchild.result)
+        self.assertEqual(len(detached.store), len(_boards(grandchild)))
+
+    def test_bytes_per_node(self):
+        tracemalloc.start()
+        try:
+            compact = self._compact('wke1,wqd1,wpe2,wpf2,bke8,brh8,bpe7,bnc6')
+            BFSExpander(UntilNumSamples(100)).expand(compact)
+            num_nodes = len(compact.store)
+            # leaves only what the tree itself keeps alive
+            Board.cache().clear()
+            gc.collect()
+            before = tracemalloc.get_traced_memory()[0]
+            del compact
+            gc.collect()
+            retained = before - tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+        self.assertLess(retained / num_nodes, 128)
+
+    def test_view_identity(self):
+        compact = self._compact('wpe4,wpg2,bra4')
+        compact.expand()
+        first, second = compact.children[:2]
+        self.assertEqual(first, compact.children[0])
+        self.assertEqual(hash(first), hash(compact.children[0]))
+        self.assertNotEqual(first, second)
+        self.assertNotEqual(compact, self._compact('wpe4,wpg2,bra4'))
+        self.assertEqual(len({first, second, compact.children[0]}), 2)
+
+    def test_create_child(self):
+        compact = self._compact('wpe4,wpg2,bra4')
+        board = Board.parse('wpe5,wpg2,bra4')
+        child = compact.create_child(board, compact.board_evaluator, Piece.Color.BLACK, 1)
+        self.assertEqual((child.board, child.color, child.depth), (board, Piece.Color.BLACK, 1))
+        self.assertIsNone(child.parent)
+        self.assertEqual(compact.children, [])
+        child.expand()
+        self.assertEqual({grandchild.board for grandchild in child.children},
+                         board.moves_for_color(Piece.Color.BLACK))
@@ -0,0 +1,26 @@
+from board import Board
+from board_tree import BoardTree
+from board_tree_player import BoardTreePlayer
+from compact_board_tree import CompactBoardTree
+
+from typing import Optional
+
+
+class CompactMinMaxPlayer(BoardTreePlayer):
+    '''MinMaxPlayer over a CompactBoardTree, for searches too big to keep as node objects.'''
+
+    def board_tree(self, board: Board) -> BoardTree:
+        return CompactBoardTree.new(board, self.board_evaluator, self.color,
+                                    transposition_table=self.transposition_table,
+                                    quiescence=self.quiescence,
+                                    move_ordering=self.move_ordering)
+
+    def _reused_board_tree(self, board: Board) -> Optional[BoardTree]:
+        if self._board_tree is None:
+            return None
+        for child in self._board_tree.children:
+            for grandchild in child.children:
+                if grandchild.board == board and grandchild.color == self.color:
+                    assert isinstance(grandchild, CompactBoardTree)
+                    return grandchild.detached()
+        return None
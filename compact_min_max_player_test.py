@@ -0,0 +1,45 @@
+from board import Board
+from board_tree_expander import BFSExpander, UntilNumSamples, UntilTime
+from compact_board_tree import CompactBoardTree
+from compact_min_max_player import CompactMinMaxPlayer
+from min_max_player import MinMaxPlayer
+from piece import Piece
+from piece_value_board_evaluator import PieceValueBoardEvalutor
+
+from unittest import TestCase
+
+
+class CompactMinMaxPlayerTest(TestCase):
+    def test_evaluator_color_mismatch(self):
+        with self.assertRaises(ValueError):
+            CompactMinMaxPlayer(Piece.Color.WHITE,
+                                PieceValueBoardEvalutor(Piece.Color.BLACK),
+                                BFSExpander(UntilTime(10)))
+
+    def test_matches_min_max_player(self):
+        board = Board.parse('wke1,wqd1,wpe2,wpf2,bke8,brh8,bpe7,bnc6', False)
+        self.assertEqual(
+            CompactMinMaxPlayer(Piece.Color.WHITE,
+                                PieceValueBoardEvalutor(Piece.Color.WHITE),
+                                BFSExpander(UntilNumSamples(100))).move(board),
+            MinMaxPlayer(Piece.Color.WHITE,
+                         PieceValueBoardEvalutor(Piece.Color.WHITE),
+                         BFSExpander(UntilNumSamples(100))).move(board))
+
+    def test_reuses_board_tree(self):
+        player = CompactMinMaxPlayer(Piece.Color.WHITE,
+                                     PieceValueBoardEvalutor(Piece.Color.WHITE),
+                                     BFSExpander(UntilNumSamples(100)))
+        board = player.move(Board.parse('wpe4,wpg2,bra4', False))
+        board_tree = player._board_tree
+        assert isinstance(board_tree, CompactBoardTree)
+        child = next(child for child in board_tree.children if child.board == board)
+        grandchild = child.children[0]
+        num_leaves = len(grandchild.leaves())
+        player.move(grandchild.board)
+        reused = player._board_tree
+        assert isinstance(reused, CompactBoardTree)
+        self.assertIsNot(reused.store, board_tree.store)
+        self.assertEqual(reused.board, grandchild.board)
+        self.assertEqual(reused.depth, 0)
+        self.assertGreater(len(reused.leaves()), num_leaves)
@@ -0,0 +1,90 @@
+from board_tree import BoardTree
+
+from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import Iterable, Iterator
+from heapq import heappop, heappush
+from itertools import count
+from typing import Callable
+from weighted_sampler import WeightedSampler
+
+
+class Frontier(ABC):
+    '''The unexpanded nodes of a tree that an expander picks from.'''
+
+    @abstractmethod
+    def __len__(self) -> int: ...
+
+    @abstractmethod
+    def __iter__(self) -> Iterator[BoardTree]: ...
+
+    @abstractmethod
+    def add(self, board_tree: BoardTree) -> None: ...
+
+    @abstractmethod
+    def pop(self) -> BoardTree:
+        '''Removes and returns the next node to expand.'''
+
+    def extend(self, board_trees: Iterable[BoardTree]) -> None:
+        for board_tree in board_trees:
+            self.add(board_tree)
+
+
+class QueueFrontier(Frontier):
+    '''First in, first out.'''
+
+    def __init__(self):
+        self._board_trees: deque[BoardTree] = deque()
+
+    def __len__(self) -> int:
+        return len(self._board_trees)
+
+    def __iter__(self) -> Iterator[BoardTree]:
+        return iter(self._board_trees)
+
+    def add(self, board_tree: BoardTree) -> None:
+        self._board_trees.append(board_tree)
+
+    def pop(self) -> BoardTree:
+        return self._board_trees.popleft()
+
+
+class HeapFrontier(Frontier):
+    '''Highest key first, breaking ties by insertion order.'''
+
+    def __init__(self, key: Callable[[BoardTree], float]):
+        self._key = key
+        self._heap: list[tuple[float, int, BoardTree]] = []
+        self._count = count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __iter__(self) -> Iterator[BoardTree]:
+        return (board_tree for _, _, board_tree in self._heap)
+
+    def add(self, board_tree: BoardTree) -> None:
+        heappush(self._heap, (-self._key(board_tree), next(self._count), board_tree))
+
+    def pop(self) -> BoardTree:
+        return heappop(self._heap)[2]
+
+
+class WeightedRandomFrontier(Frontier):
+    '''Random node, weighted by key the same way as weighted_random_choice, in O(log n).'''
+
+    def __init__(self, key: Callable[[BoardTree], float]):
+        self._key = key
+        self._sampler: WeightedSampler[BoardTree] = WeightedSampler()
+
+    def __len__(self) -> int:
+        return len(self._sampler)
+
+    def __iter__(self) -> Iterator[BoardTree]:
+        return iter(self._sampler)
+
+    def add(self, board_tree: BoardTree) -> None:
+        self._sampler.add(board_tree, self._key(board_tree))
+
+    def pop(self) -> BoardTree:
+        return self._sampler.pop()
@@ -0,0 +1,42 @@
+from board import Board
+from board_tree import BoardTree
+from frontier import HeapFrontier, QueueFrontier, WeightedRandomFrontier
+from min_max_board_tree import MinMaxBoardTree
+from piece import Piece
+from piece_value_board_evaluator import PieceValueBoardEvalutor
+
+from unittest import TestCase
+
+
+def _board_tree(board: str) -> BoardTree:
+    return MinMaxBoardTree(Board.parse(board),
+                           PieceValueBoardEvalutor(Piece.Color.WHITE),
+                           Piece.Color.WHITE)
+
+
+class FrontierTest(TestCase):
+    _BOARD_TREES = [_board_tree(board) for board in ['wpe4', 'wqe4', 'bqe4', 'wne4', 'wbe4']]
+
+    def test_queue(self):
+        frontier = QueueFrontier()
+        frontier.extend(self._BOARD_TREES)
+        self.assertEqual(len(frontier), 5)
+        self.assertListEqual(list(frontier), self._BOARD_TREES)
+        self.assertListEqual([frontier.pop() for _ in range(5)], self._BOARD_TREES)
+        self.assertFalse(frontier)
+
+    def test_heap(self):
+        frontier = HeapFrontier(lambda board_tree: board_tree.board_value)
+        frontier.extend(self._BOARD_TREES)
+        self.assertCountEqual(list(frontier), self._BOARD_TREES)
+        # the knight and bishop are worth the same, so they come out in the order they went in
+        self.assertListEqual([repr(frontier.pop().board) for _ in range(5)],
+                             ['wqe4', 'wne4', 'wbe4', 'wpe4', 'bqe4'])
+        self.assertFalse(frontier)
+
+    def test_weighted_random(self):
+        frontier = WeightedRandomFrontier(lambda board_tree: board_tree.board_value)
+        frontier.extend(self._BOARD_TREES)
+        self.assertCountEqual(list(frontier), self._BOARD_TREES)
+        self.assertCountEqual([frontier.pop() for _ in range(5)], self._BOARD_TREES)
+        self.assertFalse(frontier)
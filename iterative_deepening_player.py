@@ -0,0 +1,128 @@
+from alpha_beta_board_tree import AlphaBetaBoardTree
+from board import Board
+from board_evaluator import BoardEvaluator
+from board_tree import BoardTree
+from board_tree_expander import StopCondition
+from move_ordering import MoveOrdering
+from player import Player
+from pruning import Pruning
+from quiescence import Quiescence
+from transposition_table import TranspositionTable
+
+from dataclasses import dataclass, field
+from itertools import count
+from time import time
+from typing import Callable, Optional
+
+
+@dataclass(frozen=True)
+class IterativeDeepeningPlayer(Player):
+    '''Runs alpha-beta searches of depth 1, 2, 3... until stop_condition says to stop.
+
+    The move comes from the last search that completed, so the quality of
+    play for a given time budget doesn't depend on where the clock ran out.
+    Each search tries the previous principal variation first, which makes
+    the deeper search prune more. The depth 1 search always completes.
+    '''
+
+    board_evaluator: BoardEvaluator
+    stop_condition: StopCondition
+    max_depth: Optional[int] = None
+    transposition_table: TranspositionTable = field(
+        default_factory=TranspositionTable, repr=False, compare=False)
+    # searches captures at the leaves if set
+    quiescence: Optional[Quiescence] = None
+    # sorts children before they're searched if set
+    move_ordering: Optional[MoveOrdering] = None
+    # null moves and late-move reductions if set
+    pruning: Optional[Pruning] = None
+
+    @dataclass(frozen=True)
+    class Stats:
+        depth: int
+        num_nodes: int
+        total_time: float
+        transposition_table: TranspositionTable.Stats
+        num_quiescence_nodes: int = 0
+        move_ordering: Optional[MoveOrdering.Stats] = None
+        pruning: Optional[Pruning.Stats] = None
+
+    def __post_init__(self):
+        if not self.color == self.board_evaluator.eval_color:
+            raise ValueError((self.color, self.board_evaluator.eval_color))
+        if self.max_depth is not None and self.max_depth < 1:
+            raise ValueError(self.max_depth)
+
+    def search(self, board: Board) -> tuple[BoardTree.Result, 'IterativeDeepeningPlayer.Stats']:
+        self.transposition_table.new_search()
+        if self.move_ordering is not None:
+            self.move_ordering.new_search()
+        return self.search_tree(AlphaBetaBoardTree(board, self.board_evaluator, self.color,
+                                                   transposition_table=self.transposition_table,
+                                                   quiescence=self.quiescence,
+                                                   move_ordering=self.move_ordering,
+                                                   pruning=self.pruning))
+
+    def search_tree(self, board_tree: AlphaBetaBoardTree, first_depth: int = 1,
+                    on_result: Optional[Callable[[int, BoardTree.Result], None]] = None,
+                    skip_depths: int = 0,
+                    ) -> tuple[BoardTree.Result, 'IterativeDeepeningPlayer.Stats']:
+        '''Searches board_tree in place, so a tree whose root is already expanded only searches the children it has.
+
+        Every search runs under the stop condition. If it stops the search at
+        first_depth, a depth 1 search runs to completion instead, so there's
+        always a move. on_result is called with the depth and result of every
+        search that completes. skip_depths depths are skipped after
+        first_depth.
+        '''
+        if self.max_depth is not None:
+            first_depth = min(first_depth, self.max_depth)
+        self.stop_condition.start()
+        start_time = time()
+        num_nodes = 0
+        quiescence_nodes_before = board_tree.quiescence.num_nodes if board_tree.quiescence is not None else 0
+
+        def should_stop(node: BoardTree) -> bool:
+            nonlocal num_nodes
+            num_nodes += 1
+            return self.stop_condition.should_stop(num_nodes, (node,))
+
+        def count_node(node: BoardTree) -> bool:
+            nonlocal num_nodes
+            num_nodes += 1
+            return False
+
+        depth = first_depth
+        try:
+            result = board_tree.search(first_depth, should_stop=should_stop)
+        except AlphaBetaBoardTree.Aborted:
+            depth = 1
+            result = board_tree.search(depth, should_stop=count_node)
+        board_tree.order_principal_variation(result)
+        if on_result is not None:
+            on_result(depth, result)
+        for next_depth in count(first_depth + 1 + skip_depths):
+            if self.max_depth is not None and next_depth > self.max_depth:
+                break
+            try:
+                result = board_tree.search(next_depth, should_stop=should_stop)
+            except AlphaBetaBoardTree.Aborted:
+                break
+            board_tree.order_principal_variation(result)
+            depth = next_depth
+            if on_result is not None:
+                on_result(depth, result)
+        num_quiescence_nodes = board_tree.quiescence.num_nodes - quiescence_nodes_before if board_tree.quiescence is not None else 0
+        return result, IterativeDeepeningPlayer.Stats(depth, num_nodes, time() - start_time, self.transposition_table.stats,
+                                                      num_quiescence_nodes,
+                                                      board_tree.move_ordering.stats if board_tree.move_ordering is not None else None,
+                                                      board_tree.pruning.stats if board_tree.pruning is not None else None)
+
+    def move(self, board: Board) -> Board:
+        print(f'{self} player considering board {board}')
+        result, stats = self.search(board)
+        print(
+            f'result boards {"".join([str(board) for board in result.boards[1:]])} stats {stats} with value {result.value}')
+        if len(result.boards) < 2:
+            raise ValueError(f'no moves for {self.color} on {board}')
+        return result.boards[1]
@@ -0,0 +1,100 @@
+from alpha_beta_board_tree import AlphaBetaBoardTree
+from board import Board
+from board_tree_expander import UntilNodes, UntilNumSamples
+from iterative_deepening_player import IterativeDeepeningPlayer
+from move_ordering import MoveOrdering
+from piece import Piece
+from piece_value_board_evaluator import PieceValueBoardEvalutor
+from pruning import Pruning
+from quiescence import Quiescence
+
+from typing import Optional
+from unittest import TestCase
+
+
+class IterativeDeepeningPlayerTest(TestCase):
+    _BOARD = 'wke1,wqd1,wpe2,wpf2,bke8,brh8,bpe7,bnc6'
+
+    @staticmethod
+    def _player(max_num_samples: int, max_depth: Optional[int] = None) -> IterativeDeepeningPlayer:
+        return IterativeDeepeningPlayer(Piece.Color.WHITE,
+                                        PieceValueBoardEvalutor(Piece.Color.WHITE),
+                                        UntilNumSamples(max_num_samples),
+                                        max_depth)
+
+    def test_evaluator_color_mismatch(self):
+        with self.assertRaises(ValueError):
+            IterativeDeepeningPlayer(Piece.Color.WHITE,
+                                     PieceValueBoardEvalutor(Piece.Color.BLACK),
+                                     UntilNumSamples(10))
+
+    def test_max_depth(self):
+        result, stats = self._player(10**9, 3).search(Board.parse(self._BOARD, False))
+        self.assertEqual(stats.depth, 3)
+        self.assertEqual(
+            result.value,
+            AlphaBetaBoardTree(Board.parse(self._BOARD, False),
+                               PieceValueBoardEvalutor(Piece.Color.WHITE),
+                               Piece.Color.WHITE).search(3).value
+        )
+
+    def test_aborts_to_last_completed_depth(self):
+        result, stats = self._player(1).search(Board.parse(self._BOARD, False))
+        self.assertEqual(stats.depth, 1)
+        self.assertEqual(len(result.boards), 2)
+
+    def test_counts_first_depth(self):
+        _, stats = self._player(10**9, 1).search(Board.parse(self._BOARD, False))
+        self.assertEqual(stats.depth, 1)
+        self.assertGreater(stats.num_nodes, 1)
+
+    def test_stops_first_depth(self):
+        player = IterativeDeepeningPlayer(Piece.Color.WHITE,
+                                          PieceValueBoardEvalutor(Piece.Color.WHITE),
+                                          UntilNodes(10))
+        board_tree = AlphaBetaBoardTree(Board.parse(self._BOARD, False), player.board_evaluator, player.color,
+                                        transposition_table=player.transposition_table)
+        # a depth 3 first search is cut off, and a depth 1 search gives the move
+        result, stats = player.search_tree(board_tree, 3)
+        self.assertEqual(stats.depth, 1)
+        self.assertEqual(len(result.boards), 2)
+
+    def test_skip_depths(self):
+        player = self._player(10**9, 3)
+        depths: list[int] = []
+        _, stats = player.search_tree(AlphaBetaBoardTree(Board.parse(self._BOARD, False),
+                                                         player.board_evaluator,
+                                                         player.color,
+                                                         transposition_table=player.transposition_table),
+                                      on_result=lambda depth, result: depths.append(depth),
+                                      skip_depths=1)
+        self.assertEqual(depths, [1, 3])
+        self.assertEqual(stats.depth, 3)
+
+    def test_move(self):
+        self.assertEqual(
+            self._player(10**9, 2).move(Board.parse('wpe4,wpg2,bra4')),
+            Board.parse('wpe5,wpg2,bra4')
+        )
+
+    def test_quiescence(self):
+        player = IterativeDeepeningPlayer(Piece.Color.WHITE,
+                                          PieceValueBoardEvalutor(Piece.Color.WHITE),
+                                          UntilNumSamples(10**9),
+                                          1,
+                                          quiescence=Quiescence())
+        result, stats = player.search(Board.parse('wqd1,bpd5,brd8,wpa2'))
+        self.assertNotEqual(result.boards[1], Board.parse('wqd5,brd8,wpa2'))
+        self.assertGreater(stats.num_quiescence_nodes, 0)
+
+    def test_pruning(self):
+        player = IterativeDeepeningPlayer(Piece.Color.WHITE,
+                                          PieceValueBoardEvalutor(Piece.Color.WHITE),
+                                          UntilNumSamples(10**9),
+                                          4,
+                                          move_ordering=MoveOrdering(),
+                                          pruning=Pruning())
+        _, stats = player.search(Board.parse(self._BOARD, False))
+        assert stats.move_ordering is not None and stats.pruning is not None
+        self.assertGreater(stats.move_ordering.num_cutoffs, 0)
+        self.assertGreater(stats.pruning.num_reductions, 0)
@@ -0,0 +1,167 @@
+from alpha_beta_board_tree import AlphaBetaBoardTree
+from board import Board
+from board_evaluator import BoardEvaluator
+from board_tree_expander import StopCondition
+from iterative_deepening_player import IterativeDeepeningPlayer
+from piece import Piece
+from player import Player
+from quiescence import Quiescence
+from shared_transposition_table import SharedTranspositionTable
+from transposition_table import DEFAULT_MEMORY_MB, TranspositionTable
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from os import cpu_count
+from random import Random
+from time import time
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class _WorkerResult:
+    best_key: int
+    value: float
+    depth: int
+    num_nodes: int
+    transposition_table: TranspositionTable.Stats
+    num_quiescence_nodes: int
+
+
+def _search(player: IterativeDeepeningPlayer,
+            impl: Board.Impl,
+            board: tuple[Piece, ...],
+            worker: int,
+            ) -> _WorkerResult:
+    '''Runs one worker's iterative deepening search of the whole root, in a worker process.'''
+    board_tree = AlphaBetaBoardTree(Board.new(frozenset(board), impl),
+                                    player.board_evaluator,
+                                    player.color,
+                                    transposition_table=player.transposition_table,
+                                    quiescence=player.quiescence)
+    if worker:
+        # helpers try the root moves in their own order and every other one skips depth 2, so they fill the
+        # table with positions worker 0 hasn't reached yet
+        board_tree.expand()
+        Random(worker).shuffle(board_tree.children)
+    try:
+        result, stats = player.search_tree(board_tree, skip_depths=worker % 2)
+        return _WorkerResult(result.boards[1].zobrist_key, result.value, stats.depth, stats.num_nodes,
+                             player.transposition_table.stats, stats.num_quiescence_nodes)
+    finally:
+        # the worker process outlives the search, so it lets go of its mapping of the table
+        player.transposition_table.close()
+
+
+@dataclass
+class _Workers:
+    '''The mutable part of a LazySMPPlayer: the shared table and the worker processes, kept until it's closed.'''
+
+    transposition_table: Optional[SharedTranspositionTable] = None
+    executor: Optional[ProcessPoolExecutor] = None
+
+
+@dataclass(frozen=True)
+class LazySMPPlayer(Player):
+    '''Runs iterative deepening searches of the same root in several worker processes at once.
+
+    The workers share one transposition table in shared memory, which is how
+    they help each other: results one worker stores cut off and order the
+    others' searches. The move comes from the worker that completed the
+    deepest search. The table and the worker processes live for the game,
+    so close the player when the game is over.
+    '''
+
+    board_evaluator: BoardEvaluator
+    stop_condition: StopCondition
+    max_depth: Optional[int] = None
+    # defaults to the number of processors
+    num_workers: Optional[int] = None
+    memory_mb: float = DEFAULT_MEMORY_MB
+    # searches captures at the leaves if set
+    quiescence: Optional[Quiescence] = None
+    _workers: _Workers = field(
+        default_factory=_Workers, init=False, repr=False, compare=False)
+
+    @dataclass(frozen=True)
+    class Stats:
+        num_workers: int
+        depth: int
+        num_nodes: int
+        total_time: float
+        # counts summed over the workers
+        transposition_table: TranspositionTable.Stats
+        num_quiescence_nodes: int = 0
+
+        @property
+        def nodes_per_second(self) -> float:
+            return self.num_nodes / self.total_time if self.total_time else 0
+
+    def __post_init__(self):
+        if not self.color == self.board_evaluator.eval_color:
+            raise ValueError((self.color, self.board_evaluator.eval_color))
+        if self.num_workers is not None and self.num_workers < 1:
+            raise ValueError(self.num_workers)
+
+    @property
+    def transposition_table(self) -> SharedTranspositionTable:
+        if self._workers.transposition_table is None:
+            self._workers.transposition_table = SharedTranspositionTable(self.memory_mb)
+        return self._workers.transposition_table
+
+    @property
+    def _num_workers(self) -> int:
+        return self.num_workers or cpu_count() or 1
+
+    @property
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._workers.executor is None:
+            self._workers.executor = ProcessPoolExecutor(self._num_workers)
+        return self._workers.executor
+
+    def close(self) -> None:
+        if self._workers.executor is not None:
+            self._workers.executor.shutdown()
+            self._workers.executor = None
+        if self._workers.transposition_table is not None:
+            self._workers.transposition_table.close()
+            self._workers.transposition_table = None
+
+    def search(self, board: Board) -> tuple[Board, float, 'LazySMPPlayer.Stats']:
+        start_time = time()
+        moves = {child.zobrist_key: child for child in board.moves_for_color(self.color)}
+        if not moves:
+            raise ValueError(f'no moves for {self.color} on {board}')
+        self.transposition_table.new_search()
+        player = IterativeDeepeningPlayer(self.color, self.board_evaluator, self.stop_condition, self.max_depth,
+                                          self.transposition_table, self.quiescence)
+        num_workers = self._num_workers
+        results = list(self._executor.map(_search,
+                                          [player] * num_workers,
+                                          [board.impl] * num_workers,
+                                          [tuple(board.pieces)] * num_workers,
+                                          range(num_workers)))
+        # the deepest search wins, and worker 0 wins ties
+        result = max(results, key=lambda result: result.depth)
+        table_stats = TranspositionTable.Stats(
+            len(self.transposition_table),
+            self.transposition_table.capacity,
+            sum(result.transposition_table.probes for result in results),
+            sum(result.transposition_table.hits for result in results),
+            sum(result.transposition_table.stores for result in results),
+            sum(result.transposition_table.overwrites for result in results),
+            sum(result.transposition_table.best_key_probes for result in results),
+            sum(result.transposition_table.best_key_hits for result in results),
+        )
+        stats = LazySMPPlayer.Stats(num_workers,
+                                    result.depth,
+                                    sum(result.num_nodes for result in results),
+                                    time() - start_time,
+                                    table_stats,
+                                    sum(result.num_quiescence_nodes for result in results))
+        return moves[result.best_key], result.value, stats
+
+    def move(self, board: Board) -> Board:
+        print(f'{self} player considering board {board}')
+        move, value, stats = self.search(board)
+        print(f'result board {move} stats {stats} at {stats.nodes_per_second:.0f} nodes/s with value {value}')
+        return move
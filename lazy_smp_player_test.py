@@ -0,0 +1,55 @@
+from board import Board
+from board_tree_expander import UntilNumSamples
+from iterative_deepening_player import IterativeDeepeningPlayer
+from lazy_smp_player import LazySMPPlayer
+from piece import Piece
+from piece_value_board_evaluator import PieceValueBoardEvalutor
+
+from unittest import TestCase
+
+
+class LazySMPPlayerTest(TestCase):
+    def test_evaluator_color_mismatch(self):
+        with self.assertRaises(ValueError):
+            LazySMPPlayer(Piece.Color.WHITE,
+                          PieceValueBoardEvalutor(Piece.Color.BLACK),
+                          UntilNumSamples(10))
+
+    def test_matches_single_process(self):
+        board = Board.parse('wke1,wqd1,wpe2,wpf2,bke8,brh8,bpe7,bnc6', False)
+        player = LazySMPPlayer(Piece.Color.WHITE,
+                               PieceValueBoardEvalutor(Piece.Color.WHITE),
+                               UntilNumSamples(10**9),
+                               max_depth=3,
+                               num_workers=2,
+                               memory_mb=1)
+        try:
+            move, value, stats = player.search(board)
+        finally:
+            player.close()
+        result, _ = IterativeDeepeningPlayer(Piece.Color.WHITE,
+                                             PieceValueBoardEvalutor(Piece.Color.WHITE),
+                                             UntilNumSamples(10**9),
+                                             max_depth=3).search(board)
+        self.assertEqual(value, result.value)
+        self.assertIn(move, board.moves_for_color(Piece.Color.WHITE))
+        self.assertEqual((stats.num_workers, stats.depth), (2, 3))
+        self.assertGreater(stats.transposition_table.hits, 0)
+
+    def test_reuses_workers(self):
+        board = Board.parse('wke1,wqd1,wpe2,wpf2,bke8,brh8,bpe7,bnc6', False)
+        player = LazySMPPlayer(Piece.Color.WHITE,
+                               PieceValueBoardEvalutor(Piece.Color.WHITE),
+                               UntilNumSamples(10**9),
+                               max_depth=1,
+                               num_workers=2,
+                               memory_mb=1)
+        try:
+            player.search(board)
+            executor, table = player._workers.executor, player.transposition_table
+            player.search(board)
+            self.assertIs(player._workers.executor, executor)
+            self.assertIs(player.transposition_table, table)
+        finally:
+            player.close()
+        self.assertIsNone(player._workers.executor)
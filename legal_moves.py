@@ -0,0 +1,82 @@
+from attack_tables import BISHOP_DIRECTIONS, KING_TARGETS, KNIGHT_TARGETS, PAWN_CAPTURES, RAYS, ROOK_DIRECTIONS, is_square_attacked
+from move import Move
+from piece import Piece
+from position import Position
+
+from collections.abc import Iterable, Sequence
+from typing import Callable, Optional
+
+_SLIDER_DIRECTIONS: tuple[tuple[Position.Delta, Piece.Type], ...] = tuple(
+    (delta, Piece.Type.ROOK) for delta in ROOK_DIRECTIONS
+) + tuple(
+    (delta, Piece.Type.BISHOP) for delta in BISHOP_DIRECTIONS
+)
+
+
+def legal_moves(color: Piece.Color,
+                moves: Iterable[Move],
+                piece_at: Callable[[Position], Optional[Piece]],
+                kings: Sequence[Position],
+                ) -> Optional[list[Move]]:
+    '''Filters color's pseudo-legal moves down to those that don't leave its king in check.
+
+    Checkers and pinned pieces are found once by scanning outwards from the
+    king, so no move has to be played out to test it. Returns None when color
+    doesn't have exactly one king and the caller has to fall back to playing
+    the moves out.
+    '''
+    if not kings:
+        return list(moves)
+    if len(kings) != 1:
+        return None
+    king = kings[0]
+    k = king.index
+    opponent = color.opponent
+
+    # each check is stopped by moving to one of its squares: the checker or a square between it and the king
+    checks: list[frozenset[Position]] = []
+    # pinned pieces may only move along the squares between the king and the pinner, inclusive
+    pins: dict[Position, frozenset[Position]] = {}
+    for delta, slider in _SLIDER_DIRECTIONS:
+        ray = RAYS[delta][k]
+        pinned: Optional[Position] = None
+        for i, position in enumerate(ray):
+            piece = piece_at(position)
+            if piece is None:
+                continue
+            attacks = piece.color == opponent and (
+                piece.type == slider or piece.type == Piece.Type.QUEEN)
+            if pinned is None:
+                if piece.color == color:
+                    pinned = position
+                    continue
+                if attacks:
+                    checks.append(frozenset(ray[:i+1]))
+            elif attacks:
+                pins[pinned] = frozenset(ray[:i+1])
+            break
+    for targets, type in ((KNIGHT_TARGETS[k], Piece.Type.KNIGHT), (KING_TARGETS[k], Piece.Type.KING), (PAWN_CAPTURES[color][k], Piece.Type.PAWN)):
+        for position in targets:
+            piece = piece_at(position)
+            if piece is not None and piece.color == opponent and piece.type == type:
+                checks.append(frozenset({position}))
+
+    def piece_at_without_king(position: Position) -> Optional[Piece]:
+        return None if position == king else piece_at(position)
+
+    legal: list[Move] = []
+    for move in moves:
+        if move.piece.position == king:
+            # sliders see through the king's old square, so look with the king lifted off the board
+            if not is_square_attacked(move.to_position.index, opponent, piece_at_without_king):
+                legal.append(move)
+            continue
+        if len(checks) > 1:
+            continue
+        pin = pins.get(move.piece.position, None)
+        if pin is not None and move.to_position not in pin:
+            continue
+        if checks and move.to_position not in checks[0]:
+            continue
+        legal.append(move)
+    return legal
@@ -0,0 +1,53 @@
+from board import Board
+from legal_moves import legal_moves
+from piece import Piece
+
+from unittest import TestCase
+
+
+class LegalMovesTest(TestCase):
+    @staticmethod
+    def _reference(board: Board, color: Piece.Color) -> set:
+        return {move for piece in board.pieces_by_color[color] for move in board.piece_moves(piece)
+                if not board.with_move(move).is_color_in_check(color)}
+
+    def test_matches_playing_moves_out(self):
+        for s in [
+            # pinned bishop, pinned rook that can slide along the pin
+            'wke1,wbe2,bre8,wrd2,bqa5,bkh8',
+            # check from a knight and a slider that can be blocked or captured
+            'wke1,wnb1,wrh3,bnd3,bkh8',
+            'wke1,wbc1,wnf1,bra5,bqe7,bkh8',
+            # double check leaves only king moves
+            'wke1,wqd1,bre8,bnd3,bkh8',
+            # the king can't step back along the checking ray
+            'wkd4,brd8,wpa2,bkh8',
+            # pawn checks and protected checkers
+            'wke4,bpd5,bpc6,wpe3,bkh8',
+            # adjacent kings
+            'wke4,bke5,wpa2',
+            'bke8,bra8,brh8,wke1',
+        ]:
+            board = Board.parse(s)
+            for color in Piece.Color:
+                with self.subTest((s, color)):
+                    self.assertSetEqual(
+                        set(board.color_moves(color)), self._reference(board, color))
+
+    def test_default_board(self):
+        board = Board.default_board()
+        for color in Piece.Color:
+            with self.subTest(color):
+                self.assertSetEqual(
+                    set(board.color_moves(color)), self._reference(board, color))
+
+    def test_multiple_kings(self):
+        board = Board.parse('wke1,wkh1,bra5')
+        self.assertIsNone(legal_moves(
+            Piece.Color.WHITE,
+            board.piece_moves(Piece.parse('wke1')),
+            board.pieces_by_position.get,
+            [Piece.parse('wke1').position, Piece.parse('wkh1').position],
+        ))
+        self.assertSetEqual(set(board.color_moves(Piece.Color.WHITE)),
+                            self._reference(board, Piece.Color.WHITE))
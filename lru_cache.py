@@ -0,0 +1,87 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Generic, Hashable, Optional, TypeVar
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+
+class LRUCache(Generic[K, V]):
+    '''Size-bounded mapping that evicts the least recently used entry and counts hits, misses and evictions.'''
+
+    @dataclass(frozen=True)
+    class Stats:
+        size: int
+        capacity: int
+        hits: int
+        misses: int
+        evictions: int
+
+        @property
+        def hit_rate(self) -> float:
+            lookups = self.hits + self.misses
+            return self.hits / lookups if lookups else 0
+
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError(capacity)
+        self._capacity = capacity
+        self._entries: OrderedDict[K, V] = OrderedDict()
+        self.reset_stats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._entries
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @capacity.setter
+    def capacity(self, capacity: int) -> None:
+        if capacity < 1:
+            raise ValueError(capacity)
+        self._capacity = capacity
+        self._evict()
+
+    @property
+    def stats(self) -> 'LRUCache.Stats':
+        return LRUCache.Stats(len(self._entries), self._capacity, self._hits, self._misses, self._evictions)
+
+    def reset_stats(self) -> None:
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.reset_stats()
+
+    def _evict(self) -> None:
+        while len(self._entries) > self._capacity:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def get(self, key: K) -> Optional[V]:
+        value = self._entries.get(key, None)
+        if value is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: K, value: V) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        self._evict()
+
+    def intern(self, value: V) -> V:
+        '''Returns the cached value equal to value, caching value itself if there is none.'''
+        cached = self.get(value)  # type: ignore
+        if cached is not None:
+            return cached
+        self.put(value, value)  # type: ignore
+        return value
@@ -0,0 +1,52 @@
+from lru_cache import LRUCache
+
+from unittest import TestCase
+
+
+class LRUCacheTest(TestCase):
+    def test_get_put(self):
+        cache: LRUCache[str, int] = LRUCache(2)
+        self.assertIsNone(cache.get('a'))
+        cache.put('a', 1)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.stats, LRUCache.Stats(1, 2, 1, 1, 0))
+
+    def test_evicts_least_recently_used(self):
+        cache: LRUCache[str, int] = LRUCache(2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertIn('c', cache)
+        self.assertEqual(cache.stats.evictions, 1)
+
+    def test_shrink_capacity(self):
+        cache: LRUCache[int, int] = LRUCache(10)
+        for i in range(10):
+            cache.put(i, i)
+        cache.capacity = 3
+        self.assertEqual(len(cache), 3)
+        self.assertEqual(cache.stats.evictions, 7)
+        self.assertNotIn(6, cache)
+        self.assertIn(9, cache)
+
+    def test_invalid_capacity(self):
+        with self.assertRaises(ValueError):
+            LRUCache(0)
+
+    def test_intern(self):
+        cache: LRUCache[tuple[int, ...], tuple[int, ...]] = LRUCache(2)
+        a = tuple([1, 2])
+        b = tuple([1, 2])
+        self.assertIs(cache.intern(a), a)
+        self.assertIs(cache.intern(b), a)
+        self.assertEqual(cache.stats.hit_rate, 0.5)
+
+    def test_clear(self):
+        cache: LRUCache[str, int] = LRUCache(2)
+        cache.put('a', 1)
+        cache.get('a')
+        cache.clear()
+        self.assertEqual(cache.stats, LRUCache.Stats(0, 2, 0, 0, 0))
@@ -12,9 +12,9 @@ def main():
         TextPlayer(Piece.Color.WHITE),
         MinMaxPlayer(Piece.Color.BLACK,
                      PieceValueBoardEvalutor(Piece.Color.BLACK),
-                     WeightedRandomExpander(UntilTime(30))
+                     WeightedRandomExpander(AnyOf((UntilTime(30), UntilMemory(1024))))
                      )
-    ).play(Board.parse('bke8,bra8,brh8,wke1', False))
+    ).play(Board.parse('bke8,bra8,brh8,wke1', False, Board.Impl.BIT_BOARD))
 
 
 if __name__ == '__main__':
@@ -0,0 +1,131 @@
+from board import Board
+from board_evaluator import BoardEvaluator
+from board_tree import BoardTree
+from board_tree_expander import StopCondition
+from piece import Piece
+from search_board import SearchBoard
+
+from dataclasses import dataclass
+from math import log, sqrt, tanh
+import random
+from time import time
+from typing import Optional
+
+# UCT exploration constant.
+EXPLORATION = sqrt(2)
+
+# Playouts that haven't ended by then are scored by the evaluator.
+MAX_PLAYOUT_PLIES = 40
+
+# Evaluator value that scores a playout at about 0.73, as e^1 / (1 + e^1).
+PLAYOUT_VALUE_SCALE = 5
+
+
+class MCTSBoardTree(BoardTree):
+    '''Monte Carlo tree search with UCT selection.
+
+    Each playout walks down the tree picking children by UCT, expands the leaf
+    it reaches once it has been visited, and plays random moves to the end of
+    the game on a SearchBoard, preferring captures. Rewards are between 0 and
+    1 for the evaluator's color and are added to every node on the path,
+    counted for the side that moved into the node.
+    '''
+
+    visits: int = 0
+    total_reward: float = 0
+
+    @dataclass(frozen=True)
+    class Stats:
+        num_playouts: int
+        total_time: float
+
+        @property
+        def playouts_per_second(self) -> float:
+            return self.num_playouts / self.total_time if self.total_time else 0
+
+    @property
+    def mean_reward(self) -> float:
+        '''Mean reward for the side that moved into this node.'''
+        return self.total_reward / self.visits if self.visits else 0
+
+    def _uct(self, child: 'MCTSBoardTree') -> float:
+        if not child.visits:
+            return float('inf')
+        return child.mean_reward + EXPLORATION * sqrt(log(self.visits) / child.visits)
+
+    def _select(self) -> list['MCTSBoardTree']:
+        path = [self]
+        node = self
+        while node.children:
+            node = max(node.children, key=node._uct)  # type: ignore
+            path.append(node)
+        if node.visits and node.can_expand():
+            node.expand()
+            if node.children:
+                node = node.children[0]  # type: ignore
+                path.append(node)
+        return path
+
+    def _playout(self) -> float:
+        '''Plays random moves from this node and returns the reward for the evaluator's color.'''
+        board = SearchBoard(self.board)
+        color = self.color
+        for ply in range(MAX_PLAYOUT_PLIES + 1):
+            moves = board.moves(color)
+            if not moves:
+                if board.is_color_in_check(color):
+                    return 0 if color == self.board_evaluator.eval_color else 1
+                return 0.5
+            if ply == MAX_PLAYOUT_PLIES:
+                break
+            captures = [move for move in moves if move.is_capture]
+            board.make_move(random.choice(captures or moves))
+            color = color.opponent
+        # the logistic function written with tanh, which doesn't overflow for large values
+        return 0.5 + 0.5 * tanh(self.board_evaluator.evaluate(board) / (2 * PLAYOUT_VALUE_SCALE))
+
+    def playout(self) -> 'MCTSBoardTree':
+        '''Runs one playout from this node and returns the leaf it started from.'''
+        path = self._select()
+        leaf = path[-1]
+        reward = leaf._playout()
+        for node in path:
+            node.visits += 1
+            node.total_reward += reward if node.color.opponent == self.board_evaluator.eval_color else 1 - reward
+        return leaf
+
+    def search(self, stop_condition: StopCondition) -> 'MCTSBoardTree.Stats':
+        stop_condition.start()
+        start_time = time()
+        num_playouts = 0
+        leaves: list[BoardTree] = []
+        while not stop_condition.should_stop(num_playouts, leaves):
+            leaves = [self.playout()]
+            num_playouts += 1
+        return MCTSBoardTree.Stats(num_playouts, time() - start_time)
+
+    @property
+    def best_child(self) -> Optional['MCTSBoardTree']:
+        '''The most visited child.'''
+        if not self.children:
+            return None
+        return max(self.children, key=lambda child: child.visits)  # type: ignore
+
+    @property
+    def result(self) -> BoardTree.Result:
+        '''Follows the most visited children, valued by the expected reward for the evaluator's color.'''
+        boards = [self.board]
+        node = self.best_child
+        value = 0.5
+        if node is not None and node.visits:
+            value = node.mean_reward if self.color == self.board_evaluator.eval_color else 1 - node.mean_reward
+        while node is not None and node.visits:
+            boards.append(node.board)
+            node = node.best_child
+        return BoardTree.Result(boards, value)
+
+    def create_child(self, board: Board,
+                     board_evaluator: BoardEvaluator,
+                     color: Piece.Color,
+                     depth: int) -> 'BoardTree':
+        return MCTSBoardTree(board, board_evaluator, color, depth)
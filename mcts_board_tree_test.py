@@ -0,0 +1,55 @@
+from board import Board
+from board_tree_expander import UntilNumSamples
+from mcts_board_tree import PLAYOUT_VALUE_SCALE, MCTSBoardTree
+from piece import Piece
+from piece_value_board_evaluator import PieceValueBoardEvalutor
+
+from math import exp
+import random
+from unittest import TestCase
+from unittest.mock import patch
+
+
+class MCTSBoardTreeTest(TestCase):
+    def setUp(self):
+        random.seed(0)
+
+    @staticmethod
+    def _board_tree(board: str, color: Piece.Color) -> MCTSBoardTree:
+        return MCTSBoardTree(Board.parse(board, False), PieceValueBoardEvalutor(color), color)
+
+    def test_visits(self):
+        bt = self._board_tree('wke1,wqd1,wpe2,wpf2,bke8,brh8,bpe7,bnc6', Piece.Color.WHITE)
+        stats = bt.search(UntilNumSamples(50))
+        self.assertEqual(stats.num_playouts, 50)
+        self.assertEqual(bt.visits, 50)
+        # the first playout runs from the root before it's expanded
+        self.assertEqual(sum(child.visits for child in bt.children), 49)  # type: ignore
+
+    def test_finds_mate(self):
+        bt = self._board_tree('wkh1,wpg2,wph2,bkc8,bra2', Piece.Color.BLACK)
+        bt.search(UntilNumSamples(300))
+        result = bt.result
+        self.assertIn(Piece.parse('bra1'), result.boards[1].pieces)
+        self.assertGreater(result.value, 0.9)
+
+    def test_playout_reward(self):
+        # white is mated, which is a win for black, who moved into the root
+        bt = MCTSBoardTree(Board.parse('wkh1,wpg2,wph2,bkc8,bra1'),
+                           PieceValueBoardEvalutor(Piece.Color.BLACK),
+                           Piece.Color.WHITE)
+        self.assertIs(bt.playout(), bt)
+        self.assertEqual((bt.visits, bt.total_reward), (1, 1))
+        self.assertEqual(bt.result, MCTSBoardTree.Result([bt.board], 0.5))
+
+    def test_playout_mated_at_ply_cap(self):
+        bt = MCTSBoardTree(Board.parse('wkh1,wpg2,wph2,bkc8,bra1'),
+                           PieceValueBoardEvalutor(Piece.Color.WHITE),
+                           Piece.Color.WHITE)
+        with patch('mcts_board_tree.MAX_PLAYOUT_PLIES', 0):
+            self.assertEqual(bt._playout(), 0)
+
+    def test_playout_evaluates_at_ply_cap(self):
+        bt = self._board_tree('wke1,wqd1,wpe2,wpf2,bke8,brh8,bpe7,bnc6', Piece.Color.WHITE)
+        with patch('mcts_board_tree.MAX_PLAYOUT_PLIES', 0):
+            self.assertAlmostEqual(bt._playout(), 1 / (1 + exp(-8 / PLAYOUT_VALUE_SCALE)))
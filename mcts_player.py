@@ -0,0 +1,30 @@
+from board import Board
+from board_evaluator import BoardEvaluator
+from board_tree_expander import StopCondition
+from mcts_board_tree import MCTSBoardTree
+from player import Player
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class MCTSPlayer(Player):
+    '''Plays the most visited move of a Monte Carlo tree search.'''
+
+    board_evaluator: BoardEvaluator
+    stop_condition: StopCondition
+
+    def __post_init__(self):
+        if not self.color == self.board_evaluator.eval_color:
+            raise ValueError((self.color, self.board_evaluator.eval_color))
+
+    def move(self, board: Board) -> Board:
+        print(f'{self} player considering board {board}')
+        board_tree = MCTSBoardTree(board, self.board_evaluator, self.color)
+        stats = board_tree.search(self.stop_condition)
+        result = board_tree.result
+        print(
+            f'result boards {"".join([str(board) for board in result.boards[1:]])} stats {stats} at {stats.playouts_per_second:.0f} playouts/s with value {result.value}')
+        if len(result.boards) < 2:
+            raise ValueError(f'no moves for {self.color} on {board}')
+        return result.boards[1]
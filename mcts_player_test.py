@@ -0,0 +1,23 @@
+from board import Board
+from board_tree_expander import UntilNumSamples
+from mcts_player import MCTSPlayer
+from piece import Piece
+from piece_value_board_evaluator import PieceValueBoardEvalutor
+
+import random
+from unittest import TestCase
+
+
+class MCTSPlayerTest(TestCase):
+    def test_evaluator_color_mismatch(self):
+        with self.assertRaises(ValueError):
+            MCTSPlayer(Piece.Color.WHITE,
+                       PieceValueBoardEvalutor(Piece.Color.BLACK),
+                       UntilNumSamples(10))
+
+    def test_move(self):
+        random.seed(0)
+        board = MCTSPlayer(Piece.Color.BLACK,
+                           PieceValueBoardEvalutor(Piece.Color.BLACK),
+                           UntilNumSamples(300)).move(Board.parse('wkh1,wpg2,wph2,bkc8,bra2', False))
+        self.assertTrue(board.is_color_in_checkmate(Piece.Color.WHITE))
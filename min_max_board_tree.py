@@ -2,18 +2,82 @@ from board import Board
 from board_evaluator import BoardEvaluator
 from board_tree import BoardTree
 from piece import Piece
+from transposition_table import TranspositionTable, best_board
+
+from functools import cached_property
+from typing import Optional
 
 
 class MinMaxBoardTree(BoardTree):
+    '''Minimax tree that keeps each node's value and best child up to date as it grows.
+
+    expand updates the values along the path from the expanded node up to the
+    first ancestor whose value, best child and depth don't change, so reading
+    result only walks the principal variation.
+    '''
+
+    _value: float
+    _best_child: Optional['MinMaxBoardTree'] = None
+    _searched_depth: int
+
+    @cached_property
+    def _leaf(self) -> tuple[float, int, Optional[int]]:
+        table = self.transposition_table
+        if table is not None:
+            # an unexpanded node may have been searched deeper elsewhere in the tree or in an earlier move
+            entry = table.get(self.board, self.color)
+            if entry is not None and entry.depth > 0 and entry.bound == TranspositionTable.Bound.EXACT:
+                return entry.value, entry.depth, entry.best_key
+        return self.leaf_value, 0, None
+
+    @property
+    def value(self) -> float:
+        return self._value if self._best_child is not None else self._leaf[0]
+
+    @property
+    def searched_depth(self) -> int:
+        '''The depth to which every line under this node was searched.'''
+        return self._searched_depth if self._best_child is not None else self._leaf[1]
+
     @property
     def result(self) -> BoardTree.Result:
-        if not self.children:
-            return BoardTree.Result([self.board], self.board_value)
-        child_results: list[BoardTree.Result] = [child.result
-                                                 for child in self.children]
-        child_result = (max if self.color == self.board_evaluator.eval_color else min)(
-            child_results, key=lambda result: result.value)
-        return child_result.with_parent_board(self.board)
+        boards = [self.board]
+        node = self
+        while node._best_child is not None:
+            node = node._best_child
+            boards.append(node.board)
+        best_key = node._leaf[2]
+        if best_key is not None:
+            best = best_board(node.board, node.color, best_key)
+            if best is not None:
+                boards.append(best)
+        return BoardTree.Result(boards, self.value)
+
+    def expand(self) -> None:
+        if self.children:
+            return
+        super().expand()
+        node: Optional[BoardTree] = self
+        while isinstance(node, MinMaxBoardTree) and node._update():
+            node = node.parent
+
+    def _update(self) -> bool:
+        '''Recomputes this node from its children and returns whether it changed.'''
+        children: list[MinMaxBoardTree] = self.children  # type: ignore
+        if not children:
+            return False
+        best_child = (max if self.color == self.board_evaluator.eval_color else min)(
+            children, key=lambda child: child.value)
+        searched_depth = 1 + min(child.searched_depth for child in children)
+        if best_child is self._best_child and best_child.value == self._value and searched_depth == self._searched_depth:
+            return False
+        self._best_child = best_child
+        self._value = best_child.value
+        self._searched_depth = searched_depth
+        if self.transposition_table is not None:
+            self.transposition_table.put(self.board, self.color, searched_depth, self._value,
+                                         TranspositionTable.Bound.EXACT, best_child.board)
+        return True
 
     def create_child(self, board: Board,
                      board_evaluator: BoardEvaluator,
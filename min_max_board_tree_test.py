@@ -1,11 +1,22 @@
 from board import Board
+from board_tree import BoardTree
+from board_tree_expander import GreedyExpander, UntilNumSamples
 from min_max_board_tree import MinMaxBoardTree
 from piece import Piece
 from piece_value_board_evaluator import PieceValueBoardEvalutor
+from transposition_table import TranspositionTable
 
 from unittest import TestCase
 
 
+def _min_max(board_tree: BoardTree) -> tuple[float, list[Board]]:
+    if not board_tree.children:
+        return board_tree.board_value, [board_tree.board]
+    value, boards = (max if board_tree.color == board_tree.board_evaluator.eval_color else min)(
+        [_min_max(child) for child in board_tree.children], key=lambda result: result[0])
+    return value, [board_tree.board] + boards
+
+
 class MinMaxBoardTreeTest(TestCase):
     def test_boards(self):
         def case(start_board: str, result_boards: list[str], depth: int) -> None:
@@ -27,3 +38,46 @@ class MinMaxBoardTreeTest(TestCase):
         case('wpe4,bpd5,bnf5', ['bpd5,wpf5'], 1)
         # avoid attack
         case('wpe4,wpg2,bra4', ['wpe5,wpg2,bra4'], 2)
+
+    def test_transposition_table(self):
+        table = TranspositionTable()
+        bt = MinMaxBoardTree(Board.parse('wpe4,wpg2,bra4'),
+                             PieceValueBoardEvalutor(Piece.Color.WHITE),
+                             Piece.Color.WHITE,
+                             transposition_table=table)
+        bt.expand_to_depth(2)
+        result = bt.result
+        entry = table.get(bt.board, bt.color)
+        assert entry is not None
+        self.assertEqual((entry.depth, entry.value, entry.best_key), (2, result.value, result.boards[1].zobrist_key))
+        # a shallower tree over the same position reads the deeper value from the table
+        shallow = MinMaxBoardTree(Board.parse('wpe4,wpg2,bra4'),
+                                  PieceValueBoardEvalutor(Piece.Color.WHITE),
+                                  Piece.Color.WHITE,
+                                  transposition_table=table)
+        self.assertEqual(shallow.result.value, result.value)
+
+    def test_matches_full_min_max(self):
+        for board in ['wke1,wqd1,wpe2,wpf2,bke8,brh8,bpe7,bnc6', 'bke8,bra8,brh8,wke1']:
+            with self.subTest(board):
+                bt = MinMaxBoardTree(
+                    Board.parse(board, False),
+                    PieceValueBoardEvalutor(Piece.Color.WHITE),
+                    Piece.Color.WHITE,
+                )
+                GreedyExpander(UntilNumSamples(200)).expand(bt)
+                value, boards = _min_max(bt)
+                self.assertEqual(bt.result, BoardTree.Result(boards, value))
+
+    def test_expand_updates_ancestors(self):
+        bt = MinMaxBoardTree(Board.parse('wpe4,wpg2,bra4'),
+                             PieceValueBoardEvalutor(Piece.Color.WHITE),
+                             Piece.Color.WHITE)
+        bt.expand()
+        self.assertEqual(len(bt.result.boards), 2)
+        self.assertEqual(bt.searched_depth, 1)
+        for child in bt.children:
+            child.expand()
+        self.assertEqual(len(bt.result.boards), 3)
+        self.assertEqual(bt.searched_depth, 2)
+        self.assertEqual(bt.result, BoardTree.Result(_min_max(bt)[1], _min_max(bt)[0]))
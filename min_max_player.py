@@ -6,5 +6,8 @@ from min_max_board_tree import MinMaxBoardTree
 
 class MinMaxPlayer(BoardTreePlayer):
     def board_tree(self, board: Board) -> BoardTree:
-        board_tree = MinMaxBoardTree(board, self.board_evaluator, self.color)
+        board_tree = MinMaxBoardTree(board, self.board_evaluator, self.color,
+                                     transposition_table=self.transposition_table,
+                                     quiescence=self.quiescence,
+                                     move_ordering=self.move_ordering)
         return board_tree
@@ -1,4 +1,5 @@
-from board_tree_expander import BFSExpander, UntilTime
+from board import Board
+from board_tree_expander import BFSExpander, UntilNumSamples, UntilTime
 from piece import Piece
 from piece_value_board_evaluator import PieceValueBoardEvalutor
 from min_max_player import MinMaxPlayer
@@ -13,3 +14,37 @@ class MinMaxPlayerTest(TestCase):
                          PieceValueBoardEvalutor(Piece.Color.BLACK),
                          BFSExpander(UntilTime(10))
                          )
+
+    def test_keeps_transposition_table(self):
+        player = MinMaxPlayer(Piece.Color.WHITE,
+                              PieceValueBoardEvalutor(Piece.Color.WHITE),
+                              BFSExpander(UntilNumSamples(10))
+                              )
+        player.move(Board.parse('wpe4,wpg2,bra4'))
+        self.assertGreater(len(player.transposition_table), 0)
+
+    def test_reuses_board_tree(self):
+        player = MinMaxPlayer(Piece.Color.WHITE,
+                              PieceValueBoardEvalutor(Piece.Color.WHITE),
+                              BFSExpander(UntilNumSamples(100))
+                              )
+        board = player.move(Board.parse('wpe4,wpg2,bra4', False))
+        board_tree = player._board_tree
+        assert board_tree is not None
+        child = next(child for child in board_tree.children if child.board == board)
+        grandchild = child.children[0]
+        num_leaves = len(grandchild.leaves())
+        player.move(grandchild.board)
+        self.assertIs(player._board_tree, grandchild)
+        self.assertEqual(grandchild.depth, 0)
+        self.assertGreater(len(grandchild.leaves()), num_leaves)
+
+    def test_reuse_leaves_equality(self):
+        def player() -> MinMaxPlayer:
+            return MinMaxPlayer(Piece.Color.WHITE,
+                                PieceValueBoardEvalutor(Piece.Color.WHITE),
+                                BFSExpander(UntilNumSamples(10)))
+        searched = player()
+        searched.move(Board.parse('wpe4,wpg2,bra4'))
+        self.assertEqual(searched, player())
+        self.assertEqual(hash(searched), hash(player()))
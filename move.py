@@ -0,0 +1,45 @@
+from piece import Piece
+from position import Position
+
+from dataclasses import dataclass
+from enum import Flag
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class Move:
+    class Flags(Flag):
+        NONE = 0
+        CAPTURE = 1
+        FIRST_MOVE = 2
+        DOUBLE_STEP = 4
+
+    piece: Piece
+    to_position: Position
+    captured: Optional[Piece] = None
+
+    def __repr__(self) -> str:
+        return f'{repr(self.piece)}{"x" if self.captured is not None else "-"}{repr(self.to_position)}'
+
+    @property
+    def from_position(self) -> Position:
+        return self.piece.position
+
+    @property
+    def moved_piece(self) -> Piece:
+        return self.piece.with_position(self.to_position)
+
+    @property
+    def flags(self) -> 'Move.Flags':
+        flags = Move.Flags.NONE
+        if self.captured is not None:
+            flags |= Move.Flags.CAPTURE
+        if not self.piece.has_moved:
+            flags |= Move.Flags.FIRST_MOVE
+        if self.piece.type == Piece.Type.PAWN and abs(self.to_position.y - self.piece.position.y) == 2:
+            flags |= Move.Flags.DOUBLE_STEP
+        return flags
+
+    @property
+    def is_capture(self) -> bool:
+        return self.captured is not None
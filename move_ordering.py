@@ -0,0 +1,93 @@
+from board import Board
+from move import Move
+from piece import Piece
+from piece_value_board_evaluator import PIECE_VALUES
+from position import Position
+from zobrist import move_key
+
+from collections import defaultdict
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+@dataclass
+class MoveOrdering:
+    '''Sorts moves so the ones most likely to be best are searched first.
+
+    The transposition table's best move comes first, then captures by most
+    valuable victim and least valuable attacker, then the killer moves for
+    the ply, then the other quiet moves by history. Searches report their
+    cutoffs with cutoff, which updates the killers and history and counts how
+    often the first move searched was the one that cut off.
+    '''
+
+    num_killers: int = 2
+    # quiet moves that cut off at each ply, most recent first
+    killers: defaultdict[int, list[Move]] = field(
+        default_factory=lambda: defaultdict(list), repr=False)
+    history: defaultdict[tuple[Piece.Color, Position, Position], int] = field(
+        default_factory=lambda: defaultdict(int), repr=False)
+    num_cutoffs: int = 0
+    num_first_move_cutoffs: int = 0
+
+    @dataclass(frozen=True)
+    class Stats:
+        num_cutoffs: int
+        num_first_move_cutoffs: int
+
+        @property
+        def first_move_cutoff_rate(self) -> float:
+            return self.num_first_move_cutoffs / self.num_cutoffs if self.num_cutoffs else 0
+
+    @property
+    def stats(self) -> 'MoveOrdering.Stats':
+        return MoveOrdering.Stats(self.num_cutoffs, self.num_first_move_cutoffs)
+
+    def reset_stats(self) -> None:
+        self.num_cutoffs = 0
+        self.num_first_move_cutoffs = 0
+
+    def new_search(self) -> None:
+        '''Forgets the killers, whose plies were counted from the last root, and ages the history.'''
+        self.killers.clear()
+        for key in list(self.history):
+            self.history[key] //= 2
+            if not self.history[key]:
+                del self.history[key]
+
+    @staticmethod
+    def _history_key(move: Move) -> tuple[Piece.Color, Position, Position]:
+        return move.piece.color, move.from_position, move.to_position
+
+    def _key(self, move: Move, ply: int) -> tuple[int, float, float]:
+        if move.captured is not None:
+            return 1, -PIECE_VALUES[move.captured.type], PIECE_VALUES[move.piece.type]
+        killers = self.killers.get(ply, [])
+        if move in killers:
+            return 2, killers.index(move), 0
+        return 3, -self.history.get(self._history_key(move), 0), 0
+
+    def order(self, board: Board, moves: Sequence[Move], ply: int, best_key: Optional[int] = None) -> list[Move]:
+        '''Returns moves from board at ply in the order to search them, with the move to the board with best_key first.'''
+        ordered = sorted(moves, key=lambda move: self._key(move, ply))
+        if best_key is not None:
+            for i, move in enumerate(ordered):
+                if move_key(board.zobrist_key, move) == best_key:
+                    ordered.insert(0, ordered.pop(i))
+                    break
+        return ordered
+
+    def cutoff(self, move: Optional[Move], index: int, ply: int, depth: int) -> None:
+        '''Records that move, the index'th searched at ply with depth plies left, cut off the search.'''
+        self.num_cutoffs += 1
+        if index == 0:
+            self.num_first_move_cutoffs += 1
+        if move is None or move.captured is not None:
+            return
+        killers = self.killers[ply]
+        if move in killers:
+            killers.remove(move)
+        killers.insert(0, move)
+        del killers[self.num_killers:]
+        self.history[self._history_key(move)] += depth * depth
@@ -0,0 +1,77 @@
+from alpha_beta_board_tree import AlphaBetaBoardTree
+from board import Board
+from move import Move
+from move_ordering import MoveOrdering
+from piece import Piece
+from piece_value_board_evaluator import PieceValueBoardEvalutor
+from position import Position
+from transposition_table import TranspositionTable
+
+from unittest import TestCase
+
+
+class MoveOrderingTest(TestCase):
+    _BOARD = 'wqd4,wpc4,brd5,bqe5,wkh1,bkh8'
+
+    @staticmethod
+    def _move(board: Board, from_position: str, to_position: str) -> Move:
+        return next(move for move in board.color_moves(Piece.Color.WHITE)
+                    if move.from_position == Position.parse(from_position)
+                    and move.to_position == Position.parse(to_position))
+
+    def test_mvv_lva(self):
+        board = Board.parse(self._BOARD)
+        moves = MoveOrdering().order(board, board.color_moves(Piece.Color.WHITE), 0)
+        self.assertEqual(moves[:3], [self._move(board, 'd4', 'e5'),
+                                     self._move(board, 'c4', 'd5'),
+                                     self._move(board, 'd4', 'd5')])
+        self.assertFalse(any(move.is_capture for move in moves[3:]))
+
+    def test_best_first(self):
+        board = Board.parse(self._BOARD)
+        best = board.with_move(self._move(board, 'h1', 'g1'))
+        moves = MoveOrdering().order(board, board.color_moves(Piece.Color.WHITE), 0, best.zobrist_key)
+        self.assertEqual(moves[0], self._move(board, 'h1', 'g1'))
+        self.assertEqual(moves[1], self._move(board, 'd4', 'e5'))
+
+    def test_killers_and_history(self):
+        board = Board.parse(self._BOARD)
+        move_ordering = MoveOrdering(num_killers=1)
+        move_ordering.cutoff(self._move(board, 'h1', 'g1'), 3, 2, 4)
+        move_ordering.cutoff(self._move(board, 'h1', 'g2'), 0, 3, 1)
+        moves = move_ordering.order(board, board.color_moves(Piece.Color.WHITE), 2)
+        # killers come after captures, then quiet moves by history
+        self.assertEqual(moves[3:5], [self._move(board, 'h1', 'g1'), self._move(board, 'h1', 'g2')])
+        moves = move_ordering.order(board, board.color_moves(Piece.Color.WHITE), 3)
+        self.assertEqual(moves[3:5], [self._move(board, 'h1', 'g2'), self._move(board, 'h1', 'g1')])
+        # a new killer replaces the oldest
+        move_ordering.cutoff(self._move(board, 'c4', 'c5'), 1, 2, 1)
+        self.assertEqual(move_ordering.killers[2], [self._move(board, 'c4', 'c5')])
+        # captures aren't killers
+        move_ordering.cutoff(self._move(board, 'd4', 'e5'), 0, 2, 1)
+        self.assertEqual(move_ordering.killers[2], [self._move(board, 'c4', 'c5')])
+        self.assertEqual(move_ordering.stats, MoveOrdering.Stats(4, 2))
+        self.assertEqual(move_ordering.stats.first_move_cutoff_rate, 0.5)
+
+    def test_new_search(self):
+        board = Board.parse(self._BOARD)
+        move_ordering = MoveOrdering()
+        move_ordering.cutoff(self._move(board, 'h1', 'g1'), 0, 2, 2)
+        move_ordering.cutoff(self._move(board, 'h1', 'g2'), 0, 2, 1)
+        move_ordering.new_search()
+        self.assertFalse(move_ordering.killers)
+        self.assertEqual(dict(move_ordering.history),
+                         {(Piece.Color.WHITE, Position.parse('h1'), Position.parse('g1')): 2})
+
+    def test_board_tree(self):
+        board = Board.parse(self._BOARD)
+        table = TranspositionTable()
+        best = board.with_move(self._move(board, 'h1', 'g1'))
+        table.put(board, Piece.Color.WHITE, 1, 0, TranspositionTable.Bound.EXACT, best)
+        bt = AlphaBetaBoardTree(board, PieceValueBoardEvalutor(Piece.Color.WHITE), Piece.Color.WHITE,
+                                transposition_table=table, move_ordering=MoveOrdering())
+        bt.expand()
+        self.assertEqual([child.board for child in bt.children[:2]],
+                         [best, board.with_move(self._move(board, 'd4', 'e5'))])
+        self.assertTrue(all(child.move_ordering is bt.move_ordering for child in bt.children))
+        self.assertTrue(all(bt.board.with_move(child.move) == child.board for child in bt.children))
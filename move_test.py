@@ -0,0 +1,34 @@
+from move import Move
+from piece import Piece
+from position import Position
+
+from unittest import TestCase
+
+
+class MoveTest(TestCase):
+    def test_repr(self):
+        self.assertEqual(
+            repr(Move(Piece.parse('wpe4'), Position.parse('e5'))), 'wpe4-e5')
+        self.assertEqual(
+            repr(Move(Piece.parse('wpe4'), Position.parse('d5'), Piece.parse('bpd5'))), 'wpe4xd5')
+
+    def test_moved_piece(self):
+        self.assertEqual(
+            Move(Piece.parse('wpe2', False), Position.parse('e4')).moved_piece,
+            Piece.parse('wpe4'),
+        )
+
+    def test_flags(self):
+        self.assertEqual(
+            Move(Piece.parse('wpe4'), Position.parse('e5')).flags,
+            Move.Flags.NONE,
+        )
+        self.assertEqual(
+            Move(Piece.parse('wpe2', False), Position.parse('e4')).flags,
+            Move.Flags.FIRST_MOVE | Move.Flags.DOUBLE_STEP,
+        )
+        self.assertEqual(
+            Move(Piece.parse('wre2'), Position.parse('e4'),
+                 Piece.parse('bpe4')).flags,
+            Move.Flags.CAPTURE,
+        )
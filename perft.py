@@ -0,0 +1,164 @@
+from board import Board
+from piece import Piece
+from search_board import SearchBoard
+
+from argparse import ArgumentParser
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Optional, Sequence
+import sys
+
+
+@dataclass(frozen=True)
+class Perft:
+    '''Leaf node counts of the move tree to a fixed depth.
+
+    Captures, checks and checkmates are counted over the moves of the last
+    ply, as in the usual perft tables.
+    '''
+
+    nodes: int = 0
+    captures: int = 0
+    checks: int = 0
+    checkmates: int = 0
+
+    def __add__(self, other: 'Perft') -> 'Perft':
+        return Perft(self.nodes + other.nodes,
+                     self.captures + other.captures,
+                     self.checks + other.checks,
+                     self.checkmates + other.checkmates)
+
+    @dataclass(frozen=True)
+    class Reference:
+        '''A position with counts known from standard chess.
+
+        Only depths that reach no castling, en passant or promotion are
+        listed, since this engine doesn't play them.
+        '''
+
+        name: str
+        board: str
+        color: Piece.Color
+        counts: Sequence['Perft']
+
+        def new_board(self, impl: Board.Impl = Board.Impl.PIECE_SET) -> Board:
+            # pawns off their home rank have moved and lose the double step
+            pieces = []
+            for s in self.board.split(','):
+                piece = Piece.parse(s, False)
+                if piece.type == Piece.Type.PAWN and piece.position.y != (1 if piece.color == Piece.Color.WHITE else 6):
+                    piece = Piece.parse(s, True)
+                pieces.append(piece)
+            return Board.new(frozenset(pieces), impl)
+
+
+def perft(board: Board, color: Piece.Color, depth: int) -> Perft:
+    if depth < 1:
+        raise ValueError(depth)
+    result = Perft()
+    for move in board.color_moves(color):
+        child = board.with_move(move)
+        if depth > 1:
+            result += perft(child, color.opponent, depth - 1)
+            continue
+        check = child.is_color_in_check(color.opponent)
+        result += Perft(1,
+                        int(move.is_capture),
+                        int(check),
+                        int(check and child.is_color_in_checkmate(color.opponent)))
+    return result
+
+
+def search_board_perft(board: SearchBoard, color: Piece.Color, depth: int) -> Perft:
+    if depth < 1:
+        raise ValueError(depth)
+    result = Perft()
+    for move in board.moves(color):
+        board.make_move(move)
+        if depth > 1:
+            result += search_board_perft(board, color.opponent, depth - 1)
+        else:
+            check = board.is_color_in_check(color.opponent)
+            result += Perft(1,
+                            int(move.is_capture),
+                            int(check),
+                            int(check and board.is_color_in_checkmate(color.opponent)))
+        board.unmake_move()
+    return result
+
+
+REFERENCES: Sequence[Perft.Reference] = (
+    Perft.Reference(
+        'start',
+        ','.join(repr(piece) for piece in Board.default_board().pieces),
+        Piece.Color.WHITE,
+        (
+            Perft(20),
+            Perft(400),
+            Perft(8902, 34, 12),
+            Perft(197281, 1576, 469, 8),
+        ),
+    ),
+    # position 3 from the chessprogramming wiki perft results, 8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w
+    Perft.Reference(
+        'endgame',
+        'wka5,wpb5,wrb4,wpe2,wpg2,bpc7,bpd6,brh5,bpf4,bkh4',
+        Piece.Color.WHITE,
+        (
+            Perft(14, 1, 2),
+            Perft(191, 14, 10),
+        ),
+    ),
+)
+
+_IMPLS = {
+    'piece_set': Board.Impl.PIECE_SET,
+    'bit_board': Board.Impl.BIT_BOARD,
+    'search_board': Board.Impl.PIECE_SET,
+}
+
+
+def run(reference: Perft.Reference, depth: int, impl: str) -> Perft:
+    board = reference.new_board(_IMPLS[impl])
+    if impl == 'search_board':
+        return search_board_perft(SearchBoard(board), reference.color, depth)
+    return perft(board, reference.color, depth)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = ArgumentParser(
+        description='Counts leaf nodes of the move tree and reports move generation speed.')
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--impl', choices=list(_IMPLS), default='piece_set')
+    parser.add_argument('--position', choices=[reference.name for reference in REFERENCES],
+                        help='only run this reference position')
+    parser.add_argument('--test', action='store_true',
+                        help='check every depth up to --depth against the known counts')
+    args = parser.parse_args(argv)
+
+    failed = False
+    for reference in REFERENCES:
+        if args.position is not None and reference.name != args.position:
+            continue
+        depths = range(1, args.depth + 1) if args.test else [args.depth]
+        for depth in depths:
+            if args.test and depth > len(reference.counts):
+                break
+            Board.cache().clear()
+            start = perf_counter()
+            result = run(reference, depth, args.impl)
+            seconds = perf_counter() - start
+            line = (f'{reference.name} depth {depth}: {result.nodes} nodes, {result.captures} captures, '
+                    f'{result.checks} checks, {result.checkmates} checkmates '
+                    f'in {seconds:.2f}s ({result.nodes / seconds:.0f} nodes/s)')
+            if depth <= len(reference.counts):
+                expected = reference.counts[depth - 1]
+                if result != expected:
+                    failed = True
+                    line += f' expected {expected}'
+            print(line)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
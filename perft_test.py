@@ -0,0 +1,23 @@
+from board import Board
+from perft import REFERENCES, Perft, perft, run
+
+from unittest import TestCase
+
+
+class PerftTest(TestCase):
+    def test_add(self):
+        self.assertEqual(Perft(1, 2, 3, 4) + Perft(5, 6, 7, 8), Perft(6, 8, 10, 12))
+
+    def test_invalid_depth(self):
+        with self.assertRaises(ValueError):
+            perft(Board.default_board(), REFERENCES[0].color, 0)
+
+    def test_references(self):
+        for impl in ('piece_set', 'bit_board', 'search_board'):
+            for reference in REFERENCES:
+                for depth, expected in enumerate(reference.counts[:3], 1):
+                    with self.subTest((impl, reference.name, depth)):
+                        self.assertEqual(run(reference, depth, impl), expected)
+
+    def test_new_board(self):
+        self.assertEqual(REFERENCES[0].new_board(), Board.default_board())
@@ -1,15 +1,24 @@
 from position import Position
 
-from dataclasses import dataclass
 from enum import Enum
 
 
-@dataclass(frozen=True)
 class Piece:
+    '''A piece of a color and type on a square, preallocated and shared.
+
+    Piece(...) returns the shared instance for (color, type, position,
+    has_moved), so pieces compare and hash by identity.
+    '''
+
+    __slots__ = ('color', 'type', 'position', 'has_moved')
+
     class Color(Enum):
         WHITE = 'w'
         BLACK = 'b'
 
+        # members are singletons, so identity hashing is consistent with equality and much cheaper
+        __hash__ = object.__hash__
+
         @property
         def opponent(self) -> 'Piece.Color':
             if self == Piece.Color.WHITE:
@@ -35,6 +44,8 @@ class Piece:
         QUEEN = 'q'
         KING = 'k'
 
+        __hash__ = object.__hash__
+
         def __repr__(self) -> str:
             return self.value
 
@@ -48,16 +59,49 @@ class Piece:
     color: Color
     type: Type
     position: Position
-    has_moved: bool = False
+    has_moved: bool
+
+    def __new__(cls, color: Color, type: Type, position: Position, has_moved: bool = False) -> 'Piece':
+        try:
+            return _PIECES[(color, type, position, has_moved)]
+        except KeyError:
+            raise ValueError((color, type, position, has_moved)) from None
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __reduce__(self):
+        return (Piece, (self.color, self.type, self.position, self.has_moved))
 
     def __repr__(self) -> str:
         return f'{self.color.value}{self.type.value}{repr(self.position)}'
 
     def with_position(self, position: Position) -> 'Piece':
-        return Piece(self.color, self.type, position, True)
+        return _PIECES[(self.color, self.type, position, True)]
 
     @staticmethod
     def parse(s: str, has_moved: bool = True) -> 'Piece':
         if len(s) != 4:
             raise ValueError(s)
         return Piece(Piece.Color.parse(s[0]), Piece.Type.parse(s[1]), Position.parse(s[2:]), has_moved)
+
+
+def _new_piece(color: Piece.Color, type: Piece.Type, position: Position, has_moved: bool) -> Piece:
+    piece = object.__new__(Piece)
+    object.__setattr__(piece, 'color', color)
+    object.__setattr__(piece, 'type', type)
+    object.__setattr__(piece, 'position', position)
+    object.__setattr__(piece, 'has_moved', has_moved)
+    return piece
+
+
+_PIECES: dict[tuple[Piece.Color, Piece.Type, Position, bool], Piece] = {
+    (color, type, Position.at(i), has_moved): _new_piece(color, type, Position.at(i), has_moved)
+    for color in Piece.Color
+    for type in Piece.Type
+    for i in range(64)
+    for has_moved in (False, True)
+}
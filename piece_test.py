@@ -1,6 +1,7 @@
 from piece import Piece
 from position import Position
 
+from pickle import dumps, loads
 from unittest import TestCase
 
 
@@ -54,3 +55,17 @@ class PieceTest(TestCase):
         )
         with self.assertRaises(ValueError):
             Piece.parse('foo')
+
+    def test_interned(self):
+        piece = Piece.parse('bqf4')
+        self.assertIs(piece, Piece(Piece.Color.BLACK, Piece.Type.QUEEN, Position.parse('f4'), True))
+        self.assertIs(piece.with_position(Position.parse('f5')), Piece.parse('bqf5'))
+        self.assertIs(loads(dumps(piece)), piece)
+
+    def test_immutable(self):
+        with self.assertRaises(AttributeError):
+            Piece.parse('bqf4').has_moved = False  # type: ignore
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            Piece('w', 'p', Position(0, 0))  # type: ignore
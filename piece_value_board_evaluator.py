@@ -1,8 +1,10 @@
 from board import Board
 from board_evaluator import BoardEvaluator
 from piece import Piece
+from search_board import SearchBoard
 
 from dataclasses import dataclass
+from typing import Union
 
 
 PIECE_VALUES: dict[Piece.Type, float] = {
@@ -23,7 +25,7 @@ class PieceValueBoardEvalutor(BoardEvaluator):
     def _color_sign(self, piece_color: Piece.Color) -> float:
         return -1 if self.eval_color != piece_color else 1
 
-    def evaluate(self, board: Board) -> float:
+    def evaluate(self, board: Union[Board, SearchBoard]) -> float:
         value = 0
         for color in Piece.Color:
             if board.is_color_in_checkmate(color):
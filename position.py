@@ -1,7 +1,15 @@
 from dataclasses import dataclass
 
-@dataclass(frozen=True)
+
 class Position:
+    '''One of the 64 squares, preallocated and shared.
+
+    Position(x, y) and Position.at(index) return the shared instance, so
+    positions compare and hash by identity. Squares are indexed 0-63 with
+    a1 = 0, h1 = 7 and h8 = 63.
+    '''
+
+    __slots__ = ('x', 'y', 'index')
 
     @dataclass(frozen=True)
     class Delta:
@@ -13,10 +21,25 @@ class Position:
 
     x: int
     y: int
+    index: int
+
+    def __new__(cls, x: int, y: int) -> 'Position':
+        if x < 0 or x >= 8 or y < 0 or y >= 8:
+            raise ValueError((x, y))
+        return _POSITIONS[y * 8 + x]
+
+    @staticmethod
+    def at(index: int) -> 'Position':
+        return _POSITIONS[index]
 
-    def __post_init__(self):
-        if self.x < 0 or self.x >= 8 or self.y < 0 or self.y >= 8:
-            raise ValueError(self)
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __reduce__(self):
+        return (Position, (self.x, self.y))
 
     def can_add(self, d: 'Position.Delta') -> bool:
         return 0 <= self.x + d.dx < 8 and 0 <= self.y + d.dy < 8
@@ -24,7 +47,7 @@ class Position:
     def __add__(self, d: 'Position.Delta') -> 'Position':
         if not self.can_add(d):
             raise ValueError(self, d)
-        return Position(self.x + d.dx, self.y + d.dy)
+        return _POSITIONS[self.index + d.dy * 8 + d.dx]
 
     def __sub__(self, d: 'Position.Delta') -> 'Position':
         return self + -d
@@ -37,3 +60,14 @@ class Position:
         if len(s) != 2 or s[0] not in 'abcdefgh' or s[1] not in '12345678':
             raise ValueError(s)
         return Position(ord(s[0])-ord('a'), int(s[1])-1)
+
+
+def _new_position(index: int) -> Position:
+    position = object.__new__(Position)
+    object.__setattr__(position, 'x', index & 7)
+    object.__setattr__(position, 'y', index >> 3)
+    object.__setattr__(position, 'index', index)
+    return position
+
+
+_POSITIONS: tuple[Position, ...] = tuple(_new_position(i) for i in range(64))
@@ -1,5 +1,6 @@
 from position import Position
 
+from pickle import dumps, loads
 from unittest import TestCase
 
 
@@ -34,3 +35,18 @@ class PositionTest(TestCase):
             with self.subTest(s):
                 with self.assertRaises(ValueError):
                     Position.parse(s)
+
+    def test_interned(self):
+        self.assertIs(Position.parse('c2'), Position(2, 1))
+        self.assertIs(Position(2, 1) + Position.Delta(0, 2), Position.parse('c4'))
+        self.assertIs(loads(dumps(Position(2, 1))), Position(2, 1))
+
+    def test_index(self):
+        self.assertEqual(Position.parse('a1').index, 0)
+        self.assertEqual(Position.parse('c2').index, 10)
+        self.assertEqual(Position.parse('h8').index, 63)
+        self.assertIs(Position.at(10), Position.parse('c2'))
+
+    def test_immutable(self):
+        with self.assertRaises(AttributeError):
+            Position(0, 0).x = 1  # type: ignore
@@ -0,0 +1,63 @@
+from board import Board
+from piece import Piece
+
+from dataclasses import dataclass, field
+
+
+@dataclass
+class Pruning:
+    '''Settings and counts for the selective search of AlphaBetaBoardTree.
+
+    Null-move pruning lets the side to move pass and searches the result
+    null_move_reduction plies shallower: if passing is already good enough to
+    cut off, searching a real move would too. It's skipped when the side to
+    move is in check or has only pawns and its king, where passing can be
+    better than any move.
+
+    Late-move reductions search quiet moves from the num_full_depth_moves'th
+    on one ply shallower with a null window, and search them again at full
+    depth only if they turn out better than expected.
+    '''
+
+    null_move: bool = True
+    late_move_reductions: bool = True
+    null_move_reduction: int = 2
+    # null moves and reductions only happen with at least this many plies left
+    min_depth: int = 3
+    num_full_depth_moves: int = 3
+    num_null_move_searches: int = field(default=0, init=False)
+    num_null_move_cutoffs: int = field(default=0, init=False)
+    num_reductions: int = field(default=0, init=False)
+    num_re_searches: int = field(default=0, init=False)
+
+    @dataclass(frozen=True)
+    class Stats:
+        num_null_move_searches: int
+        num_null_move_cutoffs: int
+        num_reductions: int
+        num_re_searches: int
+
+    def __post_init__(self):
+        if self.null_move_reduction < 1:
+            raise ValueError(self.null_move_reduction)
+        if self.min_depth <= self.null_move_reduction:
+            raise ValueError((self.min_depth, self.null_move_reduction))
+        if self.num_full_depth_moves < 1:
+            raise ValueError(self.num_full_depth_moves)
+
+    @property
+    def stats(self) -> 'Pruning.Stats':
+        return Pruning.Stats(self.num_null_move_searches, self.num_null_move_cutoffs,
+                             self.num_reductions, self.num_re_searches)
+
+    def reset_stats(self) -> None:
+        self.num_null_move_searches = 0
+        self.num_null_move_cutoffs = 0
+        self.num_reductions = 0
+        self.num_re_searches = 0
+
+    @staticmethod
+    def has_non_pawn_material(board: Board, color: Piece.Color) -> bool:
+        '''Whether color has anything besides pawns and its king, so that passing is unlikely to be its best move.'''
+        return any(piece.type not in (Piece.Type.PAWN, Piece.Type.KING)
+                   for piece in board.pieces_by_color[color])
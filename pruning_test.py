@@ -0,0 +1,70 @@
+from alpha_beta_board_tree import AlphaBetaBoardTree
+from board import Board
+from board_tree import BoardTree
+from move_ordering import MoveOrdering
+from piece import Piece
+from piece_value_board_evaluator import PieceValueBoardEvalutor
+from pruning import Pruning
+
+from typing import Optional
+from unittest import TestCase
+
+
+def _num_evaluated(board_tree: BoardTree) -> int:
+    return int('board_value' in vars(board_tree)) + sum(_num_evaluated(child) for child in board_tree.children)
+
+
+class PruningTest(TestCase):
+    _BOARD = 'wke1,wqd1,wpe2,wpf2,bke8,brh8,bpe7,bnc6'
+
+    @staticmethod
+    def _board_tree(board: str, pruning: Optional[Pruning]) -> AlphaBetaBoardTree:
+        return AlphaBetaBoardTree(Board.parse(board, False),
+                                  PieceValueBoardEvalutor(Piece.Color.WHITE),
+                                  Piece.Color.WHITE,
+                                  move_ordering=MoveOrdering(),
+                                  pruning=pruning)
+
+    def test_invalid(self):
+        for kwargs in [{'null_move_reduction': 0},
+                       {'min_depth': 2, 'null_move_reduction': 2},
+                       {'num_full_depth_moves': 0}]:
+            with self.subTest(kwargs):
+                with self.assertRaises(ValueError):
+                    Pruning(**kwargs)
+
+    def test_has_non_pawn_material(self):
+        def case(board: str, color: Piece.Color, expected: bool) -> None:
+            with self.subTest((board, color, expected)):
+                self.assertEqual(Pruning.has_non_pawn_material(Board.parse(board), color), expected)
+        case('bke8,bra8,brh8,wke1', Piece.Color.WHITE, False)
+        case('bke8,bra8,brh8,wke1', Piece.Color.BLACK, True)
+        case('wke1,wpe2,wpf2,bke8,bnc6', Piece.Color.WHITE, False)
+
+    def test_disabled_matches_alpha_beta(self):
+        for depth in range(1, 5):
+            with self.subTest(depth):
+                self.assertEqual(self._board_tree(self._BOARD, Pruning(False, False)).search(depth),
+                                 self._board_tree(self._BOARD, None).search(depth))
+
+    def test_null_move(self):
+        pruning = Pruning(late_move_reductions=False)
+        self.assertEqual(self._board_tree(self._BOARD, pruning).search(4).value,
+                         self._board_tree(self._BOARD, None).search(4).value)
+        self.assertGreater(pruning.stats.num_null_move_cutoffs, 0)
+        self.assertEqual(pruning.stats.num_reductions, 0)
+
+    def test_late_move_reductions(self):
+        pruning = Pruning(null_move=False)
+        reduced = self._board_tree(self._BOARD, pruning)
+        full = self._board_tree(self._BOARD, None)
+        self.assertEqual(reduced.search(4).value, full.search(4).value)
+        self.assertGreater(pruning.stats.num_reductions, 0)
+        self.assertEqual(pruning.stats.num_null_move_searches, 0)
+        self.assertLess(_num_evaluated(reduced), _num_evaluated(full))
+
+    def test_zugzwang(self):
+        # neither side has anything but pawns and its king, so neither ever passes
+        pruning = Pruning(late_move_reductions=False)
+        self._board_tree('wke1,wpe2,wpf2,bke8,bpe7', pruning).search(5)
+        self.assertEqual(pruning.stats.num_null_move_searches, 0)
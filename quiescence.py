@@ -0,0 +1,68 @@
+from board import Board
+from board_evaluator import BoardEvaluator
+from piece import Piece
+
+from dataclasses import dataclass, field
+from math import inf
+from typing import Optional
+
+
+@dataclass
+class Quiescence:
+    '''Searches captures only, so leaves aren't scored in the middle of an exchange.
+
+    Either side may stand pat on the static evaluation instead of capturing,
+    which bounds the value before any capture is tried. A side in check
+    can't stand pat and searches every way out of check instead. max_depth
+    caps the number of moves searched, and num_nodes counts the positions
+    visited.
+    '''
+
+    max_depth: Optional[int] = None
+    num_nodes: int = field(default=0, init=False)
+
+    def __post_init__(self):
+        if self.max_depth is not None and self.max_depth < 0:
+            raise ValueError(self.max_depth)
+
+    def search(self, board: Board, color: Piece.Color, board_evaluator: BoardEvaluator,
+               alpha: float = -inf, beta: float = inf) -> float:
+        '''Returns the value of board with color to move, for board_evaluator's color.'''
+        return self._search(board, color, board_evaluator, alpha, beta, 0)
+
+    def _search(self, board: Board, color: Piece.Color, board_evaluator: BoardEvaluator,
+                alpha: float, beta: float, depth: int) -> float:
+        self.num_nodes += 1
+        value = board_evaluator.evaluate(board)
+        if self.max_depth is not None and depth >= self.max_depth:
+            return value
+        maximizing = color == board_evaluator.eval_color
+        in_check = board.is_color_in_check(color)
+        moves = board.color_moves(color)
+        if in_check:
+            if not moves:
+                # the evaluator scores the mate
+                return value
+            value = -inf if maximizing else inf
+        elif maximizing:
+            if value >= beta:
+                return value
+            alpha = max(alpha, value)
+        else:
+            if value <= alpha:
+                return value
+            beta = min(beta, value)
+        for move in moves:
+            if not in_check and not move.is_capture:
+                continue
+            child_value = self._search(board.with_move(move), color.opponent, board_evaluator,
+                                       alpha, beta, depth + 1)
+            if maximizing:
+                value = max(value, child_value)
+                alpha = max(alpha, value)
+            else:
+                value = min(value, child_value)
+                beta = min(beta, value)
+            if alpha >= beta:
+                break
+        return value
@@ -0,0 +1,84 @@
+from alpha_beta_board_tree import AlphaBetaBoardTree
+from board import Board
+from board_tree_expander import BFSExpander, UntilNumSamples
+from min_max_board_tree import MinMaxBoardTree
+from piece import Piece
+from piece_value_board_evaluator import CHECKMATE_VALUE, PieceValueBoardEvalutor
+from quiescence import Quiescence
+
+from math import inf
+from unittest import TestCase
+
+
+class QuiescenceTest(TestCase):
+    def test_search(self):
+        def case(board: str, color: Piece.Color, value: float) -> None:
+            with self.subTest((board, color, value)):
+                self.assertEqual(Quiescence().search(Board.parse(board), color,
+                                                     PieceValueBoardEvalutor(Piece.Color.WHITE)),
+                                 value)
+        # no captures
+        case('wpa2,bph7', Piece.Color.WHITE, 0)
+        # free capture
+        case('wrd1,bnd5', Piece.Color.WHITE, 5)
+        # stand pat rather than lose the queen for a pawn
+        case('wqd1,bpd5,brd8', Piece.Color.WHITE, 9)
+        # stand pat rather than trade the rook for a defended knight
+        case('wrd1,bnd5,bpe6', Piece.Color.WHITE, 1)
+        # the side to move is the one capturing
+        case('wrd1,bnd5,bpe6', Piece.Color.BLACK, 1)
+        case('wrd5,bpe6', Piece.Color.BLACK, -1)
+        # in check, so white can't stand pat, and every way out of check loses the queen
+        case('wke1,wqh5,bbb4,bnf6,bpf7,bke8', Piece.Color.WHITE, -7)
+        # checkmated
+        case('wkh1,wpg2,wph2,bkc8,bra1', Piece.Color.WHITE, -CHECKMATE_VALUE)
+
+    def test_num_nodes(self):
+        quiescence = Quiescence()
+        quiescence.search(Board.parse('wpa2,bph7'), Piece.Color.WHITE, PieceValueBoardEvalutor(Piece.Color.WHITE))
+        self.assertEqual(quiescence.num_nodes, 1)
+        quiescence.search(Board.parse('wrd1,bnd5'), Piece.Color.WHITE, PieceValueBoardEvalutor(Piece.Color.WHITE))
+        self.assertEqual(quiescence.num_nodes, 3)
+
+    def test_max_depth(self):
+        board = Board.parse('wrd1,bnd5,bpe6')
+        evaluator = PieceValueBoardEvalutor(Piece.Color.WHITE)
+        self.assertEqual(Quiescence(0).search(board, Piece.Color.WHITE, evaluator), 1)
+        # stops before the pawn takes back
+        self.assertEqual(Quiescence(1).search(board, Piece.Color.WHITE, evaluator), 4)
+        self.assertEqual(Quiescence(2).search(board, Piece.Color.WHITE, evaluator), 1)
+        with self.assertRaises(ValueError):
+            Quiescence(-1)
+
+    def test_window(self):
+        board = Board.parse('wrd1,bnd5,bpe6')
+        evaluator = PieceValueBoardEvalutor(Piece.Color.WHITE)
+        value = Quiescence().search(board, Piece.Color.WHITE, evaluator)
+        self.assertEqual(Quiescence().search(board, Piece.Color.WHITE, evaluator, value - 1, value + 1), value)
+        # fails high and low outside the window
+        self.assertGreaterEqual(Quiescence().search(board, Piece.Color.WHITE, evaluator, -inf, value - 1), value - 1)
+        self.assertLessEqual(Quiescence().search(board, Piece.Color.WHITE, evaluator, value + 1, inf), value + 1)
+
+    def test_board_trees(self):
+        # without quiescence a depth 1 search takes the defended pawn with the queen
+        board = Board.parse('wqd1,bpd5,brd8,wpa2')
+        evaluator = PieceValueBoardEvalutor(Piece.Color.WHITE)
+        self.assertEqual(AlphaBetaBoardTree(board, evaluator, Piece.Color.WHITE).search(1).boards[1],
+                         Board.parse('wqd5,brd8,wpa2'))
+        alpha_beta = AlphaBetaBoardTree(board, evaluator, Piece.Color.WHITE, quiescence=Quiescence())
+        alpha_beta_result = alpha_beta.search(1)
+        self.assertNotEqual(alpha_beta_result.boards[1], Board.parse('wqd5,brd8,wpa2'))
+        min_max = MinMaxBoardTree(board, evaluator, Piece.Color.WHITE, quiescence=Quiescence())
+        min_max.expand_to_depth(1)
+        self.assertEqual(min_max.result.value, alpha_beta_result.value)
+        self.assertNotEqual(min_max.result.boards[1], Board.parse('wqd5,brd8,wpa2'))
+
+    def test_expander_stats(self):
+        board_tree = MinMaxBoardTree(Board.parse('wrd1,bnd5,bpe6'),
+                                     PieceValueBoardEvalutor(Piece.Color.WHITE),
+                                     Piece.Color.WHITE,
+                                     quiescence=Quiescence())
+        stats = BFSExpander(UntilNumSamples(2)).expand(board_tree)
+        self.assertGreater(stats.num_quiescence_nodes, 0)
+        self.assertEqual(stats.num_quiescence_nodes, board_tree.quiescence.num_nodes)
+        self.assertTrue(all(child.quiescence is board_tree.quiescence for child in board_tree.children))
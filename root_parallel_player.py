@@ -0,0 +1,174 @@
+from alpha_beta_board_tree import AlphaBetaBoardTree
+from board import Board
+from board_evaluator import BoardEvaluator
+from board_tree import BoardTree
+from board_tree_expander import StopCondition
+from iterative_deepening_player import IterativeDeepeningPlayer
+from move import Move
+from piece import Piece
+from player import Player
+from position import Position
+from quiescence import Quiescence
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from os import cpu_count
+from time import time
+from typing import Optional
+
+# Boards cross process boundaries as their pieces, which pickle compactly, rather than with their caches.
+_Pieces = tuple[Piece, ...]
+# Moves cross as their from and to square indices.
+_Squares = tuple[int, int]
+
+
+def _squares(move: Move) -> _Squares:
+    return move.from_position.index, move.to_position.index
+
+
+def _move(board: Board, squares: _Squares) -> Move:
+    pieces = board.pieces_by_position
+    to_position = Position.at(squares[1])
+    return Move(pieces[Position.at(squares[0])], to_position, pieces.get(to_position))
+
+
+@dataclass(frozen=True)
+class _WorkerResult:
+    # index into the root moves the worker was given of the best move, and its value, by completed depth
+    results: dict[int, tuple[int, float]]
+    depth: int
+    num_nodes: int
+    num_quiescence_nodes: int
+
+
+def _search_root_moves(color: Piece.Color,
+                       board_evaluator: BoardEvaluator,
+                       stop_condition: StopCondition,
+                       max_depth: Optional[int],
+                       quiescence: Optional[Quiescence],
+                       impl: Board.Impl,
+                       board: _Pieces,
+                       moves: list[_Squares],
+                       ) -> _WorkerResult:
+    '''Searches the root with only the given children, in a worker process.'''
+    player = IterativeDeepeningPlayer(color, board_evaluator, stop_condition, max_depth,
+                                      quiescence=quiescence)
+    board_tree = AlphaBetaBoardTree(Board.new(frozenset(board), impl),
+                                    player.board_evaluator,
+                                    player.color,
+                                    transposition_table=player.transposition_table,
+                                    quiescence=player.quiescence)
+    board_tree.children = [board_tree.new_child(board_tree.board.with_move(move), move)
+                           for move in (_move(board_tree.board, squares) for squares in moves)]
+    indices = {child.board: i for i, child in enumerate(board_tree.children)}
+    results: dict[int, tuple[int, float]] = {}
+
+    def on_result(depth: int, result: BoardTree.Result) -> None:
+        results[depth] = indices[result.boards[1]], result.value
+    _, stats = player.search_tree(board_tree, on_result=on_result)
+    return _WorkerResult(results, stats.depth, stats.num_nodes, stats.num_quiescence_nodes)
+
+
+def _best_result(results: list[_WorkerResult]) -> tuple[int, int, float]:
+    '''Returns the worker, move index and value of the best move at the deepest depth every worker completed.
+
+    Values from different depths aren't comparable, so a worker that got
+    deeper than the others only counts at the depth they all reached.
+    '''
+    depth = min(result.depth for result in results)
+    worker = max(range(len(results)), key=lambda worker: results[worker].results[depth][1])
+    index, value = results[worker].results[depth]
+    return worker, index, value
+
+
+@dataclass
+class _Workers:
+    '''The mutable part of a RootParallelPlayer: the worker processes, kept until it's closed.'''
+
+    executor: Optional[ProcessPoolExecutor] = None
+
+
+@dataclass(frozen=True)
+class RootParallelPlayer(Player):
+    '''Splits the root moves across worker processes that each run an iterative deepening search.
+
+    Every worker searches its share of the moves under its own copy of
+    stop_condition and sends back the value of its best move at each depth
+    it completed, and the best of those at the deepest depth every worker
+    completed is played. Workers don't share transposition tables. The
+    worker processes live for the game, so close the player when the game
+    is over.
+    '''
+
+    board_evaluator: BoardEvaluator
+    stop_condition: StopCondition
+    max_depth: Optional[int] = None
+    # defaults to the number of processors
+    max_workers: Optional[int] = None
+    # searches captures at the leaves if set
+    quiescence: Optional[Quiescence] = None
+    _workers: _Workers = field(
+        default_factory=_Workers, init=False, repr=False, compare=False)
+
+    @dataclass(frozen=True)
+    class Stats:
+        num_workers: int
+        # the shallowest depth any worker completed
+        depth: int
+        num_nodes: int
+        total_time: float
+        num_quiescence_nodes: int = 0
+
+        @property
+        def nodes_per_second(self) -> float:
+            return self.num_nodes / self.total_time if self.total_time else 0
+
+    def __post_init__(self):
+        if not self.color == self.board_evaluator.eval_color:
+            raise ValueError((self.color, self.board_evaluator.eval_color))
+
+    @property
+    def _max_workers(self) -> int:
+        return self.max_workers or cpu_count() or 1
+
+    @property
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._workers.executor is None:
+            self._workers.executor = ProcessPoolExecutor(self._max_workers)
+        return self._workers.executor
+
+    def close(self) -> None:
+        if self._workers.executor is not None:
+            self._workers.executor.shutdown()
+            self._workers.executor = None
+
+    def search(self, board: Board) -> tuple[Board, float, 'RootParallelPlayer.Stats']:
+        start_time = time()
+        moves = [_squares(move) for move in board.color_moves(self.color)]
+        if not moves:
+            raise ValueError(f'no moves for {self.color} on {board}')
+        num_workers = min(self._max_workers, len(moves))
+        # dealing the moves out round robin spreads moves that are slow to search across the workers
+        shares = [moves[i::num_workers] for i in range(num_workers)]
+        results = list(self._executor.map(_search_root_moves,
+                                          [self.color] * num_workers,
+                                          [self.board_evaluator] * num_workers,
+                                          [self.stop_condition] * num_workers,
+                                          [self.max_depth] * num_workers,
+                                          [self.quiescence] * num_workers,
+                                          [board.impl] * num_workers,
+                                          [tuple(board.pieces)] * num_workers,
+                                          shares))
+        worker, index, value = _best_result(results)
+        stats = RootParallelPlayer.Stats(num_workers,
+                                         min(result.depth for result in results),
+                                         sum(result.num_nodes for result in results),
+                                         time() - start_time,
+                                         sum(result.num_quiescence_nodes for result in results))
+        return board.with_move(_move(board, shares[worker][index])), value, stats
+
+    def move(self, board: Board) -> Board:
+        print(f'{self} player considering board {board}')
+        move, value, stats = self.search(board)
+        print(f'result board {move} stats {stats} at {stats.nodes_per_second:.0f} nodes/s with value {value}')
+        return move
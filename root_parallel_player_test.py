@@ -0,0 +1,69 @@
+from board import Board
+from board_tree_expander import UntilNumSamples
+from iterative_deepening_player import IterativeDeepeningPlayer
+from piece import Piece
+from piece_value_board_evaluator import PieceValueBoardEvalutor
+from root_parallel_player import RootParallelPlayer, _WorkerResult, _best_result
+
+from unittest import TestCase
+
+
+class RootParallelPlayerTest(TestCase):
+    _BOARD = 'wke1,wqd1,wpe2,wpf2,bke8,brh8,bpe7,bnc6'
+
+    def test_evaluator_color_mismatch(self):
+        with self.assertRaises(ValueError):
+            RootParallelPlayer(Piece.Color.WHITE,
+                               PieceValueBoardEvalutor(Piece.Color.BLACK),
+                               UntilNumSamples(10))
+
+    def test_matches_single_process(self):
+        board = Board.parse(self._BOARD, False)
+        player = RootParallelPlayer(Piece.Color.WHITE,
+                                    PieceValueBoardEvalutor(Piece.Color.WHITE),
+                                    UntilNumSamples(10**9),
+                                    max_depth=2,
+                                    max_workers=3)
+        try:
+            move, value, stats = player.search(board)
+        finally:
+            player.close()
+        result, _ = IterativeDeepeningPlayer(Piece.Color.WHITE,
+                                             PieceValueBoardEvalutor(Piece.Color.WHITE),
+                                             UntilNumSamples(10**9),
+                                             max_depth=2).search(board)
+        self.assertEqual(value, result.value)
+        self.assertIn(move, board.moves_for_color(Piece.Color.WHITE))
+        self.assertEqual((stats.num_workers, stats.depth), (3, 2))
+
+    def test_move(self):
+        player = RootParallelPlayer(Piece.Color.WHITE,
+                                    PieceValueBoardEvalutor(Piece.Color.WHITE),
+                                    UntilNumSamples(10**9),
+                                    max_depth=2,
+                                    max_workers=2)
+        try:
+            self.assertEqual(player.move(Board.parse('wpe4,wpg2,bra4')), Board.parse('wpe5,wpg2,bra4'))
+        finally:
+            player.close()
+
+    def test_reuses_workers(self):
+        player = RootParallelPlayer(Piece.Color.WHITE,
+                                    PieceValueBoardEvalutor(Piece.Color.WHITE),
+                                    UntilNumSamples(10**9),
+                                    max_depth=1,
+                                    max_workers=2)
+        try:
+            player.search(Board.parse(self._BOARD, False))
+            executor = player._workers.executor
+            player.search(Board.parse('wpe4,wpg2,bra4'))
+            self.assertIs(player._workers.executor, executor)
+        finally:
+            player.close()
+        self.assertIsNone(player._workers.executor)
+
+    def test_best_result_at_common_depth(self):
+        # the second worker's depth 3 value is the highest, but the first worker only completed depth 2
+        self.assertEqual(_best_result([_WorkerResult({1: (0, 1), 2: (1, 3)}, 2, 0, 0),
+                                       _WorkerResult({1: (2, 2), 2: (0, 2), 3: (1, 5)}, 3, 0, 0)]),
+                         (0, 1, 3))
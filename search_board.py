@@ -0,0 +1,147 @@
+from attack_tables import KING_TARGETS, KNIGHT_TARGETS, PAWN_CAPTURES, PAWN_PUSHES, SLIDER_RAYS, SQUARES, is_square_attacked
+from board import Board
+from legal_moves import legal_moves
+from move import Move
+from piece import Piece
+from position import Position
+from zobrist import piece_key
+
+from typing import Optional
+
+
+class SearchBoard:
+    '''Mutable board for deep searches.
+
+    Moves are made and unmade in place against an undo stack, so a search can
+    walk any number of nodes on one object and only build an immutable Board
+    with to_board when it hands a result back.
+    '''
+
+    def __init__(self, board: Board):
+        self.impl = board.impl
+        self.zobrist_key = board.zobrist_key
+        self._squares: list[Optional[Piece]] = [None] * 64
+        self._occupied: dict[Piece.Color, set[int]] = {
+            color: set() for color in Piece.Color}
+        self._kings: dict[Piece.Color, set[int]] = {
+            color: set() for color in Piece.Color}
+        self._undo: list[tuple[Move, Piece, int]] = []
+        for piece in board.pieces:
+            self._put(piece.position.index, piece)
+
+    def __repr__(self) -> str:
+        return repr(self.to_board())
+
+    def _put(self, i: int, piece: Piece) -> None:
+        self._squares[i] = piece
+        self._occupied[piece.color].add(i)
+        if piece.type == Piece.Type.KING:
+            self._kings[piece.color].add(i)
+
+    def _take(self, i: int) -> Piece:
+        piece = self._squares[i]
+        assert piece is not None
+        self._squares[i] = None
+        self._occupied[piece.color].remove(i)
+        if piece.type == Piece.Type.KING:
+            self._kings[piece.color].remove(i)
+        return piece
+
+    @property
+    def pieces(self) -> frozenset[Piece]:
+        return frozenset({piece for piece in self._squares if piece is not None})
+
+    def piece_at(self, position: Position) -> Optional[Piece]:
+        return self._squares[position.index]
+
+    def to_board(self) -> Board:
+        return Board.new(self.pieces, self.impl)
+
+    @property
+    def ply(self) -> int:
+        return len(self._undo)
+
+    def make_move(self, move: Move) -> None:
+        piece = move.piece
+        from_i = piece.position.index
+        to_i = move.to_position.index
+        if from_i == to_i or self._squares[from_i] != piece or self._squares[to_i] != move.captured:
+            raise ValueError(move)
+        moved_piece = move.moved_piece
+        self._undo.append((move, moved_piece, self.zobrist_key))
+        if move.captured is not None:
+            self._take(to_i)
+            self.zobrist_key ^= piece_key(move.captured)
+        self._take(from_i)
+        self._put(to_i, moved_piece)
+        self.zobrist_key ^= piece_key(piece) ^ piece_key(moved_piece)
+
+    def unmake_move(self) -> None:
+        move, moved_piece, zobrist_key = self._undo.pop()
+        to_i = moved_piece.position.index
+        self._take(to_i)
+        self._put(move.piece.position.index, move.piece)
+        if move.captured is not None:
+            self._put(to_i, move.captured)
+        self.zobrist_key = zobrist_key
+
+    def _pseudo_moves_for_piece(self, piece: Piece, i: int, moves: list[Move]) -> None:
+        squares = self._squares
+        color = piece.color
+        if piece.type == Piece.Type.PAWN:
+            pushes = PAWN_PUSHES[color][i]
+            for to_position in pushes if not piece.has_moved else pushes[:1]:
+                if squares[to_position.index] is not None:
+                    break
+                moves.append(Move(piece, to_position))
+            for to_position in PAWN_CAPTURES[color][i]:
+                to_piece = squares[to_position.index]
+                if to_piece is not None and to_piece.color != color:
+                    moves.append(Move(piece, to_position, to_piece))
+        elif piece.type == Piece.Type.KNIGHT or piece.type == Piece.Type.KING:
+            targets = KNIGHT_TARGETS if piece.type == Piece.Type.KNIGHT else KING_TARGETS
+            for to_position in targets[i]:
+                to_piece = squares[to_position.index]
+                if to_piece is None or to_piece.color != color:
+                    moves.append(Move(piece, to_position, to_piece))
+        else:
+            for ray in SLIDER_RAYS[piece.type][i]:
+                for to_position in ray:
+                    to_piece = squares[to_position.index]
+                    if to_piece is None:
+                        moves.append(Move(piece, to_position))
+                    else:
+                        if to_piece.color != color:
+                            moves.append(Move(piece, to_position, to_piece))
+                        break
+
+    def pseudo_moves(self, color: Piece.Color) -> list[Move]:
+        moves: list[Move] = []
+        for i in list(self._occupied[color]):
+            piece = self._squares[i]
+            assert piece is not None
+            self._pseudo_moves_for_piece(piece, i, moves)
+        return moves
+
+    def moves(self, color: Piece.Color) -> list[Move]:
+        pseudo_moves = self.pseudo_moves(color)
+        moves = legal_moves(color, pseudo_moves, self.piece_at, [
+                            SQUARES[i] for i in self._kings[color]])
+        if moves is not None:
+            return moves
+        moves = []
+        for move in pseudo_moves:
+            self.make_move(move)
+            if not self.is_color_in_check(color):
+                moves.append(move)
+            self.unmake_move()
+        return moves
+
+    def is_square_attacked(self, i: int, color: Piece.Color) -> bool:
+        return is_square_attacked(i, color, self.piece_at)
+
+    def is_color_in_check(self, color: Piece.Color) -> bool:
+        return any([self.is_square_attacked(i, color.opponent) for i in self._kings[color]])
+
+    def is_color_in_checkmate(self, color: Piece.Color) -> bool:
+        return self.is_color_in_check(color) and not self.moves(color)
@@ -0,0 +1,80 @@
+from board import Board
+from move import Move
+from piece import Piece
+from position import Position
+from search_board import SearchBoard
+from zobrist import pieces_key
+
+from unittest import TestCase
+
+
+class SearchBoardTest(TestCase):
+    _BOARDS = [
+        'bke8,bra8,brh8,wke1',
+        'wpe4,wpg2,bra4',
+        'wke1,bra1,brb2',
+        'wkd4,bpd5,wnb1,bbc8,bqh4,wpe2',
+        'wpc2,bnc3,wpe2,bne4',
+    ]
+
+    def test_to_board(self):
+        for impl in Board.Impl:
+            with self.subTest(impl):
+                board = Board.default_board(impl)
+                self.assertEqual(SearchBoard(board).to_board(), board)
+
+    def test_make_move(self):
+        search_board = SearchBoard(Board.parse('wpe4,bpd5'))
+        search_board.make_move(
+            Move(Piece.parse('wpe4'), Position.parse('d5'), Piece.parse('bpd5')))
+        self.assertEqual(search_board.to_board(), Board.parse('wpd5'))
+        self.assertEqual(search_board.zobrist_key,
+                         Board.parse('wpd5').zobrist_key)
+        self.assertEqual(search_board.ply, 1)
+
+    def test_make_move_wrong_piece(self):
+        with self.assertRaises(ValueError):
+            SearchBoard(Board.parse('wpe4')).make_move(
+                Move(Piece.parse('wpd4'), Position.parse('d5')))
+
+    def test_unmake_move(self):
+        board = Board.default_board()
+        search_board = SearchBoard(board)
+        for move in search_board.moves(Piece.Color.WHITE):
+            search_board.make_move(move)
+            for reply in search_board.moves(Piece.Color.BLACK):
+                search_board.make_move(reply)
+                self.assertEqual(search_board.zobrist_key,
+                                 pieces_key(search_board.pieces))
+                search_board.unmake_move()
+            search_board.unmake_move()
+        self.assertEqual(search_board.ply, 0)
+        self.assertEqual(search_board.to_board(), board)
+        self.assertEqual(search_board.zobrist_key, board.zobrist_key)
+
+    def test_moves_match_board(self):
+        for s in self._BOARDS:
+            board = Board.parse(s, False)
+            search_board = SearchBoard(board)
+            for color in Piece.Color:
+                with self.subTest((s, color)):
+                    boards: set[Board] = set()
+                    for move in search_board.moves(color):
+                        search_board.make_move(move)
+                        boards.add(search_board.to_board())
+                        search_board.unmake_move()
+                    self.assertSetEqual(boards, set(
+                        board.moves_for_color(color)))
+                    self.assertSetEqual(set(search_board.moves(color)),
+                                        set(board.color_moves(color)))
+
+    def test_check(self):
+        for s in self._BOARDS:
+            board = Board.parse(s, False)
+            search_board = SearchBoard(board)
+            for color in Piece.Color:
+                with self.subTest((s, color)):
+                    self.assertEqual(search_board.is_color_in_check(color),
+                                     board.is_color_in_check(color))
+                    self.assertEqual(search_board.is_color_in_checkmate(color),
+                                     board.is_color_in_checkmate(color))
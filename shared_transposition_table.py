@@ -0,0 +1,107 @@
+from board import Board
+from piece import Piece
+from transposition_table import DEFAULT_MEMORY_MB, TranspositionTable
+
+from multiprocessing.shared_memory import SharedMemory
+from struct import Struct
+from typing import Optional
+
+# check, meta, value bits, best board key
+_ENTRY = Struct('<QQQQ')
+_VALUE = Struct('<d')
+_VALUE_BITS = Struct('<Q')
+
+ENTRY_BYTES = _ENTRY.size
+
+_BOUNDS = list(TranspositionTable.Bound)
+_OCCUPIED = 1 << 18
+_HAS_BEST = 1 << 19
+_GENERATION_SHIFT = 20
+_MASK_64 = (1 << 64) - 1
+# number of occupied records, kept after the last record
+_SIZE = Struct('<Q')
+
+
+class SharedTranspositionTable(TranspositionTable):
+    '''Transposition table held in shared memory so several processes can use it at once.
+
+    Entries are packed into fixed-size records. Writers don't lock: each
+    record stores its position key xored with the rest of the record, so a
+    record torn by two concurrent writes reads back as a miss instead of as
+    a wrong entry. Best moves are stored as board keys, like in every
+    TranspositionTable.
+
+    The number of occupied records is counted as they're filled, also
+    without a lock, so fills that race each other can go uncounted and
+    len is approximate while several processes are writing.
+
+    The process that creates the table owns the memory and must close it.
+    Pickling a table, e.g. to pass it to a worker process, attaches to the
+    same memory.
+    '''
+
+    def __init__(self, memory_mb: float = DEFAULT_MEMORY_MB, name: Optional[str] = None):
+        capacity = int(memory_mb * 2**20) // ENTRY_BYTES
+        if capacity < 1:
+            raise ValueError(memory_mb)
+        if name is None:
+            self._memory = SharedMemory(create=True, size=capacity * ENTRY_BYTES + _SIZE.size)
+            self._memory.buf[:capacity * ENTRY_BYTES + _SIZE.size] = bytes(capacity * ENTRY_BYTES + _SIZE.size)
+            self._owner = True
+        else:
+            # worker processes share their parent's resource tracker, so attaching doesn't hand them the memory
+            self._memory = SharedMemory(name=name)
+            self._owner = False
+        self._memory_mb = memory_mb
+        self._capacity = capacity
+        self._generation = 0
+        self.reset_stats()
+
+    def __reduce__(self):
+        return (_attach, (self._memory_mb, self._memory.name, self._generation))
+
+    def close(self) -> None:
+        self._memory.close()
+        if self._owner:
+            self._memory.unlink()
+
+    def __len__(self) -> int:
+        return _SIZE.unpack_from(self._memory.buf, self._capacity * ENTRY_BYTES)[0]
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def clear(self) -> None:
+        self._memory.buf[:self._capacity * ENTRY_BYTES + _SIZE.size] = bytes(self._capacity * ENTRY_BYTES + _SIZE.size)
+        self.reset_stats()
+
+    def _load(self, i: int, board: Board, color: Piece.Color) -> Optional[TranspositionTable.Entry]:
+        check, meta, value_bits, best_key = _ENTRY.unpack_from(self._memory.buf, i * ENTRY_BYTES)
+        if not meta & _OCCUPIED:
+            return None
+        return TranspositionTable.Entry(check ^ meta ^ value_bits ^ best_key,
+                                        meta & 0xFFFF,
+                                        _VALUE.unpack(_VALUE_BITS.pack(value_bits))[0],
+                                        _BOUNDS[meta >> 16 & 3],
+                                        best_key if meta & _HAS_BEST else None,
+                                        meta >> _GENERATION_SHIFT)
+
+    def _store(self, i: int, entry: TranspositionTable.Entry) -> None:
+        meta = min(entry.depth, 0xFFFF) | _BOUNDS.index(entry.bound) << 16 | _OCCUPIED | (
+            entry.generation & 0xFFFFFFFF) << _GENERATION_SHIFT
+        best_key = 0
+        if entry.best_key is not None:
+            meta |= _HAS_BEST
+            best_key = entry.best_key
+        value_bits = _VALUE_BITS.unpack(_VALUE.pack(entry.value))[0]
+        if not _ENTRY.unpack_from(self._memory.buf, i * ENTRY_BYTES)[1] & _OCCUPIED:
+            _SIZE.pack_into(self._memory.buf, self._capacity * ENTRY_BYTES, len(self) + 1)
+        _ENTRY.pack_into(self._memory.buf, i * ENTRY_BYTES,
+                         (entry.key ^ meta ^ value_bits ^ best_key) & _MASK_64, meta, value_bits, best_key)
+
+
+def _attach(memory_mb: float, name: str, generation: int) -> SharedTranspositionTable:
+    table = SharedTranspositionTable(memory_mb, name)
+    table._generation = generation
+    return table
@@ -0,0 +1,69 @@
+from board import Board
+from piece import Piece
+from shared_transposition_table import ENTRY_BYTES, SharedTranspositionTable
+from transposition_table import TranspositionTable
+
+from concurrent.futures import ProcessPoolExecutor
+import pickle
+from unittest import TestCase
+from unittest.mock import patch
+
+
+def _put(table: SharedTranspositionTable) -> None:
+    table.put(Board.parse('wpe4'), Piece.Color.BLACK, 2, -1.5, TranspositionTable.Bound.UPPER, None)
+    table.close()
+
+
+class SharedTranspositionTableTest(TestCase):
+    def setUp(self):
+        self.table = SharedTranspositionTable(0.01)
+
+    def tearDown(self):
+        self.table.close()
+
+    def test_get_put(self):
+        board = Board.default_board()
+        best = next(iter(board.moves_for_color(Piece.Color.WHITE)))
+        self.assertIsNone(self.table.get(board, Piece.Color.WHITE))
+        self.table.put(board, Piece.Color.WHITE, 3, 1.5, TranspositionTable.Bound.LOWER, best)
+        entry = self.table.get(board, Piece.Color.WHITE)
+        assert entry is not None
+        self.assertEqual((entry.depth, entry.value, entry.bound, entry.best_key),
+                         (3, 1.5, TranspositionTable.Bound.LOWER, best.zobrist_key))
+        self.assertIsNone(self.table.get(board, Piece.Color.BLACK))
+        self.assertEqual(len(self.table), 1)
+        # replacing an entry doesn't fill another record
+        self.table.put(board, Piece.Color.WHITE, 4, 1.5, TranspositionTable.Bound.EXACT, best)
+        self.assertEqual(len(self.table), 1)
+        self.table.clear()
+        self.assertEqual(len(self.table), 0)
+
+    def test_get_does_not_generate_moves(self):
+        board = Board.default_board()
+        best = next(iter(board.moves_for_color(Piece.Color.WHITE)))
+        self.table.put(board, Piece.Color.WHITE, 3, 1.5, TranspositionTable.Bound.EXACT, best)
+        with patch.object(type(board), 'color_moves', side_effect=AssertionError), \
+                patch.object(type(board), 'moves_for_color', side_effect=AssertionError):
+            entry = self.table.get(board, Piece.Color.WHITE)
+        assert entry is not None
+        self.assertEqual(entry.best_key, best.zobrist_key)
+
+    def test_torn_entry_misses(self):
+        board = Board.parse('wpe4')
+        self.table.put(board, Piece.Color.WHITE, 1, 0, TranspositionTable.Bound.EXACT, None)
+        i = board.zobrist_key % self.table.capacity
+        # as if another process had rewritten the value but not the rest of the record
+        self.table._memory.buf[i * ENTRY_BYTES + 16] ^= 1
+        self.assertIsNone(self.table.get(board, Piece.Color.WHITE))
+
+    def test_shared_between_processes(self):
+        attached = pickle.loads(pickle.dumps(self.table))
+        attached.put(Board.parse('wpe5'), Piece.Color.WHITE, 1, 0, TranspositionTable.Bound.EXACT, None)
+        attached.close()
+        self.assertIsNotNone(self.table.get(Board.parse('wpe5'), Piece.Color.WHITE))
+        with ProcessPoolExecutor(1) as executor:
+            executor.submit(_put, self.table).result()
+        entry = self.table.get(Board.parse('wpe4'), Piece.Color.BLACK)
+        assert entry is not None
+        self.assertEqual((entry.depth, entry.value, entry.bound), (2, -1.5, TranspositionTable.Bound.UPPER))
+        self.assertEqual(len(self.table), 2)
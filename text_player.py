@@ -28,8 +28,9 @@ class TextPlayer(Player):
                 continue
             to_position = self._get_position(
                 f'select destination for {from_piece}: ')
-            new_board = board.with_piece_moved(from_piece, to_position)
-            if new_board not in board.moves_for_color(self.color):
+            moves = [move for move in board.color_moves(self.color)
+                     if move.piece == from_piece and move.to_position == to_position]
+            if not moves:
                 print('invalid move')
                 continue
-            return new_board
+            return board.with_move(moves[0])
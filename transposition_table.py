@@ -0,0 +1,150 @@
+from board import Board
+from move import Move
+from piece import Piece
+from zobrist import move_key, position_key
+
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
+
+DEFAULT_MEMORY_MB = 16
+
+# Rough size of an entry object and the objects it holds, used to turn a memory limit into a number of slots.
+ENTRY_BYTES = 128
+
+
+def best_move(board: Board, color: Piece.Color, best_key: int) -> Optional[Move]:
+    '''Finds the move among color's moves on board that leads to the board with best_key.'''
+    for move in board.color_moves(color):
+        if move_key(board.zobrist_key, move) == best_key:
+            return move
+    return None
+
+
+def best_board(board: Board, color: Piece.Color, best_key: int) -> Optional[Board]:
+    '''Finds the board with best_key among color's moves on board.'''
+    move = best_move(board, color, best_key)
+    return board.with_move(move) if move is not None else None
+
+
+class TranspositionTable:
+    '''Fixed-size table of search results keyed by position.
+
+    Each position hashes to one slot. A new entry replaces the one in its slot
+    if it's for the same position, was searched at least as deep, or the old
+    entry was stored before the last new_search. Entries keep the key of the
+    best board rather than the board, so the table doesn't keep boards alive;
+    callers find it among the children they have, or with best_board.
+    '''
+
+    class Bound(Enum):
+        EXACT = 'exact'
+        LOWER = 'lower'
+        UPPER = 'upper'
+
+    @dataclass(frozen=True, slots=True)
+    class Entry:
+        key: int
+        depth: int
+        value: float
+        bound: 'TranspositionTable.Bound'
+        # zobrist key of the board the best move leads to
+        best_key: Optional[int]
+        generation: int
+
+    @dataclass(frozen=True)
+    class Stats:
+        size: int
+        capacity: int
+        probes: int
+        hits: int
+        stores: int
+        overwrites: int
+        # lookups of best moves for move ordering, counted apart from the lookups of values above
+        best_key_probes: int = 0
+        best_key_hits: int = 0
+
+        @property
+        def hit_rate(self) -> float:
+            return self.hits / self.probes if self.probes else 0
+
+    def __init__(self, memory_mb: float = DEFAULT_MEMORY_MB):
+        capacity = int(memory_mb * 2**20) // ENTRY_BYTES
+        if capacity < 1:
+            raise ValueError(memory_mb)
+        self._entries: list[Optional[TranspositionTable.Entry]] = [None] * capacity
+        self._size = 0
+        self._generation = 0
+        self.reset_stats()
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        return len(self._entries)
+
+    @property
+    def stats(self) -> 'TranspositionTable.Stats':
+        return TranspositionTable.Stats(len(self), self.capacity, self._probes, self._hits, self._stores, self._overwrites,
+                                        self._best_key_probes, self._best_key_hits)
+
+    def reset_stats(self) -> None:
+        self._probes = 0
+        self._hits = 0
+        self._stores = 0
+        self._overwrites = 0
+        self._best_key_probes = 0
+        self._best_key_hits = 0
+
+    def clear(self) -> None:
+        self._entries = [None] * self.capacity
+        self._size = 0
+        self.reset_stats()
+
+    def new_search(self) -> None:
+        '''Marks the entries stored so far as replaceable by any later store.'''
+        self._generation += 1
+
+    def get(self, board: Board, color: Piece.Color) -> Optional['TranspositionTable.Entry']:
+        key = position_key(board.zobrist_key, color)
+        self._probes += 1
+        entry = self._load(key % self.capacity, board, color)
+        if entry is None or entry.key != key:
+            return None
+        self._hits += 1
+        return entry
+
+    def best_key(self, board: Board, color: Piece.Color) -> Optional[int]:
+        '''The key of the best board stored for board with color to move, for ordering moves.'''
+        key = position_key(board.zobrist_key, color)
+        self._best_key_probes += 1
+        entry = self._load(key % self.capacity, board, color)
+        if entry is None or entry.key != key or entry.best_key is None:
+            return None
+        self._best_key_hits += 1
+        return entry.best_key
+
+    def put(self, board: Board, color: Piece.Color, depth: int, value: float,
+            bound: 'TranspositionTable.Bound', best: Optional[Board]) -> None:
+        key = position_key(board.zobrist_key, color)
+        i = key % self.capacity
+        entry = self._load(i, board, color)
+        if entry is not None and entry.key != key:
+            if entry.generation == self._generation and entry.depth > depth:
+                return
+            self._overwrites += 1
+        best_key = best.zobrist_key if best is not None else None
+        if entry is not None and entry.key == key and best_key is None:
+            best_key = entry.best_key
+        self._store(i, TranspositionTable.Entry(key, depth, value, bound, best_key, self._generation))
+        self._stores += 1
+
+    def _load(self, i: int, board: Board, color: Piece.Color) -> Optional['TranspositionTable.Entry']:
+        '''Returns the entry in slot i, which may be for another position than board with color to move.'''
+        return self._entries[i]
+
+    def _store(self, i: int, entry: 'TranspositionTable.Entry') -> None:
+        if self._entries[i] is None:
+            self._size += 1
+        self._entries[i] = entry
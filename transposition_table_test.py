@@ -0,0 +1,96 @@
+from board import Board
+from piece import Piece
+from transposition_table import ENTRY_BYTES, TranspositionTable, best_board
+
+import tracemalloc
+from unittest import TestCase
+
+
+class TranspositionTableTest(TestCase):
+    def test_capacity(self):
+        self.assertEqual(TranspositionTable(1).capacity, 2**20 // ENTRY_BYTES)
+        with self.assertRaises(ValueError):
+            TranspositionTable(0)
+
+    def test_get_put(self):
+        table = TranspositionTable()
+        board = Board.parse('wpe4,bpd5')
+        best = Board.parse('wpd5')
+        self.assertIsNone(table.get(board, Piece.Color.WHITE))
+        table.put(board, Piece.Color.WHITE, 2, 1, TranspositionTable.Bound.EXACT, best)
+        entry = table.get(board, Piece.Color.WHITE)
+        assert entry is not None
+        self.assertEqual((entry.depth, entry.value, entry.bound, entry.best_key),
+                         (2, 1, TranspositionTable.Bound.EXACT, best.zobrist_key))
+        self.assertEqual(best_board(board, Piece.Color.WHITE, entry.best_key), best)
+        # the same board with the other side to move is a different position
+        self.assertIsNone(table.get(board, Piece.Color.BLACK))
+        self.assertEqual(len(table), 1)
+
+    def test_keeps_best_for_same_position(self):
+        table = TranspositionTable()
+        board = Board.parse('wpe4,bpd5')
+        table.put(board, Piece.Color.WHITE, 2, 1, TranspositionTable.Bound.EXACT, Board.parse('wpd5'))
+        table.put(board, Piece.Color.WHITE, 3, 0, TranspositionTable.Bound.UPPER, None)
+        entry = table.get(board, Piece.Color.WHITE)
+        assert entry is not None
+        self.assertEqual((entry.depth, entry.bound, entry.best_key),
+                         (3, TranspositionTable.Bound.UPPER, Board.parse('wpd5').zobrist_key))
+
+    def test_replacement(self):
+        # one slot, so every position collides
+        table = TranspositionTable(ENTRY_BYTES / 2**20)
+        deep = Board.parse('wpe4')
+        shallow = Board.parse('wpe5')
+        table.put(deep, Piece.Color.WHITE, 3, 0, TranspositionTable.Bound.EXACT, None)
+        table.put(shallow, Piece.Color.WHITE, 1, 0, TranspositionTable.Bound.EXACT, None)
+        self.assertIsNotNone(table.get(deep, Piece.Color.WHITE))
+        self.assertIsNone(table.get(shallow, Piece.Color.WHITE))
+        table.new_search()
+        table.put(shallow, Piece.Color.WHITE, 1, 0, TranspositionTable.Bound.EXACT, None)
+        self.assertIsNone(table.get(deep, Piece.Color.WHITE))
+        self.assertIsNotNone(table.get(shallow, Piece.Color.WHITE))
+        self.assertEqual(table.stats.overwrites, 1)
+
+    def test_stats(self):
+        table = TranspositionTable()
+        board = Board.parse('wpe4')
+        table.get(board, Piece.Color.WHITE)
+        table.put(board, Piece.Color.WHITE, 1, 0, TranspositionTable.Bound.EXACT, None)
+        table.get(board, Piece.Color.WHITE)
+        self.assertEqual(table.stats, TranspositionTable.Stats(1, table.capacity, 2, 1, 1, 0))
+        self.assertEqual(table.stats.hit_rate, 0.5)
+        table.clear()
+        self.assertEqual(table.stats, TranspositionTable.Stats(0, table.capacity, 0, 0, 0, 0))
+
+    def test_best_key(self):
+        table = TranspositionTable()
+        board = Board.parse('wpe4')
+        best = Board.parse('wpe5')
+        self.assertIsNone(table.best_key(board, Piece.Color.WHITE))
+        table.put(board, Piece.Color.WHITE, 1, 0, TranspositionTable.Bound.EXACT, best)
+        self.assertEqual(table.best_key(board, Piece.Color.WHITE), best.zobrist_key)
+        # ordering lookups don't count toward the hit rate of value lookups
+        self.assertEqual(table.stats, TranspositionTable.Stats(1, table.capacity, 0, 0, 1, 0, 2, 1))
+
+    def test_memory(self):
+        boards = [Board.default_board()]
+        level = boards
+        color = Piece.Color.WHITE
+        for _ in range(3):
+            level = [child for board in level for child in board.moves_for_color(color)]
+            boards += level
+            color = color.opponent
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            table = TranspositionTable(1)
+            for i, board in enumerate(boards):
+                for color in Piece.Color:
+                    table.put(board, color, i % 7 + 1, i / 3, TranspositionTable.Bound.EXACT, boards[i // 20])
+            retained = tracemalloc.get_traced_memory()[0] - before
+        finally:
+            tracemalloc.stop()
+        self.assertGreater(len(table), table.capacity // 2)
+        # the entries don't hold on to boards, so the table stays within its budget
+        self.assertLess(retained, 2**20)
@@ -0,0 +1,134 @@
+from collections import Counter
+from collections.abc import Iterator
+from heapq import heappop, heappush
+import random
+from typing import Generic, Optional, TypeVar
+
+T = TypeVar('T')
+
+
+class WeightedSampler(Generic[T]):
+    '''Collection of weighted values that samples with the same distribution as weighted_random_choice.
+
+    Values live in slots of a pair of Fenwick trees, one summing weights and
+    one counting values, so add, remove and sample are O(log n). Like
+    weighted_random_choice, if any weight is negative every weight is shifted
+    by 1 - min(weights) before sampling, and when all the weights are zero
+    every value is equally likely.
+    '''
+
+    def __init__(self):
+        self._values: list[Optional[T]] = []
+        self._weights: list[float] = []
+        self._weight_tree: list[float] = [0]
+        self._count_tree: list[int] = [0]
+        self._free: list[int] = []
+        self._len = 0
+        # weights as a min heap, with removed weights deleted lazily
+        self._min_heap: list[float] = []
+        self._removed: Counter[float] = Counter()
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[T]:
+        return (value for value in self._values if value is not None)
+
+    def __getitem__(self, slot: int) -> T:
+        value = self._values[slot]
+        if value is None:
+            raise KeyError(slot)
+        return value
+
+    def _update(self, slot: int, weight: float, count: int) -> None:
+        i = slot + 1
+        while i < len(self._weight_tree):
+            self._weight_tree[i] += weight
+            self._count_tree[i] += count
+            i += i & -i
+
+    def _grow(self) -> None:
+        capacity = max(1, 2 * len(self._values))
+        self._free.extend(range(capacity - 1, len(self._values) - 1, -1))
+        self._values.extend([None] * (capacity - len(self._values)))
+        self._weights.extend([0] * (capacity - len(self._weights)))
+        # rebuilding from the weights also clears any accumulated rounding error
+        self._weight_tree = [0] * (capacity + 1)
+        self._count_tree = [0] * (capacity + 1)
+        for slot, value in enumerate(self._values):
+            if value is not None:
+                self._weight_tree[slot + 1] += self._weights[slot]
+                self._count_tree[slot + 1] += 1
+        for i in range(1, capacity + 1):
+            parent = i + (i & -i)
+            if parent <= capacity:
+                self._weight_tree[parent] += self._weight_tree[i]
+                self._count_tree[parent] += self._count_tree[i]
+
+    def add(self, value: T, weight: float) -> int:
+        '''Adds value and returns its slot.'''
+        if not self._free:
+            self._grow()
+        slot = self._free.pop()
+        self._values[slot] = value
+        self._weights[slot] = weight
+        self._update(slot, weight, 1)
+        heappush(self._min_heap, weight)
+        self._len += 1
+        return slot
+
+    def remove(self, slot: int) -> T:
+        value = self[slot]
+        weight = self._weights[slot]
+        self._values[slot] = None
+        self._weights[slot] = 0
+        self._update(slot, -weight, -1)
+        self._removed[weight] += 1
+        self._free.append(slot)
+        self._len -= 1
+        return value
+
+    def _min_weight(self) -> float:
+        while self._removed[self._min_heap[0]]:
+            self._removed[heappop(self._min_heap)] -= 1
+        return self._min_heap[0]
+
+    def _find(self, target: float, weight_scale: float, count_scale: float) -> int:
+        '''Returns the first slot where the running total of weight_scale * weight + count_scale over values exceeds target.'''
+        i = 0
+        step = 1 << (len(self._weight_tree) - 1).bit_length()
+        while step:
+            j = i + step
+            if j < len(self._weight_tree):
+                total = weight_scale * self._weight_tree[j] + count_scale * self._count_tree[j]
+                if total <= target:
+                    i = j
+                    target -= total
+            step >>= 1
+        return i
+
+    def sample(self) -> int:
+        '''Returns the slot of a random value, chosen with probability proportional to its weight.'''
+        if not self._len:
+            raise ValueError('empty sampler')
+        min_weight = self._min_weight()
+        offset = 1 - min_weight if min_weight < 0 else 0
+        total = self._weight_tree_total() + offset * self._len
+        if total > 0:
+            slot = self._find(random.uniform(0, total), 1, offset)
+            if slot < len(self._values) and self._values[slot] is not None:
+                return slot
+        # all the weights are zero, or rounding ran off the end
+        return self._find(random.randrange(self._len), 0, 1)
+
+    def _weight_tree_total(self) -> float:
+        total: float = 0
+        i = len(self._weight_tree) - 1
+        while i > 0:
+            total += self._weight_tree[i]
+            i -= i & -i
+        return total
+
+    def pop(self) -> T:
+        '''Removes and returns a random value.'''
+        return self.remove(self.sample())
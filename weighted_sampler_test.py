@@ -0,0 +1,62 @@
+from weighted_random_choice import weighted_random_choice
+from weighted_sampler import WeightedSampler
+
+from collections import Counter
+import random
+from unittest import TestCase
+
+# chi-squared value with 3 degrees of freedom that's exceeded by chance with probability 0.001
+_CHI_SQUARED_3_DOF = 16.27
+
+
+def _chi_squared(counts: Counter[str], weights: dict[str, float]) -> float:
+    total = sum(counts.values())
+    return sum((counts[value] - total * weight) ** 2 / (total * weight) for value, weight in weights.items())
+
+
+class WeightedSamplerTest(TestCase):
+    def setUp(self):
+        random.seed(0)
+
+    def test_add_remove(self):
+        sampler: WeightedSampler[str] = WeightedSampler()
+        slots = {value: sampler.add(value, 1) for value in 'abc'}
+        self.assertEqual(len(sampler), 3)
+        self.assertEqual(sampler.remove(slots['b']), 'b')
+        self.assertCountEqual(list(sampler), 'ac')
+        with self.assertRaises(KeyError):
+            sampler.remove(slots['b'])
+        self.assertCountEqual([sampler.pop(), sampler.pop()], 'ac')
+        with self.assertRaises(ValueError):
+            sampler.sample()
+
+    def test_zero_weight(self):
+        sampler: WeightedSampler[str] = WeightedSampler()
+        sampler.add('a', 0)
+        sampler.add('b', 1)
+        self.assertEqual({sampler[sampler.sample()] for _ in range(100)}, {'b'})
+
+    def test_distribution_matches_weighted_random_choice(self):
+        for weights in [{'a': 1, 'b': 2, 'c': 3, 'd': 4},
+                        {'a': -3, 'b': 0, 'c': 2, 'd': 5},
+                        {'a': 0, 'b': 0, 'c': 0, 'd': 0}]:
+            with self.subTest(weights):
+                min_weight = min(weights.values())
+                shifted = {value: weight - min_weight + 1 if min_weight < 0 else weight
+                           for value, weight in weights.items()}
+                total = sum(shifted.values())
+                probabilities = {value: weight / total if total else 1 / len(shifted)
+                                 for value, weight in shifted.items()}
+
+                sampler: WeightedSampler[str] = WeightedSampler()
+                # values added and removed first leave free slots and stale minimum weights behind
+                churn = [sampler.add(value, -10) for value in 'xyz']
+                for value, weight in weights.items():
+                    sampler.add(value, weight)
+                for slot in churn:
+                    sampler.remove(slot)
+                samples = Counter(sampler[sampler.sample()] for _ in range(20000))
+                choices = Counter(weighted_random_choice(list(weights.items())) for _ in range(20000))
+
+                self.assertLess(_chi_squared(samples, probabilities), _CHI_SQUARED_3_DOF)
+                self.assertLess(_chi_squared(choices, probabilities), _CHI_SQUARED_3_DOF)
@@ -0,0 +1,51 @@
+from move import Move
+from piece import Piece
+
+from collections.abc import Iterable, Mapping
+from random import Random
+
+# Keys are drawn from a fixed seed so that they agree across processes.
+_random = Random(0x2B992DDFA23249D6)
+
+
+def _keys() -> tuple[int, ...]:
+    return tuple(_random.getrandbits(64) for _ in range(64))
+
+
+PIECE_KEYS: Mapping[Piece.Color, Mapping[Piece.Type, tuple[int, ...]]] = {
+    color: {type: _keys() for type in Piece.Type} for color in Piece.Color
+}
+
+# Xored in for every square holding a piece that has moved.
+MOVED_KEYS: tuple[int, ...] = _keys()
+
+# Xored into position keys when black is to move.
+BLACK_TO_MOVE_KEY: int = _random.getrandbits(64)
+
+
+def piece_key(piece: Piece) -> int:
+    i = piece.position.index
+    key = PIECE_KEYS[piece.color][piece.type][i]
+    if piece.has_moved:
+        key ^= MOVED_KEYS[i]
+    return key
+
+
+def pieces_key(pieces: Iterable[Piece]) -> int:
+    key = 0
+    for piece in pieces:
+        key ^= piece_key(piece)
+    return key
+
+
+def move_key(board_key: int, move: Move) -> int:
+    '''Key of the board that move leads to from the board with board_key.'''
+    key = board_key ^ piece_key(move.piece) ^ piece_key(move.moved_piece)
+    if move.captured is not None:
+        key ^= piece_key(move.captured)
+    return key
+
+
+def position_key(board_key: int, color: Piece.Color) -> int:
+    '''Key of a board with color to move.'''
+    return board_key ^ BLACK_TO_MOVE_KEY if color == Piece.Color.BLACK else board_key
@@ -0,0 +1,32 @@
+from board import Board
+from piece import Piece
+from zobrist import move_key, piece_key, pieces_key, position_key
+
+from unittest import TestCase
+
+
+class ZobristTest(TestCase):
+    def test_piece_key(self):
+        self.assertNotEqual(piece_key(Piece.parse('wpc2')),
+                            piece_key(Piece.parse('wpc3')))
+        self.assertNotEqual(piece_key(Piece.parse('wpc2')),
+                            piece_key(Piece.parse('bpc2')))
+        self.assertNotEqual(piece_key(Piece.parse('wpc2')),
+                            piece_key(Piece.parse('wpc2', False)))
+
+    def test_pieces_key(self):
+        pieces = [Piece.parse('wpc2'), Piece.parse('bke8')]
+        self.assertEqual(pieces_key(pieces), pieces_key(reversed(pieces)))
+        self.assertEqual(pieces_key([]), 0)
+        self.assertEqual(pieces_key(pieces[:1]), piece_key(pieces[0]))
+
+    def test_position_key(self):
+        self.assertEqual(position_key(1234, Piece.Color.WHITE), 1234)
+        self.assertNotEqual(position_key(1234, Piece.Color.BLACK), 1234)
+
+    def test_move_key(self):
+        for impl in Board.Impl:
+            board = Board.parse('wke1,wqd1,wpe2,bke8,bnc6,bpd3', impl=impl)
+            for move in board.color_moves(Piece.Color.WHITE):
+                with self.subTest((impl, move)):
+                    self.assertEqual(move_key(board.zobrist_key, move), board.with_move(move).zobrist_key)